@@ -0,0 +1,70 @@
+"""Benchmarks for writing and reading compressed variables.
+
+Operators that the installed adios2 wasn't built with are skipped. `track_size`
+reports the size of the file on disk, for comparing compression ratios.
+"""
+
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import xarray as xr
+
+from xarray_adios2 import to_adios2
+from xarray_adios2.adios2operators import OPERATOR_KEY, operator_available
+
+ENCODINGS: dict[str, dict[str, Any]] = {
+    "none": {},
+    "null": {OPERATOR_KEY: "null"},
+    "blosc": {OPERATOR_KEY: "blosc", "clevel": 5, "doshuffle": "BLOSC_SHUFFLE"},
+    "bzip2": {OPERATOR_KEY: "bzip2"},
+    "zfp": {OPERATOR_KEY: "zfp", "accuracy": 1e-6},
+    "sz": {OPERATOR_KEY: "sz", "accuracy": 1e-6},
+    "mgard": {OPERATOR_KEY: "mgard", "accuracy": 1e-6},
+}
+
+
+def make_dataset(n_steps: int = 10, n: int = 500) -> xr.Dataset:
+    """A smooth field, which compresses reasonably well."""
+    x = np.linspace(0, 2 * np.pi, n)
+    t = np.arange(float(n_steps))
+    field = np.sin(x[None, :, None] + t[:, None, None]) * np.cos(x[None, None, :])
+    return xr.Dataset(
+        {"field": (("time", "y", "x"), field)},
+        coords={"time": t, "y": x, "x": x},
+        attrs={"step_dimension": "time"},
+    )
+
+
+class Compression:
+    params = list(ENCODINGS)
+    param_names = ["compressor"]
+    timeout = 600
+
+    def setup(self, compressor: str) -> None:
+        encoding = ENCODINGS[compressor]
+        if encoding and not operator_available(encoding[OPERATOR_KEY]):
+            raise NotImplementedError
+        self.ds = make_dataset()
+        self.encoding = {"field": encoding}
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmpdir.name) / "compressed.bp"
+        to_adios2(self.ds, self.filename, encoding=self.encoding)
+
+    def teardown(self, compressor: str) -> None:
+        self.tmpdir.cleanup()
+
+    def time_write(self, compressor: str) -> None:
+        to_adios2(self.ds, self.filename, encoding=self.encoding)
+
+    def time_read(self, compressor: str) -> None:
+        with xr.open_dataset(self.filename, engine="adios2_engine") as ds:
+            ds.field.to_numpy()
+
+    def track_size(self, compressor: str) -> int:
+        return sum(f.stat().st_size for f in self.filename.iterdir())
+
+    track_size.unit = "bytes"  # type: ignore[attr-defined]
@@ -0,0 +1,133 @@
+"""Synthetic .bp files for the benchmarks.
+
+The generators go through the adios2 bindings (or adios2py) directly rather than
+through this package, so the benchmark files don't change with the code being
+benchmarked, and writing large files in `setup_cache` stays fast.
+"""
+
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+import numpy as np
+
+
+def write_wide(filename: Path, n_vars: int, n_steps: int = 3) -> None:
+    """Writes `n_vars` small 2-d variables, each with a couple of attributes."""
+    adios = adios2bindings.ADIOS()
+    io = adios.DeclareIO("wide")
+    engine = io.Open(str(filename), adios2bindings.Mode.Write)
+    io.DefineAttribute("step_dimension", "time")
+    variables = {}
+    for step in range(n_steps):
+        engine.BeginStep()
+        data = {"time": np.array(float(step)), "x": np.arange(10.0)}
+        data |= {f"var{n}": np.full((4, 10), float(n)) for n in range(n_vars)}
+        for name, value in data.items():
+            if name not in variables:
+                variables[name] = io.DefineVariable(
+                    name, value, list(value.shape), [0] * value.ndim, list(value.shape)
+                )
+                dims = {"time": "", "x": "x"}.get(name, "y x")
+                io.DefineAttribute("dimensions", dims, name)
+                io.DefineAttribute("units", "m", name)
+            engine.Put(variables[name], value, adios2bindings.Mode.Sync)
+        engine.EndStep()
+    engine.Close()
+
+
+def write_steps(filename: Path, n_steps: int, n_x: int = 1_000) -> None:
+    """Writes a time coordinate and a 1-d field for each of `n_steps` steps."""
+    with adios2py.File(filename, mode="w") as file:
+        file.attrs["step_dimension"] = "time"
+        for n, step in zip(range(n_steps), file.steps, strict=False):
+            step["time"] = np.array(float(n))
+            step["time"].attrs["dimensions"] = ""
+            step["x"] = np.arange(n_x, dtype=np.float64)
+            step["x"].attrs["dimensions"] = "x"
+            step["field"] = np.full(n_x, float(n))
+            step["field"].attrs["dimensions"] = "x"
+
+
+def write_field(filename: Path, shape: tuple[int, ...]) -> None:
+    """Writes a single step of random data of the given shape."""
+    rng = np.random.default_rng(seed=0)
+    with adios2py.File(filename, mode="w") as file, file.steps.next() as step:
+        file.attrs["step_dimension"] = "step"
+        step["field"] = rng.random(shape)
+        step["field"].attrs["dimensions"] = " ".join(
+            f"dim{n}" for n in range(len(shape))
+        )
+
+
+def write_cube(
+    filename: Path,
+    shape: tuple[int, int, int],
+    blocks: tuple[int, int, int],
+    n_steps: int = 2,
+) -> None:
+    """Writes a 3-d field decomposed into `blocks` per dimension, like the output of
+    a parallel simulation, with coordinates `z`, `y`, `x` and `time`."""
+    rng = np.random.default_rng(seed=0)
+    adios = adios2bindings.ADIOS()
+    io = adios.DeclareIO("cube")
+    engine = io.Open(str(filename), adios2bindings.Mode.Write)
+    io.DefineAttribute("step_dimension", "time")
+
+    dims = ("z", "y", "x")
+    starts = [
+        np.linspace(0, n, nb + 1).astype(int)
+        for n, nb in zip(shape, blocks, strict=True)
+    ]
+    field = io.DefineVariable("field", np.empty(1), list(shape), [0, 0, 0], [1, 1, 1])
+    io.DefineAttribute("dimensions", " ".join(dims), "field")
+    time = io.DefineVariable("time", np.empty(()), [], [], [])
+    io.DefineAttribute("dimensions", "", "time")
+    coords = []
+    for dim, n in zip(dims, shape, strict=True):
+        values = np.arange(float(n))
+        coords.append((io.DefineVariable(dim, values, [n], [0], [n]), values))
+        io.DefineAttribute("dimensions", dim, dim)
+
+    for step in range(n_steps):
+        engine.BeginStep()
+        engine.Put(time, np.array(float(step)), adios2bindings.Mode.Sync)
+        for var, values in coords:
+            engine.Put(var, values, adios2bindings.Mode.Sync)
+        for block in itertools.product(*(range(nb) for nb in blocks)):
+            start = [int(s[b]) for s, b in zip(starts, block, strict=True)]
+            stop = [int(s[b + 1]) for s, b in zip(starts, block, strict=True)]
+            count = [e - s for s, e in zip(start, stop, strict=True)]
+            field.SetSelection((start, count))
+            engine.Put(field, rng.random(count), adios2bindings.Mode.Sync)
+        engine.EndStep()
+    engine.Close()
+
+
+def write_long(filename: Path, n_steps: int, n_vars: int = 5, n_x: int = 100) -> None:
+    """Writes `n_steps` steps of a few small variables, so the file's metadata is
+    dominated by the number of steps."""
+    adios = adios2bindings.ADIOS()
+    io = adios.DeclareIO("long")
+    engine = io.Open(str(filename), adios2bindings.Mode.Write)
+    io.DefineAttribute("step_dimension", "time")
+    x = np.arange(float(n_x))
+    time = io.DefineVariable("time", np.empty(()), [], [], [])
+    io.DefineAttribute("dimensions", "", "time")
+    x_var = io.DefineVariable("x", x, [n_x], [0], [n_x])
+    io.DefineAttribute("dimensions", "x", "x")
+    fields = []
+    for n in range(n_vars):
+        fields.append(io.DefineVariable(f"var{n}", x, [n_x], [0], [n_x]))
+        io.DefineAttribute("dimensions", "x", f"var{n}")
+    for step in range(n_steps):
+        engine.BeginStep()
+        engine.Put(time, np.array(float(step)), adios2bindings.Mode.Sync)
+        engine.Put(x_var, x, adios2bindings.Mode.Sync)
+        for var in fields:
+            engine.Put(var, x + step, adios2bindings.Mode.Sync)
+        engine.EndStep()
+    engine.Close()
@@ -0,0 +1,50 @@
+"""Benchmarks for reading several files concurrently from multiple threads.
+
+With a lock per file, the time to read all files should go down as the number of
+workers goes up (given enough cores), while the global lock serializes all reads.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import xarray as xr
+
+from xarray_adios2 import ADIOS2_LOCK
+
+from .generate import write_field
+
+N_FILES = 8
+
+
+class ThreadedRead:
+    params = ([1, 2, 4, 8], ["file", "global"])
+    param_names = ["n_workers", "lock"]
+    timeout = 600
+
+    def setup_cache(self) -> list[Path]:
+        filenames = [Path.cwd() / f"threaded_{n}.bp" for n in range(N_FILES)]
+        for filename in filenames:
+            write_field(filename, (1_000, 1_000))
+        return filenames
+
+    def setup(self, filenames: list[Path], n_workers: int, lock: str) -> None:
+        self.executor = ThreadPoolExecutor(n_workers)
+        self.datasets = [
+            xr.open_dataset(
+                filename,
+                engine="adios2_engine",
+                cache=False,
+                lock=ADIOS2_LOCK if lock == "global" else None,
+            )
+            for filename in filenames
+        ]
+
+    def teardown(self, filenames: list[Path], n_workers: int, lock: str) -> None:
+        self.executor.shutdown()
+        for ds in self.datasets:
+            ds.close()
+
+    def time_read_files(self, filenames: list[Path], n_workers: int, lock: str) -> None:
+        list(self.executor.map(lambda ds: ds.field.to_numpy(), self.datasets))
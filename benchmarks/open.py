@@ -0,0 +1,78 @@
+"""Benchmarks for opening files with many variables or many steps.
+
+Opening only has to look at the file's metadata, so it should scale linearly with the
+number of variables and attributes, and the number of steps.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import xarray as xr
+
+from xarray_adios2 import Adios2Store
+
+from .generate import write_long, write_wide
+
+
+class OpenWide:
+    params = [10, 100, 1000, 2000]
+    param_names = ["n_vars"]
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        for n_vars in self.params:
+            write_wide(Path.cwd() / f"wide_{n_vars}.bp", n_vars)
+        return Path.cwd()
+
+    def setup(self, path: Path, n_vars: int) -> None:
+        # make sure the metadata index is up to date
+        xr.open_dataset(
+            path / f"wide_{n_vars}.bp", engine="adios2_engine", metadata_index=True
+        ).close()
+
+    def time_open_dataset(self, path: Path, n_vars: int) -> None:
+        xr.open_dataset(path / f"wide_{n_vars}.bp", engine="adios2_engine").close()
+
+    def time_open_few_variables(self, path: Path, n_vars: int) -> None:
+        xr.open_dataset(
+            path / f"wide_{n_vars}.bp",
+            engine="adios2_engine",
+            variables=[f"var{n}" for n in range(5)],
+        ).close()
+
+    def time_open_with_index(self, path: Path, n_vars: int) -> None:
+        xr.open_dataset(
+            path / f"wide_{n_vars}.bp", engine="adios2_engine", metadata_index=True
+        ).close()
+
+
+class OpenLong:
+    """Opening files with many steps, where adios2's own metadata dominates."""
+
+    params = [1_000, 10_000]
+    param_names = ["n_steps"]
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        for n_steps in self.params:
+            write_long(Path.cwd() / f"long_{n_steps}.bp", n_steps)
+        return Path.cwd()
+
+    def setup(self, path: Path, n_steps: int) -> None:
+        xr.open_dataset(
+            path / f"long_{n_steps}.bp", engine="adios2_engine", metadata_index=True
+        ).close()
+
+    def time_open_dataset(self, path: Path, n_steps: int) -> None:
+        xr.open_dataset(path / f"long_{n_steps}.bp", engine="adios2_engine").close()
+
+    def time_get_variables(self, path: Path, n_steps: int) -> None:
+        store = Adios2Store.open(path / f"long_{n_steps}.bp")
+        store.get_variables()
+        store.close()
+
+    def time_open_with_index(self, path: Path, n_steps: int) -> None:
+        xr.open_dataset(
+            path / f"long_{n_steps}.bp", engine="adios2_engine", metadata_index=True
+        ).close()
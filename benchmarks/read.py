@@ -0,0 +1,66 @@
+"""Benchmarks for reading selections of a large 3-d variable.
+
+The variable is decomposed into blocks, like the output of a parallel simulation, so
+most selections span several blocks. `track_read_throughput` gives the bandwidth of
+reading a whole step.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+import xarray as xr
+
+from .generate import write_cube
+
+SHAPE = (160, 160, 160)
+BLOCKS = (2, 2, 2)
+
+
+class ReadCube:
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        write_cube(Path.cwd() / "cube.bp", SHAPE, BLOCKS)
+        return Path.cwd()
+
+    def setup(self, path: Path) -> None:
+        # without xarray's in-memory cache, every selection is actually read
+        self.ds = xr.open_dataset(path / "cube.bp", engine="adios2_engine", cache=False)
+        rng = np.random.default_rng(seed=0)
+        self.points = rng.integers(0, SHAPE[2], 100)
+
+    def teardown(self, path: Path) -> None:
+        self.ds.close()
+
+    def time_read_step(self, path: Path) -> None:
+        self.ds.field.isel(time=0).to_numpy()
+
+    def time_read_all_steps(self, path: Path) -> None:
+        self.ds.field.to_numpy()
+
+    def time_read_slab(self, path: Path) -> None:
+        self.ds.field.isel(time=0, z=slice(76, 84)).to_numpy()
+
+    def time_read_plane(self, path: Path) -> None:
+        self.ds.field.isel(time=0, x=80).to_numpy()
+
+    def time_read_subvolume(self, path: Path) -> None:
+        center = slice(60, 100)
+        self.ds.field.isel(time=0, z=center, y=center, x=center).to_numpy()
+
+    def time_read_strided(self, path: Path) -> None:
+        self.ds.field.isel(time=0, z=slice(None, None, 16)).to_numpy()
+
+    def time_read_points(self, path: Path) -> None:
+        self.ds.field.isel(time=0, z=80, y=80, x=self.points).to_numpy()
+
+    def track_read_throughput(self, path: Path) -> float:
+        """MB/s reading a whole step"""
+        start = time.perf_counter()
+        nbytes = self.ds.field.isel(time=0).to_numpy().nbytes
+        return float(nbytes) / 1e6 / (time.perf_counter() - start)
+
+    track_read_throughput.unit = "MB/s"  # type: ignore[attr-defined]
@@ -0,0 +1,103 @@
+"""Benchmarks for reading selections along the step dimension.
+
+The time per selected step should not depend on the total number of steps in the
+file, which is what the `n_steps` parameter checks. `IterSteps` measures streaming
+through all steps in order.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, iter_steps
+
+from .generate import write_steps
+
+N_STEPS = [100, 1_000, 10_000]
+
+
+class StepSelection:
+    params = N_STEPS
+    param_names = ["n_steps"]
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        path = Path.cwd()
+        for n_steps in N_STEPS:
+            write_steps(path / f"steps_{n_steps}.bp", n_steps)
+        return path
+
+    def setup(self, path: Path, n_steps: int) -> None:
+        self.ds = xr.open_dataset(path / f"steps_{n_steps}.bp")
+
+    def teardown(self, path: Path, n_steps: int) -> None:
+        self.ds.close()
+
+    def time_last_step(self, path: Path, n_steps: int) -> None:
+        self.ds.field.isel(time=n_steps - 1).to_numpy()
+
+    def time_step_slice(self, path: Path, n_steps: int) -> None:
+        self.ds.field.isel(time=slice(n_steps - 10, n_steps)).to_numpy()
+
+    def time_step_list(self, path: Path, n_steps: int) -> None:
+        steps = [n_steps - 10, n_steps - 5, n_steps - 4, n_steps - 1]
+        self.ds.field.isel(time=steps).to_numpy()
+
+
+class IterSteps:
+    """Streams through a file step by step while "computing" on each step.
+
+    With prefetching, reading the next steps overlaps with the computation, so the
+    total time should approach the larger of the two rather than their sum.
+    """
+
+    params = [0, 1, 4]
+    param_names = ["prefetch"]
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        path = Path.cwd()
+        write_steps(path / "iter_steps.bp", 50, n_x=1_000_000)
+        return path
+
+    def time_iter_steps(self, path: Path, prefetch: int) -> None:
+        for ds in iter_steps(path / "iter_steps.bp", prefetch=prefetch):
+            # stand-in for computation that releases the GIL, like I/O or numpy
+            time.sleep(0.005)
+            ds.field.mean()
+
+
+class StepStats:
+    """Finds the steps with values above a threshold from the block min/max in the
+    metadata, compared to reading all data."""
+
+    params = [100, 1_000]
+    param_names = ["n_steps"]
+    timeout = 600
+
+    def setup_cache(self) -> Path:
+        path = Path.cwd()
+        for n_steps in self.params:
+            write_steps(path / f"stats_{n_steps}.bp", n_steps, n_x=50_000)
+        return path
+
+    def setup(self, path: Path, n_steps: int) -> None:
+        self.store = Adios2Store.open(path / f"stats_{n_steps}.bp")
+        self.threshold = n_steps - 10
+
+    def teardown(self, path: Path, n_steps: int) -> None:
+        self.store.close()
+
+    def time_step_stats(self, path: Path, n_steps: int) -> None:
+        stats = self.store.step_stats("field")
+        stats.step[stats["max"] > self.threshold].to_numpy()
+
+    def time_read_where(self, path: Path, n_steps: int) -> None:
+        self.store.read_where("field", lower=self.threshold)
+
+    def time_read_all(self, path: Path, n_steps: int) -> None:
+        ds = xr.open_dataset(self.store)
+        ds.time[ds.field.max("x") > self.threshold].to_numpy()
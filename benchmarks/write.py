@@ -0,0 +1,91 @@
+"""Benchmarks for writing Datasets with a step dimension.
+
+`time_store` uses Adios2Store.store, `time_store_by_step` the equivalent loop that
+writes each step through its own store, which is how multi-step Datasets used to be
+written. `WriteCube` writes a few steps of a large 3-d variable with `to_adios2`.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import adios2py
+import numpy as np
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, to_adios2
+
+
+def make_dataset(n_steps: int, n_vars: int, n_x: int = 100) -> xr.Dataset:
+    rng = np.random.default_rng(seed=0)
+    return xr.Dataset(
+        {
+            f"var{n}": (("time", "x"), rng.random((n_steps, n_x)), {"units": "m"})
+            for n in range(n_vars)
+        },
+        coords={"time": np.arange(float(n_steps)), "x": np.arange(float(n_x))},
+        attrs={"step_dimension": "time"},
+    )
+
+
+class WriteSteps:
+    params = ([100, 1_000], [10, 50])
+    param_names = ["n_steps", "n_vars"]
+    timeout = 1200
+
+    def setup(self, n_steps: int, n_vars: int) -> None:
+        self.ds = make_dataset(n_steps, n_vars)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmpdir.name) / "write.bp"
+
+    def teardown(self, n_steps: int, n_vars: int) -> None:
+        self.tmpdir.cleanup()
+
+    def time_store(self, n_steps: int, n_vars: int) -> None:
+        with adios2py.File(self.filename, mode="w") as file:
+            self.ds.dump_to_store(Adios2Store(file))
+
+    def time_store_by_step(self, n_steps: int, n_vars: int) -> None:
+        with adios2py.File(self.filename, mode="w") as file:
+            file.attrs["step_dimension"] = "time"
+            for n, step in zip(range(n_steps), file.steps, strict=False):
+                self.ds.isel(time=n).dump_to_store(Adios2Store(step))
+
+    def track_store_throughput(self, n_steps: int, n_vars: int) -> float:
+        """MB/s written by Adios2Store.store"""
+        start = time.perf_counter()
+        self.time_store(n_steps, n_vars)
+        return self.ds.nbytes / 1e6 / (time.perf_counter() - start)
+
+    track_store_throughput.unit = "MB/s"  # type: ignore[attr-defined]
+
+
+class WriteCube:
+    timeout = 600
+
+    def setup(self) -> None:
+        rng = np.random.default_rng(seed=0)
+        shape = (2, 160, 160, 160)
+        self.ds = xr.Dataset(
+            {"field": (("time", "z", "y", "x"), rng.random(shape))},
+            coords={"time": np.arange(2.0)},
+            attrs={"step_dimension": "time"},
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmpdir.name) / "cube.bp"
+
+    def teardown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def time_to_adios2(self) -> None:
+        to_adios2(self.ds, self.filename)
+
+    def track_to_adios2_throughput(self) -> float:
+        """MB/s written by to_adios2"""
+        start = time.perf_counter()
+        self.time_to_adios2()
+        return self.ds.nbytes / 1e6 / (time.perf_counter() - start)
+
+    track_to_adios2_throughput.unit = "MB/s"  # type: ignore[attr-defined]
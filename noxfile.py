@@ -44,6 +44,17 @@ def tests(session: nox.Session) -> None:
     session.run("pytest", *session.posargs)
 
 
+@nox.session
+def benchmarks(session: nox.Session) -> None:
+    """
+    Run the asv benchmarks against the working tree. Pass asv options after --, e.g.
+    `-- --bench ReadCube`. For comparing commits, use `asv continuous` directly.
+    """
+    session.install(".", "asv")
+    session.run("asv", "machine", "--yes")
+    session.run("asv", "run", "--python=same", "--show-stderr", *session.posargs)
+
+
 @nox.session(reuse_venv=True)
 def docs(session: nox.Session) -> None:
     """
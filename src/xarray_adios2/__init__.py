@@ -8,10 +8,23 @@ from __future__ import annotations
 
 from ._version import version as __version__
 from .adios2backend import Adios2BackendEntrypoint
-from .adios2store import Adios2Store
+from .adios2cache import BlockCache
+from .adios2convert import convert
+from .adios2instrument import ReadStats
+from .adios2reduce import reduce_steps
+from .adios2steps import iter_steps
+from .adios2store import ADIOS2_LOCK, Adios2Store
+from .adios2writer import to_adios2
 
 __all__ = [
+    "ADIOS2_LOCK",
     "Adios2BackendEntrypoint",
     "Adios2Store",
+    "BlockCache",
+    "ReadStats",
     "__version__",
+    "convert",
+    "iter_steps",
+    "reduce_steps",
+    "to_adios2",
 ]
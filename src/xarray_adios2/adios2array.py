@@ -1,20 +1,210 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import bisect
+import itertools
+import time
+from collections.abc import Callable, Hashable
+from typing import TYPE_CHECKING, Any, NamedTuple
 
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
 import adios2py
+import numpy as np
 from numpy.typing import NDArray
 from xarray.backends.common import BackendArray
 from xarray.core import indexing
 
+from .adios2blocks import BlockInfo, blocks_info, local_blocks
+from .adios2pool import FileIdentity
+
 if TYPE_CHECKING:
     from .adios2store import Adios2Store
 
+# Selected indices along a dimension that have at most this many unselected elements
+# between them are read as part of a single selection box.
+DEFAULT_COALESCE_GAP = 8
+
+# Selections that would be read as more boxes than this are read as fewer, larger
+# boxes instead, by merging the pieces along their trailing dimensions.
+MAX_BOXES = 1024
+
+# Steps whose block decomposition is kept by each array, for reading by block ID
+_MAX_BLOCK_STEPS = 16
+
+
+class _Piece(NamedTuple):
+    """A contiguous range [start, stop) to be read along one dimension.
+
+    `part` gives the positions within the range that are actually selected (None if
+    all of them are), and `out` is where they go in the result.
+    """
+
+    start: int
+    stop: int
+    part: NDArray[np.intp] | None
+    out: slice
+
+
+def _coalesce(indices: NDArray[np.intp], max_gap: int) -> list[tuple[int, int]]:
+    """Group sorted, unique indices into (start, stop) runs.
+
+    Neighboring indices end up in the same run if there are no more than `max_gap`
+    unselected elements between them.
+    """
+    if len(indices) == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(indices) > max_gap + 1) + 1
+    starts = indices[np.concatenate(([0], breaks))]
+    stops = indices[np.concatenate((breaks - 1, [len(indices) - 1]))] + 1
+    return list(zip(starts.tolist(), stops.tolist(), strict=True))
+
+
+class _Selection(NamedTuple):
+    """An adios2 selection: (start, count) of steps, and starts and counts in space.
+
+    `shape` is the shape of the resulting array, which omits dimensions indexed by
+    an integer. If `block` is given, the selection lies within that block, and is
+    read by its ID.
+    """
+
+    steps: tuple[int, int]
+    starts: list[int]
+    counts: list[int]
+    shape: tuple[int, ...]
+    block: BlockInfo | None = None
+
+
+class _StepBlocks:
+    """The blocks of a variable in a single step, and which of them a box is in."""
+
+    def __init__(self, blocks: list[BlockInfo], local: bool) -> None:
+        self.by_id = {block.block_id: block for block in blocks}
+        self.local = local
+        # local arrays' blocks are stacked along the first axis, in order
+        self._blocks = blocks
+        self._edges = [block.start[0] for block in blocks] if local else []
+        self._boxes = {(block.start, block.shape): block for block in blocks}
+
+    def find(self, starts: list[int], counts: list[int]) -> BlockInfo | None:
+        """Returns the block that the box (`starts`, `counts`) can be read from by
+        block ID: for local arrays, the block containing it, otherwise a block that is
+        exactly that box."""
+        if not self.local:
+            return self._boxes.get((tuple(starts), tuple(counts)))
+        block = self._blocks[bisect.bisect_right(self._edges, starts[0]) - 1]
+        if starts[0] + counts[0] > block.start[0] + block.shape[0]:
+            return None
+        return block
+
+
+class _DimSelection:
+    """Selection along a single dimension, split into coalesced pieces."""
+
+    def __init__(self, key: Any, length: int, max_gap: int) -> None:
+        # integer keys select a single element and drop the dimension
+        self.drop = isinstance(key, int | np.integer)
+        # restores the requested order if the indices weren't sorted and unique
+        self.inverse: NDArray[np.intp] | None = None
+        self.pieces: list[_Piece] = []
+
+        if self.drop:
+            idx = int(key) + length if key < 0 else int(key)
+            self.size = 1
+            self.pieces.append(_Piece(idx, idx + 1, None, slice(0, 1)))
+            return
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step == 1:
+                self.size = max(stop - start, 0)
+                if self.size > 0:
+                    self.pieces.append(_Piece(start, stop, None, slice(0, self.size)))
+                return
+            indices = np.arange(start, stop, step, dtype=np.intp)
+        else:
+            indices = np.asarray(key, dtype=np.intp).ravel()
+            indices = np.where(indices < 0, indices + length, indices)
+            unique, inverse = np.unique(indices, return_inverse=True)
+            if len(unique) != len(indices) or np.any(unique != indices):
+                self.inverse = inverse
+            indices = unique
+
+        self.size = len(indices)
+        offset = 0
+        for start, stop in _coalesce(indices, max_gap):
+            part = indices[(indices >= start) & (indices < stop)] - start
+            out = slice(offset, offset + len(part))
+            offset += len(part)
+            full = len(part) == stop - start
+            self.pieces.append(_Piece(start, stop, None if full else part, out))
+
+    def split(self, edges: NDArray[np.intp]) -> None:
+        """Splits the pieces at the given (sorted) `edges`, e.g. block boundaries, so
+        none of them extends across one."""
+        pieces = []
+        for piece in self.pieces:
+            lo = np.searchsorted(edges, piece.start, side="right")
+            hi = np.searchsorted(edges, piece.stop, side="left")
+            cuts = edges[lo:hi]
+            if len(cuts) == 0:
+                pieces.append(piece)
+                continue
+
+            indices = np.arange(piece.start, piece.stop, dtype=np.intp)
+            if piece.part is not None:
+                indices = piece.part + piece.start
+            offset = piece.out.start
+            for sub in np.split(indices, np.searchsorted(indices, cuts)):
+                if len(sub) == 0:
+                    continue
+                start, stop = int(sub[0]), int(sub[-1]) + 1
+                full = len(sub) == stop - start
+                out = slice(offset, offset + len(sub))
+                offset += len(sub)
+                pieces.append(_Piece(start, stop, None if full else sub - start, out))
+        self.pieces = pieces
+
+    def merge(self) -> None:
+        """Merges the pieces into a single one, spanning all of them."""
+        if len(self.pieces) < 2:
+            return
+        start, stop = self.pieces[0].start, self.pieces[-1].stop
+        part = np.concatenate(
+            [
+                np.arange(p.start, p.stop, dtype=np.intp)
+                if p.part is None
+                else p.part + p.start
+                for p in self.pieces
+            ]
+        )
+        full = len(part) == stop - start
+        self.pieces = [
+            _Piece(start, stop, None if full else part - start, slice(0, self.size))
+        ]
+
 
 class Adios2Array(BackendArray):
     """Lazy evaluation of a variable stored in an adios2 file.
 
     This also takes care of slicing out the specific component of the data stored as 4-d array.
+
+    Outer (orthogonal) indexing is supported natively: the indices along each
+    dimension are coalesced into contiguous runs, and only the boxes spanned by those
+    runs are read from the file (but no more than `MAX_BOXES` of them, see
+    `_limit_boxes`). Vectorized indexing is decomposed by xarray into
+    such an outer read of the unique indices, followed by indexing in memory.
+
+    If the variable is read from the whole file rather than a single step, its
+    leading axis is the step axis, which is mapped onto an adios2 step selection.
+    Only consecutive steps are merged, since reading an unneeded step costs as much as
+    reading a needed one, and all boxes are read in a single pass through the engine.
+
+    Reading by block splits the selection at the edges of the blocks (`chunks`) and
+    steps, and reads the boxes that are a whole block by its ID, so the engine goes
+    straight to that block's data rather than looking for the blocks a box
+    intersects. Local arrays (see `VariableInfo`) are always read by block, and
+    any part of a block can be read that way. Other variables are read by block if
+    the store's `block_reads` is set.
     """
 
     def __init__(
@@ -22,13 +212,30 @@ class Adios2Array(BackendArray):
         variable_name: str,
         datastore: Adios2Store,
         step: int | None = None,
+        shape: tuple[int, ...] | None = None,
+        dtype: np.dtype[Any] | None = None,
+        has_step_axis: bool | None = None,
+        chunks: tuple[tuple[int, ...], ...] | None = None,
+        local: bool = False,
     ) -> None:
+        """If `shape`, `dtype` and `has_step_axis` are given (as they are by
+        Adios2Store, from the file's metadata), the variable is set up without
+        accessing the engine. `chunks` and `local` describe its blocks (within a
+        step), as in `VariableInfo`."""
         self.variable_name = variable_name
         self.datastore = datastore
         self.step = step
-        array = self.get_array()
-        self.shape = array.shape
-        self.dtype = array.dtype
+        self.chunks = chunks
+        self.local = local
+        self._step_blocks: dict[int, _StepBlocks] = {}
+        if shape is None or dtype is None or has_step_axis is None:
+            array = self.get_array()
+            shape = array.shape
+            dtype = array.dtype
+            has_step_axis = step is None and array._step == slice(None)
+        self.shape = shape
+        self.dtype = dtype
+        self.has_step_axis = has_step_axis
 
     def get_array(self, needs_lock: bool = True) -> adios2py.ArrayProxy:
         if self.step is not None:
@@ -37,9 +244,353 @@ class Adios2Array(BackendArray):
 
     def __getitem__(self, key: indexing.ExplicitIndexer) -> NDArray[Any]:
         return indexing.explicit_indexing_adapter(  # type: ignore[no-any-return]
-            key, self.shape, indexing.IndexingSupport.BASIC, self._getitem
+            key, self.shape, indexing.IndexingSupport.OUTER, self._getitem
+        )
+
+    def _getitem(self, key: tuple[Any, ...]) -> NDArray[Any]:
+        return self.read(key)
+
+    def read(
+        self, key: tuple[Any, ...], out: NDArray[Any] | None = None
+    ) -> NDArray[Any]:
+        """Reads the outer (orthogonal) selection `key`, with an integer, slice or
+        array of indices per dimension.
+
+        The result is assembled in a single array, `out` if given (e.g., a buffer in
+        shared memory), which must have the shape and dtype of the result. Boxes that
+        map onto a contiguous part of the result (like a whole selection, or a range
+        of steps) are read by the engine directly into place, so without any
+        intermediate copies, the memory needed is just the result itself.
+        """
+        gaps = [self.datastore.coalesce_gap] * len(self.shape)
+        if self.has_step_axis:
+            gaps[0] = 0
+        dims = [
+            _DimSelection(k, length, gap)
+            for k, length, gap in zip(key, self.shape, gaps, strict=True)
+        ]
+        if self.by_block:
+            self._split_at_blocks(dims)
+        self._limit_boxes(dims)
+        kept = [dim for dim in dims if not dim.drop]
+        shape = tuple(dim.size for dim in kept)
+        reordered = any(dim.inverse is not None for dim in kept)
+        result_shape = tuple(
+            dim.size if dim.inverse is None else len(dim.inverse) for dim in kept
         )
+        if out is not None and (out.shape != result_shape or out.dtype != self.dtype):
+            msg = (
+                f"Expected an output buffer of shape {result_shape} and dtype "
+                f"{self.dtype}, got {out.shape} and {out.dtype}."
+            )
+            raise ValueError(msg)
+
+        if any(dim.size == 0 for dim in kept):
+            return np.empty(shape, dtype=self.dtype) if out is None else out
+
+        boxes = list(itertools.product(*(dim.pieces for dim in dims)))
+        box_outs = [
+            [p for dim, p in zip(dims, pieces, strict=True) if not dim.drop]
+            for pieces in boxes
+        ]
+        if (
+            out is None
+            and not reordered
+            and len(boxes) == 1
+            and all(p.part is None for p in box_outs[0])
+        ):
+            # the box is the whole result, as read (e.g., into the shared memory of a
+            # read worker), but blocks owned by the cache need to be copied
+            [data] = self._read_boxes(dims, boxes)
+            return data if self.datastore.block_cache is None else data.copy()
+
+        # with indices out of order, the result is assembled in a temporary buffer
+        # first, and then reordered
+        buffer = out if out is not None and not reordered else None
+        if buffer is None:
+            buffer = np.empty(shape, dtype=self.dtype)
+        # boxes that can be read into the buffer directly (blocks owned by the cache
+        # need to be separate arrays)
+        direct = {}
+        if self.datastore.block_cache is None:
+            for n, kept_pieces in enumerate(box_outs):
+                if any(p.part is not None for p in kept_pieces):
+                    continue
+                # (the Ellipsis makes this a view even for 0-d results)
+                index: tuple[Any, ...] = (*(p.out for p in kept_pieces), ...)
+                view = buffer[index]
+                if view.flags.c_contiguous:
+                    direct[n] = view
+
+        datas = self._read_boxes(dims, boxes, direct)
+        for n, (kept_pieces, data) in enumerate(zip(box_outs, datas, strict=True)):
+            if n in direct and data is direct[n]:
+                continue
+            if any(p.part is not None for p in kept_pieces):
+                data = data[  # noqa: PLW2901
+                    np.ix_(
+                        *(
+                            np.arange(p.stop - p.start) if p.part is None else p.part
+                            for p in kept_pieces
+                        )
+                    )
+                ]
+            buffer[tuple(p.out for p in kept_pieces)] = data
+
+        if not reordered:
+            return buffer
+        for axis, dim in enumerate(kept):
+            if dim.inverse is not None:
+                buffer = np.take(buffer, dim.inverse, axis=axis)
+        if out is None:
+            return buffer
+        out[...] = buffer
+        return out
+
+    @property
+    def by_block(self) -> bool:
+        """Whether the variable is read by block ID where possible."""
+        return self.local or (self.datastore.block_reads and self.chunks is not None)
+
+    def _split_at_blocks(self, dims: list[_DimSelection]) -> None:
+        """Splits the selection into boxes that don't extend across steps or blocks
+        (as laid out in the first step)."""
+        spatial = dims[1:] if self.has_step_axis else dims
+        if self.has_step_axis:
+            dims[0].split(np.arange(self.shape[0] + 1, dtype=np.intp))
+        for dim, chunks in zip(spatial, self.chunks or (), strict=True):
+            dim.split(np.cumsum(chunks, dtype=np.intp))
 
-    def _getitem(self, key) -> NDArray[Any]:  # type: ignore[no-untyped-def]
+    def _limit_boxes(self, dims: list[_DimSelection]) -> None:
+        """Merges the pieces along trailing dimensions until the selection has no more
+        than `MAX_BOXES` boxes, so, e.g., a strided selection is read as rows spanning
+        the selected elements rather than each element on its own. The step axis, and
+        the blocks that local arrays are read by, are kept apart."""
+        n_boxes = int(np.prod([len(dim.pieces) for dim in dims]))
+        fixed = int(self.has_step_axis) + int(self.local)
+        for dim in reversed(dims[fixed:]):
+            if n_boxes <= MAX_BOXES:
+                break
+            n_boxes //= len(dim.pieces)
+            dim.merge()
+
+    def read_block(self, block_id: int, step: int | None = None) -> NDArray[Any]:
+        """Reads the block with ID `block_id` (as written by a single writer) as a
+        whole, selecting it by its ID.
+
+        For variables with a step axis, `step` is the index along it. For local
+        arrays, the block is the part of the array given by `chunks[0]`.
+        """
+        if self.has_step_axis == (step is None):
+            msg = (
+                f"Variable {self.variable_name} has a step axis, which needs a step."
+                if self.has_step_axis
+                else f"Variable {self.variable_name} doesn't have a step axis."
+            )
+            raise ValueError(msg)
+
+        def selections(file: adios2py.File, file_step: int) -> list[_Selection]:
+            at = file_step if step is None else range(self.shape[0])[step]
+            block = self._blocks(file, at).by_id.get(block_id)
+            if block is None:
+                msg = f"Variable {self.variable_name} has no block {block_id} in step {at}."
+                raise IndexError(msg)
+            starts, counts = list(block.start), list(block.shape)
+            return [_Selection((at, 1), starts, counts, block.shape, block)]
+
+        [data] = self._read_selections(selections)
+        return data
+
+    def _blocks(self, file: adios2py.File, step: int) -> _StepBlocks:
+        """Returns the blocks in `step`, which are kept for the most recent steps."""
+        blocks = self._step_blocks.get(step)
+        if blocks is not None:
+            return blocks
+
+        infos = blocks_info(file, self.variable_name, step)
+        if self.local:
+            concatenated = local_blocks(infos)
+            spatial_shape = self.shape[1:] if self.has_step_axis else self.shape
+            if (
+                concatenated is None
+                or self.chunks is None
+                or tuple(b.shape[0] for b in concatenated) != self.chunks[0]
+                or concatenated[0].shape[1:] != spatial_shape[1:]
+            ):
+                msg = (
+                    f"The blocks of local array {self.variable_name} in step {step} "
+                    "differ from those in the first step."
+                )
+                raise ValueError(msg)
+            infos = concatenated
+
+        if len(self._step_blocks) >= _MAX_BLOCK_STEPS:
+            del self._step_blocks[next(iter(self._step_blocks))]
+        blocks = self._step_blocks[step] = _StepBlocks(infos, self.local)
+        return blocks
+
+    def _read_boxes(
+        self,
+        dims: list[_DimSelection],
+        boxes: list[tuple[_Piece, ...]],
+        direct: dict[int, NDArray[Any]] | None = None,
+    ) -> list[NDArray[Any]]:
+        """Read the given boxes, see `_read_selections`."""
+
+        def selections(file: adios2py.File, step: int | None) -> list[_Selection]:
+            sels = [self._selection(dims, pieces, step) for pieces in boxes]
+            if not self.by_block:
+                return sels
+            # (the boxes of local arrays always lie within a block, since `_blocks`
+            # checks that the blocks are those the selection was split at)
+            return [
+                sel._replace(
+                    block=self._blocks(file, sel.steps[0]).find(sel.starts, sel.counts)
+                )
+                for sel in sels
+            ]
+
+        return self._read_selections(selections, direct)
+
+    def _read_selections(
+        self,
+        make_selections: Callable[[adios2py.File, Any], list[_Selection]],
+        direct: dict[int, NDArray[Any]] | None = None,
+    ) -> list[NDArray[Any]]:
+        """Read the selections returned by `make_selections(file, step)` (called with
+        the lock held), queuing them all before performing the reads at once.
+
+        Selections with an array in `direct` are read into that array (which has to
+        be contiguous), rather than a newly allocated one, unless they are read by the
+        pool of read workers, whose results are returned as they are.
+
+        If the store has a pool of read workers, selections that are large enough (and
+        not of a block) are read by the workers instead. If the store has a block
+        cache, selections are looked up there first, and whatever had to be read is added to it. Blocks coming from
+        the cache are read-only.
+
+        If the store has `read_stats`, the read is recorded there.
+        """
+        datas: dict[int, NDArray[Any]] = {}
+        read: list[int] = []  # selections that didn't come from the cache
+        parallel: dict[int, _Selection] = {}
+        pool = self.datastore.read_pool
+        cache = self.datastore.block_cache
+        identity = None
+        start = time.perf_counter()
         with self.datastore.lock:
-            return self.get_array(needs_lock=False)[key]
+            locked = time.perf_counter()
+            group = self.datastore.acquire(needs_lock=False)
+            file = group._file
+            if file._mode not in ("r", "rra"):
+                msg = f"Cannot read variables in mode {file._mode}."
+                raise ValueError(msg)
+
+            var = file.io.InquireVariable(self.variable_name)
+            if not var:
+                msg = f"Variable {self.variable_name} not found."
+                raise KeyError(msg)
+
+            step = self.step if self.step is not None else group._step
+            if pool is not None or cache is not None:
+                identity = FileIdentity.from_file(file)
+            selections = make_selections(file, step)
+            for n, sel in enumerate(selections):
+                if cache is not None:
+                    cached = cache.get(self._cache_key(identity, sel))
+                    if cached is not None:
+                        datas[n] = cached
+                        continue
+
+                if (
+                    pool is not None
+                    and sel.block is None
+                    and file._mode == "rra"
+                    and np.prod(sel.shape) * self.dtype.itemsize
+                    >= self.datastore.parallel_min_bytes
+                ):
+                    parallel[n] = sel
+                    continue
+
+                if file._mode == "rra":
+                    var.SetStepSelection(sel.steps)
+                elif not file.in_step() or sel.steps != (file.current_step(), 1):
+                    msg = "Trying to access non-current step in streaming mode"
+                    raise IndexError(msg)
+                if sel.block is not None:
+                    # (selecting a block resets the selection, so that has to come
+                    # after it; global arrays can only be read as whole blocks)
+                    var.SetBlockSelection(sel.block.block_id)
+                    if self.local:
+                        starts = np.subtract(sel.starts, sel.block.start).tolist()
+                        var.SetSelection((starts, sel.counts))
+                elif sel.starts:
+                    var.SetSelection((sel.starts, sel.counts))
+
+                data = direct.get(n) if direct else None
+                if data is None:
+                    data = np.empty(sel.shape, dtype=self.dtype)
+                file.engine.Get(var, data, adios2bindings.Mode.Deferred)
+                datas[n] = data
+                read.append(n)
+            performing = time.perf_counter()
+            file.engine.PerformGets()
+            engine_time = time.perf_counter() - performing
+
+        for n, sel in parallel.items():
+            assert pool is not None
+            assert identity is not None
+            read.append(n)
+            performing = time.perf_counter()
+            datas[n] = pool.read(
+                identity,
+                self.variable_name,
+                sel.steps,
+                sel.starts,
+                sel.counts,
+                sel.shape,
+                self.dtype,
+            )
+            engine_time += time.perf_counter() - performing
+        if cache is not None:
+            for n in read:
+                cache.put(self._cache_key(identity, selections[n]), datas[n])
+        stats = self.datastore.read_stats
+        if stats is not None:
+            stats.record(
+                self.variable_name,
+                shapes=[sel.shape for sel in selections],
+                nbytes=sum(data.nbytes for data in datas.values()),
+                cached_boxes=len(selections) - len(read),
+                lock_wait=locked - start,
+                engine_time=engine_time,
+                duration=time.perf_counter() - start,
+            )
+        return [datas[n] for n in range(len(selections))]
+
+    def _cache_key(self, identity: FileIdentity | None, sel: _Selection) -> Hashable:
+        return (
+            identity,
+            self.variable_name,
+            sel.steps,
+            tuple(sel.starts),
+            tuple(sel.counts),
+        )
+
+    def _selection(
+        self, dims: list[_DimSelection], pieces: tuple[_Piece, ...], step: int | None
+    ) -> _Selection:
+        starts = [p.start for p in pieces]
+        counts = [p.stop - p.start for p in pieces]
+        if self.has_step_axis:
+            steps = (starts.pop(0), counts.pop(0))
+        else:
+            assert step is not None
+            steps = (step, 1)
+
+        shape = tuple(
+            p.stop - p.start
+            for dim, p in zip(dims, pieces, strict=True)
+            if not dim.drop
+        )
+        return _Selection(steps, starts, counts, shape)
@@ -7,19 +7,42 @@ from typing import Any
 
 import adios2py
 from typing_extensions import override
-from xarray.backends.common import AbstractDataStore, BackendEntrypoint
+from xarray.backends.common import (
+    AbstractDataStore,
+    BackendEntrypoint,
+    datatree_from_dict_with_io_cleanup,
+)
 from xarray.backends.store import StoreBackendEntrypoint
 from xarray.core.dataset import Dataset
 from xarray.core.datatree import DataTree
+from xarray.core.treenode import NodePath
 from xarray.core.types import ReadBuffer
+from xarray.core.utils import close_on_error
 
-from .adios2store import Adios2Store
+from .adios2array import DEFAULT_COALESCE_GAP
+from .adios2cache import BlockCache
+from .adios2instrument import ReadStats
+from .adios2metadata import list_groups
+from .adios2store import Adios2Store, Lock
 
 
 class Adios2BackendEntrypoint(BackendEntrypoint):
     """Entrypoint that lets xarray recognize and read ADIOS2 output."""
 
-    open_dataset_parameters = ("filename_or_obj", "drop_variables")
+    open_dataset_parameters = (
+        "filename_or_obj",
+        "drop_variables",
+        "variables",
+        "lock",
+        "coalesce_gap",
+        "read_workers",
+        "block_cache",
+        "metadata_index",
+        "group",
+        "read_stats",
+        "comm",
+        "block_reads",
+    )
     # url =
     available = True
 
@@ -46,14 +69,31 @@ class Adios2BackendEntrypoint(BackendEntrypoint):
         drop_variables: str | Iterable[str] | None = None,
         use_cftime: bool | None = None,
         decode_timedelta: bool | None = None,
+        variables: str | Iterable[str] | None = None,
+        lock: Lock | None = None,
+        coalesce_gap: int = DEFAULT_COALESCE_GAP,
+        read_workers: int | None = None,
+        block_cache: BlockCache | None = None,
+        metadata_index: bool = False,
+        group: str | None = None,
+        read_stats: ReadStats | None = None,
+        comm: Any = None,
+        block_reads: bool = False,
     ) -> Dataset:
-        if isinstance(filename_or_obj, str | os.PathLike):
-            store = Adios2Store.open(filename_or_obj)
-        elif isinstance(filename_or_obj, adios2py.Group):
-            store = Adios2Store(filename_or_obj)
-        else:
-            msg = f"unknown {filename_or_obj=}"
-            raise TypeError(msg)
+        store = _open_store(
+            filename_or_obj,
+            lock=lock,
+            coalesce_gap=coalesce_gap,
+            read_workers=read_workers,
+            block_cache=block_cache,
+            variables=variables,
+            drop_variables=drop_variables,
+            metadata_index=metadata_index,
+            group=group,
+            read_stats=read_stats,
+            comm=comm,
+            block_reads=block_reads,
+        )
 
         store_entrypoint = StoreBackendEntrypoint()
 
@@ -74,4 +114,89 @@ class Adios2BackendEntrypoint(BackendEntrypoint):
         filename_or_obj: str | os.PathLike[Any] | ReadBuffer[Any] | AbstractDataStore,
         **kwargs: Any,
     ) -> DataTree:
-        raise NotImplementedError()
+        """Opens path-style variable names ("species/electron/density") as a tree of
+        groups, see `open_groups_as_dict`."""
+        groups_dict = self.open_groups_as_dict(filename_or_obj, **kwargs)
+        return datatree_from_dict_with_io_cleanup(groups_dict)
+
+    @override
+    def open_groups_as_dict(
+        self,
+        filename_or_obj: str | os.PathLike[Any] | ReadBuffer[Any] | AbstractDataStore,
+        *,
+        mask_and_scale: bool = True,
+        decode_times: bool = True,
+        concat_characters: bool = True,
+        decode_coords: bool = True,
+        drop_variables: str | Iterable[str] | None = None,
+        use_cftime: bool | None = None,
+        decode_timedelta: bool | None = None,
+        variables: str | Iterable[str] | None = None,
+        lock: Lock | None = None,
+        coalesce_gap: int = DEFAULT_COALESCE_GAP,
+        read_workers: int | None = None,
+        block_cache: BlockCache | None = None,
+        group: str | None = None,
+        read_stats: ReadStats | None = None,
+        comm: Any = None,
+        block_reads: bool = False,
+    ) -> dict[str, Dataset]:
+        """Opens every group of path-style names as a Dataset of its own.
+
+        A variable "species/electron/density" becomes variable "density" of group
+        "/species/electron", and attribute "species/electron/charge" (where there is no
+        variable "species/electron") an attribute of that group. The step dimension
+        and coordinates of the root group are inherited by all groups.
+
+        All groups share a single open file. Each group only reads the attributes and
+        block metadata of its own variables, so opening a subtree with `group` (e.g.
+        `group="species/electron"`) doesn't read the metadata of the other groups at
+        all. `variables` and `drop_variables` apply to the names within each group.
+        """
+        store = _open_store(
+            filename_or_obj,
+            lock=lock,
+            coalesce_gap=coalesce_gap,
+            read_workers=read_workers,
+            block_cache=block_cache,
+            read_stats=read_stats,
+            variables=variables,
+            drop_variables=drop_variables,
+            comm=comm,
+            block_reads=block_reads,
+        )
+        parent = NodePath("/") / NodePath(group or "")  # type: ignore[no-untyped-call]
+        groups_dict = {}
+        with close_on_error(store):
+            groups = list_groups(store.ds._file, group, store._inquire_available())
+        for path in groups:
+            group_store = store.group_store(path)
+            store_entrypoint = StoreBackendEntrypoint()
+            with close_on_error(group_store):
+                group_ds = store_entrypoint.open_dataset(
+                    group_store,
+                    mask_and_scale=mask_and_scale,
+                    decode_times=decode_times,
+                    concat_characters=concat_characters,
+                    decode_coords=decode_coords,
+                    drop_variables=drop_variables,
+                    use_cftime=use_cftime,
+                    decode_timedelta=decode_timedelta,
+                )
+            name = path
+            if group:
+                name = str(NodePath(path).relative_to(parent))  # type: ignore[no-untyped-call]
+            groups_dict[name] = group_ds
+        return groups_dict
+
+
+def _open_store(
+    filename_or_obj: str | os.PathLike[Any] | ReadBuffer[Any] | AbstractDataStore,
+    **kwargs: Any,
+) -> Adios2Store:
+    if isinstance(filename_or_obj, str | os.PathLike):
+        return Adios2Store.open(filename_or_obj, **kwargs)
+    if isinstance(filename_or_obj, adios2py.Group):
+        return Adios2Store(filename_or_obj, **kwargs)
+    msg = f"unknown {filename_or_obj=}"
+    raise TypeError(msg)
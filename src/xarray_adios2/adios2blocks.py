@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import adios2py
+import numpy as np
+
+# adios2 reports the min/max of floating point data with 6 significant digits
+STATS_RTOL = 1e-5
+
+
+class BlockInfo(NamedTuple):
+    """Describes one block of a variable, as written by a single writer.
+
+    `vmin` and `vmax` are the smallest and largest value in the block, as recorded by
+    adios2 (None if not available, e.g. for complex data). For floating point data,
+    they are only accurate to about 6 significant digits, see `bounds()`.
+    """
+
+    block_id: int
+    writer_id: int
+    start: tuple[int, ...]
+    shape: tuple[int, ...]
+    vmin: float | None = None
+    vmax: float | None = None
+
+    def bounds(self) -> tuple[float, float] | None:
+        """Returns (vmin, vmax), widened so they're guaranteed to contain all values
+        in the block, or None if there are no statistics."""
+        if self.vmin is None or self.vmax is None:
+            return None
+        return (
+            self.vmin - abs(self.vmin) * STATS_RTOL,
+            self.vmax + abs(self.vmax) * STATS_RTOL,
+        )
+
+    def may_contain(self, lower: float | None, upper: float | None) -> bool:
+        """Returns False if no value in the block can lie within [lower, upper]."""
+        bounds = self.bounds()
+        if bounds is None:
+            return True
+        return (lower is None or bounds[1] >= lower) and (
+            upper is None or bounds[0] <= upper
+        )
+
+
+def _parse_dims(dims: str) -> tuple[int, ...]:
+    return tuple(int(n) for n in dims.split(",")) if dims else ()
+
+
+def _parse_stat(value: str) -> float | None:
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def blocks_info(file: adios2py.File, name: str, step: int) -> list[BlockInfo]:
+    """Returns the block decomposition of variable `name` in the given step.
+
+    A scalar is a single block with empty `start` and `shape`, whose min and max
+    are its value.
+    """
+    blocks = []
+    for info in file.engine.BlocksInfo(name, step):
+        if info["IsReverseDims"] == "True":
+            continue
+        # (adios2 reports a count of 0 for single values)
+        is_value = info["IsValue"] == "True"
+        value = info.get("Value", "")
+        blocks.append(
+            BlockInfo(
+                block_id=int(info["BlockID"]),
+                writer_id=int(info["WriterID"]),
+                start=() if is_value else _parse_dims(info["Start"]),
+                shape=() if is_value else _parse_dims(info["Count"]),
+                vmin=_parse_stat(info.get("Min", value)),
+                vmax=_parse_stat(info.get("Max", value)),
+            )
+        )
+    return blocks
+
+
+def local_blocks(blocks: list[BlockInfo]) -> list[BlockInfo] | None:
+    """Returns the blocks of a local array (written without a global shape), with
+    their `start` set to where they are in the concatenation of all blocks along the
+    first axis, in the order of their IDs.
+
+    Returns None if the blocks can't be concatenated that way, i.e., if there are
+    none, or they differ in shape other than along the first axis.
+    """
+    blocks = sorted(blocks, key=lambda block: block.block_id)
+    if not blocks or not blocks[0].shape:
+        return None
+    rest = blocks[0].shape[1:]
+    if any(block.shape[1:] != rest for block in blocks):
+        return None
+
+    concatenated = []
+    offset = 0
+    for block in blocks:
+        start = (offset,) + (0,) * len(rest)
+        concatenated.append(block._replace(start=start))
+        offset += block.shape[0]
+    return concatenated
+
+
+def blocks_shape(blocks: list[BlockInfo]) -> tuple[int, ...]:
+    """Returns the shape of the box spanned by `blocks`, starting at the origin."""
+    return tuple(
+        max(start + count for start, count in dims)
+        for dims in zip(
+            *(zip(block.start, block.shape, strict=True) for block in blocks),
+            strict=True,
+        )
+    )
+
+
+def block_chunks(
+    blocks: list[BlockInfo], shape: tuple[int, ...]
+) -> tuple[tuple[int, ...], ...] | None:
+    """Returns chunk sizes along each dimension that line up with all block boundaries.
+
+    If the blocks form a regular grid, every chunk is exactly one block, otherwise
+    blocks are split further as needed. Returns None if there is no useful
+    decomposition.
+    """
+    if not blocks or not shape or 0 in shape:
+        return None
+
+    chunks = []
+    for dim, length in enumerate(shape):
+        edges = {0, length}
+        for block in blocks:
+            if len(block.start) != len(shape):
+                return None
+            edges.add(block.start[dim])
+            edges.add(block.start[dim] + block.shape[dim])
+        edges_arr = np.array(sorted(edges))
+        edges_arr = edges_arr[(edges_arr >= 0) & (edges_arr <= length)]
+        chunks.append(tuple(np.diff(edges_arr).tolist()))
+    return tuple(chunks)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from numpy.typing import NDArray
+
+from .adios2shared import ProcessShared
+
+
+class BlockCache(ProcessShared):
+    """LRU cache for blocks read from adios2 files, limited by their total size.
+
+    Blocks are keyed by file, variable, steps and selection, so a single cache can be
+    shared by any number of stores, including ones for the same file. Cached blocks
+    are read-only. If files are rewritten while the cache is in use, call `clear()`.
+
+    `hits` and `misses` count lookups, and `evictions` counts blocks dropped to stay
+    within `max_bytes`, which helps with sizing the cache.
+
+    When pickled, e.g. with stores sent to dask workers, the cache is shared per
+    process, see `ProcessShared`; in other processes, it starts out empty.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._blocks: OrderedDict[Hashable, NDArray[Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_args(self) -> tuple[Any, ...]:
+        return (self.max_bytes,)
+
+    def __repr__(self) -> str:
+        return (
+            f"BlockCache(max_bytes={self.max_bytes}, nbytes={self.nbytes}, "
+            f"blocks={len(self)}, hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def get(self, key: Hashable) -> NDArray[Any] | None:
+        with self._lock:
+            data = self._blocks.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Hashable, data: NDArray[Any]) -> None:
+        if data.nbytes > self.max_bytes:
+            return
+        data.flags.writeable = False
+        with self._lock:
+            old = self._blocks.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._blocks[key] = data
+            self.nbytes += data.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._blocks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self.nbytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_bytes": self.max_bytes,
+            "nbytes": self.nbytes,
+            "blocks": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any, NamedTuple
+
+import xarray as xr
+from xarray.namedarray.utils import is_duck_dask_array
+
+from .adios2store import Adios2Store
+
+FORMATS = ("zarr", "netcdf")
+
+# Zarr attribute recording the steps converted so far, until the conversion is done
+_PROGRESS_ATTR = "_xarray_adios2_converted_steps"
+
+
+class ConvertProgress(NamedTuple):
+    """How far `convert` got: `steps` of `n_steps` are done, and `nbytes` (as
+    uncompressed data) were written in `seconds` by this call."""
+
+    steps: int
+    n_steps: int
+    nbytes: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes written per second."""
+        return self.nbytes / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.steps}/{self.n_steps} steps, {self.nbytes / 1e6:.1f} MB in "
+            f"{self.seconds:.1f} s ({self.throughput / 1e6:.1f} MB/s)"
+        )
+
+
+def _target_format(target: str, format: str | None) -> str:
+    if format is None:
+        format = "netcdf" if target.endswith((".nc", ".nc4")) else "zarr"
+    if format not in FORMATS:
+        msg = f"Unknown format {format!r}, expected any of {list(FORMATS)}."
+        raise ValueError(msg)
+    return format
+
+
+def _chunk_sizes(
+    ds: xr.Dataset, step_dimension: str | None, steps_per_chunk: int
+) -> dict[str, int]:
+    """Returns the chunk size along each dimension, following the blocks the
+    variables were written in.
+
+    Zarr needs chunks of the same size (but the last), so if the blocks along a
+    dimension differ in size, the largest is used.
+    """
+    sizes: dict[str, int] = {}
+    for var in ds.variables.values():
+        for dim, chunks in var.encoding.get("preferred_chunks", {}).items():
+            if dim != step_dimension:
+                sizes.setdefault(
+                    dim, chunks if isinstance(chunks, int) else max(chunks)
+                )
+    if step_dimension is not None:
+        sizes[step_dimension] = steps_per_chunk
+    return sizes
+
+
+def _open_progress(target: str) -> Any:
+    import zarr  # noqa: PLC0415
+
+    return zarr.open_group(target, mode="r+").attrs
+
+
+def _write_static(ds: xr.Dataset, target: str, step_dimension: str | None) -> int:
+    """Writes the dask variables of `ds` without the step dimension to the Zarr
+    store `target`, chunk by chunk, and returns the bytes written."""
+    static = [
+        name
+        for name, var in ds.variables.items()
+        if var.dims and step_dimension not in var.dims and is_duck_dask_array(var.data)
+    ]
+    if not static:
+        return 0
+    region = {
+        str(dim): slice(None) for name in static for dim in ds.variables[name].dims
+    }
+    written = ds[static].drop_vars(
+        [name for name in ds[static].variables if name not in static]
+    )
+    written.to_zarr(target, region=region, consolidated=False)
+    return written.nbytes
+
+
+def _convert_zarr(
+    ds: xr.Dataset,
+    target: str,
+    step_dimension: str | None,
+    steps_per_chunk: int,
+    resume: bool,
+    overwrite: bool,
+    progress: Callable[[ConvertProgress], None] | None,
+) -> ConvertProgress:
+    """Writes `ds` to Zarr store `target` in batches of `steps_per_chunk` steps,
+    recording the steps written after every batch, so a failed conversion can be
+    resumed. Variables without the step dimension are written first, see
+    `_write_static`."""
+    n_steps = ds.sizes[step_dimension] if step_dimension is not None else 1
+    start_time = time.perf_counter()
+    first = 0
+    if resume and os.path.exists(target):  # noqa: PTH110
+        attrs = _open_progress(target)
+        if _PROGRESS_ATTR not in attrs:
+            # (done already)
+            return ConvertProgress(n_steps, n_steps, 0, 0.0)
+        first = int(attrs[_PROGRESS_ATTR])
+        with xr.open_zarr(target, consolidated=False) as existing:
+            if step_dimension is None or existing.sizes.get(step_dimension) != n_steps:
+                msg = (
+                    f"Cannot resume converting to {target!r}, which doesn't have the "
+                    f"same {n_steps} steps as the source."
+                )
+                raise ValueError(msg)
+    else:
+        if os.path.exists(target) and not overwrite:  # noqa: PTH110
+            msg = f"{target!r} exists already, pass `resume` or `overwrite`."
+            raise FileExistsError(msg)
+        scalars = [name for name, var in ds.variables.items() if not var.dims]
+        # writes the metadata, and the variables that are in memory (only)
+        ds.update(ds[scalars].load())
+        ds.to_zarr(target, mode="w", compute=False, consolidated=False)
+        _open_progress(target)[_PROGRESS_ATTR] = 0
+
+    nbytes = 0
+    if first == 0:
+        # (again, if resuming a conversion that failed before any steps were written)
+        nbytes += _write_static(ds, target, step_dimension)
+    current = ConvertProgress(first, n_steps, nbytes, 0.0)
+    if step_dimension is not None:
+        batch_vars = [
+            name for name, var in ds.variables.items() if step_dimension in var.dims
+        ]
+        for start in range(first, n_steps, steps_per_chunk):
+            stop = min(start + steps_per_chunk, n_steps)
+            batch = ds[batch_vars].isel({step_dimension: slice(start, stop)})
+            batch = batch.drop_vars(
+                [
+                    name
+                    for name, var in batch.variables.items()
+                    if name not in batch_vars
+                ]
+            )
+            batch.to_zarr(
+                target, region={step_dimension: slice(start, stop)}, consolidated=False
+            )
+            _open_progress(target)[_PROGRESS_ATTR] = stop
+            nbytes += batch.nbytes
+            current = ConvertProgress(
+                stop, n_steps, nbytes, time.perf_counter() - start_time
+            )
+            if progress is not None:
+                progress(current)
+
+    del _open_progress(target)[_PROGRESS_ATTR]
+    return current._replace(steps=n_steps, seconds=time.perf_counter() - start_time)
+
+
+def convert(
+    source: str | os.PathLike[Any],
+    target: str | os.PathLike[Any],
+    format: str | None = None,
+    variables: str | Iterable[str] | None = None,
+    drop_variables: str | Iterable[str] | None = None,
+    steps_per_chunk: int = 1,
+    scheduler: str = "threads",
+    workers: int | None = None,
+    resume: bool = False,
+    overwrite: bool = False,
+    parameters: Mapping[str, str] | None = None,
+    engine_type: str | None = None,
+    progress: Callable[[ConvertProgress], None] | None = None,
+) -> ConvertProgress:
+    """Converts adios2 file `source` to Zarr (or netCDF, by `format` or if `target`
+    ends in ".nc"), and returns how long that took.
+
+    The steps are converted `steps_per_chunk` at a time, so no more than that many
+    steps (per dask worker) are in memory at once. Each variable is read and written
+    in chunks following the blocks it was written in (like `xr.open_dataset` with
+    `chunks={}` and `block_reads`), where Zarr allows, see `_chunk_sizes`, with
+    `steps_per_chunk` steps per chunk. The chunks are read, encoded and written by
+    dask, with its `scheduler` ("threads", "processes" or "synchronous") and
+    `workers`. Since every store reads from its own adios2 engine, which only
+    serves one thread at a time, "processes" reads in parallel, too.
+
+    `variables` and `drop_variables` select the variables to convert, and
+    `parameters` and `engine_type` are used to open `source`, like in
+    `Adios2Store.open`.
+
+    Converting to Zarr records the steps written so far in the store, until it's
+    done. If a conversion fails, passing `resume` picks it up after the last steps
+    written. Otherwise, an existing `target` is only replaced with `overwrite`.
+    Conversions to netCDF are written in one go, and can't be resumed.
+
+    `progress` is called with the `ConvertProgress` after every `steps_per_chunk`
+    steps written to Zarr.
+    """
+    import dask  # noqa: PLC0415
+
+    source = os.fspath(source)
+    target = os.fspath(target)
+    format = _target_format(target, format)
+    if steps_per_chunk < 1:
+        msg = f"steps_per_chunk needs to be at least 1, not {steps_per_chunk}."
+        raise ValueError(msg)
+    if resume and format != "zarr":
+        msg = "Only conversions to Zarr can be resumed."
+        raise ValueError(msg)
+
+    store = Adios2Store.open(
+        source,
+        parameters=parameters,
+        engine_type=engine_type,
+        variables=variables,
+        drop_variables=drop_variables,
+        block_reads=True,
+    )
+    config: dict[str, Any] = {"scheduler": scheduler}
+    if workers is not None:
+        config["num_workers"] = workers
+    with xr.open_dataset(store, chunks={}) as ds, dask.config.set(config):
+        step_dimension = ds.encoding.get("step_dimension")
+        if step_dimension not in ds.dims:
+            step_dimension = None
+        converted = ds.chunk(_chunk_sizes(ds, step_dimension, steps_per_chunk))
+        converted = converted.drop_encoding()
+        if format == "zarr":
+            return _convert_zarr(
+                converted,
+                target,
+                step_dimension,
+                steps_per_chunk,
+                resume,
+                overwrite,
+                progress,
+            )
+
+        if os.path.exists(target) and not overwrite:  # noqa: PTH110
+            msg = f"{target!r} exists already, pass `overwrite`."
+            raise FileExistsError(msg)
+        start_time = time.perf_counter()
+        converted.to_netcdf(target)
+        n_steps = ds.sizes[step_dimension] if step_dimension is not None else 1
+        return ConvertProgress(
+            n_steps, n_steps, converted.nbytes, time.perf_counter() - start_time
+        )
+
+
+def _parameter(value: str) -> tuple[str, str]:
+    key, sep, param = value.partition("=")
+    if not sep:
+        msg = f"expected KEY=VALUE, got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return key, param
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the `xarray-adios2` command."""
+    parser = argparse.ArgumentParser(
+        prog="xarray-adios2", description="Tools for adios2 files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    parser_convert = commands.add_parser(
+        "convert",
+        help="convert an adios2 file to Zarr or netCDF",
+        description=(
+            "Converts an adios2 file to Zarr (or netCDF, if TARGET ends in .nc), "
+            "step by step, in chunks following the blocks of the variables."
+        ),
+    )
+    parser_convert.add_argument("source", help="adios2 file to convert")
+    parser_convert.add_argument("target", help="Zarr store or netCDF file to write")
+    parser_convert.add_argument("--format", choices=FORMATS)
+    parser_convert.add_argument(
+        "--variables", nargs="+", metavar="PATTERN", help="variables to convert"
+    )
+    parser_convert.add_argument(
+        "--drop-variables", nargs="+", metavar="NAME", help="variables to skip"
+    )
+    parser_convert.add_argument(
+        "--steps-per-chunk",
+        type=int,
+        default=1,
+        metavar="N",
+        help="steps per chunk, and per write (default: 1)",
+    )
+    parser_convert.add_argument(
+        "--scheduler",
+        choices=("threads", "processes", "synchronous"),
+        default="threads",
+        help="dask scheduler reading and encoding the chunks (default: threads)",
+    )
+    parser_convert.add_argument(
+        "--workers", type=int, metavar="N", help="number of dask workers"
+    )
+    parser_convert.add_argument(
+        "--resume", action="store_true", help="resume a failed conversion to Zarr"
+    )
+    parser_convert.add_argument(
+        "--overwrite", action="store_true", help="replace an existing TARGET"
+    )
+    parser_convert.add_argument(
+        "--parameter",
+        type=_parameter,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="adios2 engine parameter for reading SOURCE",
+    )
+    parser_convert.add_argument("--engine-type", help="adios2 engine for SOURCE")
+    parser_convert.add_argument(
+        "-q", "--quiet", action="store_true", help="don't report progress"
+    )
+    args = parser.parse_args(argv)
+
+    def report(progress: ConvertProgress) -> None:
+        if not args.quiet:
+            sys.stderr.write(f"{progress}\n")
+
+    try:
+        result = convert(
+            args.source,
+            args.target,
+            format=args.format,
+            variables=args.variables,
+            drop_variables=args.drop_variables,
+            steps_per_chunk=args.steps_per_chunk,
+            scheduler=args.scheduler,
+            workers=args.workers,
+            resume=args.resume,
+            overwrite=args.overwrite,
+            parameters=dict(args.parameter) or None,
+            engine_type=args.engine_type,
+            progress=report,
+        )
+    except (FileExistsError, ValueError) as exc:
+        sys.stderr.write(f"xarray-adios2: error: {exc}\n")
+        return 1
+    except ImportError as exc:
+        sys.stderr.write(
+            f"xarray-adios2: error: {exc} (converting needs dask and zarr, which "
+            "are installed with the 'convert' extra of xarray-adios2)\n"
+        )
+        return 1
+    sys.stderr.write(f"Converted {args.source} to {args.target}: {result}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
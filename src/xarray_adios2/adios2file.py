@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+from adios2py import util
+
+
+class Adios2File(adios2py.File):
+    """adios2py.File that can also be opened in append mode ("a"), or collectively
+    by the ranks of an MPI communicator.
+
+    In append mode, the steps written are added after the existing steps of the
+    file. Like in write mode, nothing can be read from the file.
+
+    With `comm` (an mpi4py communicator), all of its ranks have to open (and close)
+    the file together. This requires adios2 to be built with MPI.
+    """
+
+    def __init__(
+        self,
+        filename: os.PathLike[Any] | str,
+        mode: str = "rra",
+        parameters: dict[str, str] | None = None,
+        engine_type: str | None = None,
+        comm: Any = None,
+    ) -> None:
+        if mode != "a" and comm is None:
+            super().__init__(filename, mode, parameters, engine_type)
+            return
+
+        if comm is not None and not adios2bindings.is_built_with_mpi:
+            msg = "Opening files with an MPI communicator requires adios2 with MPI."
+            raise ValueError(msg)
+
+        # same as adios2py.File.__init__, which doesn't know about append mode or MPI
+        self._filename = filename
+        self._mode = mode
+        self._adios = (
+            adios2bindings.ADIOS() if comm is None else adios2bindings.ADIOS(comm)
+        )
+        self._io_name = "io-adios2py"
+        self._io = self._adios.DeclareIO(self._io_name)
+        if parameters is not None:
+            self._io.SetParameters(dict(parameters))
+        if engine_type is not None:
+            self._io.SetEngine(engine_type)
+        adios2_mode = (
+            adios2bindings.Mode.Append if mode == "a" else util.openmode_to_adios2(mode)
+        )
+        self._engine = self._io.Open(os.fspath(filename), adios2_mode)
+        adios2py.Group.__init__(self, self)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .adios2metadata import Metadata, VariableInfo
+
+# Bump when the layout of the index changes, so old indexes are ignored
+INDEX_VERSION = 4
+
+INDEX_SUFFIX = ".index.json"
+
+
+def index_path(filename: str | os.PathLike[Any]) -> Path:
+    """Returns where the metadata index for `filename` is kept, e.g. `run.bp.index.json`
+    next to `run.bp`."""
+    path = Path(filename)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def file_signature(filename: str | os.PathLike[Any]) -> list[list[Any]]:
+    """Describes the current state of a .bp file (or directory) by the size and
+    modification time of everything in it, so any rewrite or append changes it."""
+    path = Path(filename)
+    paths = sorted(path.iterdir()) if path.is_dir() else [path]
+    signature = []
+    for p in paths:
+        stat = p.stat()
+        signature.append([p.name, stat.st_size, stat.st_mtime_ns])
+    return signature
+
+
+def _encode_attr(value: Any) -> Any:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return value
+    if isinstance(value, np.ndarray | np.generic):
+        return {"dtype": value.dtype.str, "data": value.tolist()}
+    msg = f"cannot index attribute {value!r}"
+    raise TypeError(msg)
+
+
+def _decode_attr(value: Any) -> Any:
+    if isinstance(value, dict):
+        data = np.array(value["data"], dtype=value["dtype"])
+        return data[()] if data.ndim == 0 else data
+    return value
+
+
+def _encode_attrs(attrs: dict[str, Any]) -> dict[str, Any]:
+    return {name: _encode_attr(value) for name, value in attrs.items()}
+
+
+def _decode_attrs(attrs: dict[str, Any]) -> dict[str, Any]:
+    return {name: _decode_attr(value) for name, value in attrs.items()}
+
+
+def write_index(filename: str | os.PathLike[Any], metadata: Metadata) -> bool:
+    """Writes the metadata index for `filename`.
+
+    Returns False, without raising, if the metadata can't be represented in the index
+    or the index can't be written (e.g., a read-only directory).
+    """
+    try:
+        index = {
+            "version": INDEX_VERSION,
+            "signature": file_signature(filename),
+            "attrs": _encode_attrs(metadata.attrs),
+            "n_steps": metadata.n_steps,
+            "variables": {
+                name: {
+                    "shape": list(var.shape),
+                    "dtype": var.dtype.str,
+                    "attrs": _encode_attrs(var.attrs),
+                    "chunks": var.chunks,
+                    "compressor": var.compressor,
+                    "values": None if var.values is None else _encode_attr(var.values),
+                    "local": var.local,
+                }
+                for name, var in metadata.variables.items()
+            },
+        }
+        path = index_path(filename)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(index))
+        tmp_path.replace(path)
+    except (OSError, TypeError, ValueError):
+        return False
+    return True
+
+
+def read_index(filename: str | os.PathLike[Any]) -> Metadata | None:
+    """Returns the metadata from the index for `filename`, or None if there is no
+    index, or it is stale or unreadable."""
+    try:
+        index = json.loads(index_path(filename).read_text())
+        signature = file_signature(filename)
+        if index["version"] != INDEX_VERSION or index["signature"] != signature:
+            return None
+        variables = {
+            name: VariableInfo(
+                shape=tuple(var["shape"]),
+                dtype=np.dtype(var["dtype"]),
+                attrs=_decode_attrs(var["attrs"]),
+                chunks=None
+                if var["chunks"] is None
+                else tuple(tuple(c) for c in var["chunks"]),
+                compressor=var["compressor"],
+                values=None if var["values"] is None else _decode_attr(var["values"]),
+                local=var["local"],
+            )
+            for name, var in index["variables"].items()
+        }
+        return Metadata(_decode_attrs(index["attrs"]), variables, index["n_steps"])
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
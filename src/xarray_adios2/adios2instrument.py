@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+import pandas as pd  # type: ignore[import-untyped]
+
+from .adios2shared import ProcessShared
+
+# Counters kept for every variable, in the order they're reported
+_COUNTERS = (
+    "reads",
+    "boxes",
+    "cached_boxes",
+    "bytes",
+    "lock_wait",
+    "engine_time",
+)
+
+
+class ReadStats(ProcessShared):
+    """Records what reading variables from adios2 files costs, per variable.
+
+    Pass an instance as `read_stats` to `Adios2Store.open` or `xr.open_dataset`; the
+    same instance can be shared by any number of stores. For each variable, it
+    counts
+
+    - `reads`: calls that read data (one per indexing operation that wasn't
+      satisfied from memory by xarray),
+    - `boxes`: adios2 selections these were split into, `cached_boxes` of which came
+      from the `BlockCache`,
+    - `bytes`: size of the data returned by the engine (or cache),
+    - `lock_wait`: seconds spent waiting for the store's lock (e.g. `ADIOS2_LOCK`),
+    - `engine_time`: seconds spent in the engine performing the reads (including
+      reads by worker processes),
+
+    and `shapes` counts the shapes of the selections. The time not accounted for by
+    `lock_wait` and `engine_time` is spent in xarray and this package.
+
+    If `tracer` is given (e.g., an OpenTelemetry tracer), every read is also reported
+    as a span named "adios2.read", by calling `tracer.start_span(name, start_time=,
+    attributes=)` and ending it with `span.end(end_time=)`, timestamps in ns since
+    the epoch.
+
+    Without `read_stats`, stores don't record anything.
+
+    When pickled, e.g. with stores sent to dask workers, the instance is shared per
+    process, see `ProcessShared`, so reads in other processes are recorded there.
+    The `tracer` isn't pickled.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        super().__init__()
+        self.tracer = tracer
+        self._variables: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        totals = self.totals()
+        return (
+            f"ReadStats(variables={len(self._variables)}, reads={totals['reads']}, "
+            f"bytes={totals['bytes']}, lock_wait={totals['lock_wait']:.3g}, "
+            f"engine_time={totals['engine_time']:.3g})"
+        )
+
+    def record(
+        self,
+        variable: str,
+        shapes: list[tuple[int, ...]],
+        nbytes: int,
+        cached_boxes: int,
+        lock_wait: float,
+        engine_time: float,
+        duration: float,
+    ) -> None:
+        """Adds a read of `variable` in boxes of the given `shapes`, which took
+        `duration` seconds in total."""
+        with self._lock:
+            var = self._variables.get(variable)
+            if var is None:
+                var = dict.fromkeys(_COUNTERS, 0)
+                var["shapes"] = Counter()
+                self._variables[variable] = var
+            var["reads"] += 1
+            var["boxes"] += len(shapes)
+            var["cached_boxes"] += cached_boxes
+            var["bytes"] += nbytes
+            var["lock_wait"] += lock_wait
+            var["engine_time"] += engine_time
+            var["shapes"].update(shapes)
+
+        if self.tracer is not None:
+            end = time.time_ns()
+            span = self.tracer.start_span(
+                "adios2.read",
+                start_time=end - int(duration * 1e9),
+                attributes={
+                    "adios2.variable": variable,
+                    "adios2.boxes": len(shapes),
+                    "adios2.cached_boxes": cached_boxes,
+                    "adios2.bytes": nbytes,
+                    "adios2.lock_wait": lock_wait,
+                    "adios2.engine_time": engine_time,
+                },
+            )
+            span.end(end_time=end)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._variables.clear()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Returns the counters by variable name, with `shapes` as a dict from
+        selection shape to count."""
+        with self._lock:
+            return {
+                name: {**var, "shapes": dict(var["shapes"])}
+                for name, var in self._variables.items()
+            }
+
+    def totals(self) -> dict[str, Any]:
+        """Returns the counters summed over all variables."""
+        totals: dict[str, Any] = dict.fromkeys(_COUNTERS, 0)
+        for var in self.as_dict().values():
+            for key in _COUNTERS:
+                totals[key] += var[key]
+        return totals
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the counters as a DataFrame with a row per variable."""
+        df = pd.DataFrame.from_dict(self.as_dict(), orient="index")
+        df.index.name = "variable"
+        return df.reindex(columns=[*_COUNTERS, "shapes"])
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import fnmatch
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+import adios2  # type: ignore[import-untyped]
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+import numpy as np
+from numpy.typing import NDArray
+
+from .adios2blocks import block_chunks, blocks_info, blocks_shape, local_blocks
+from .adios2operators import variable_compressor
+
+
+class VariableInfo(NamedTuple):
+    """Everything needed to represent a variable without accessing the engine.
+
+    `shape` does not include the step axis, and `chunks` describe the block
+    decomposition within a single step (None if there isn't a useful one).
+    `compressor` is the type of operator the data was written with, if any.
+    `values` holds the data of coordinates that become indexes (see
+    `_read_coordinates`), which are read along with the metadata, since they're
+    needed to build the Dataset anyway.
+
+    Local arrays, which the writers wrote as blocks without a global shape, are
+    `local`: they're represented as the concatenation of their blocks along the
+    first axis, so `chunks[0]` gives the lengths of the blocks.
+    """
+
+    shape: tuple[int, ...]
+    dtype: np.dtype[Any]
+    attrs: dict[str, Any]
+    chunks: tuple[tuple[int, ...], ...] | None
+    compressor: str | None = None
+    values: NDArray[Any] | None = None
+    local: bool = False
+
+
+class Metadata(NamedTuple):
+    """Global attributes and variables of a file or step.
+
+    `n_steps` is the number of steps when representing the whole file, and None when
+    representing a single step.
+    """
+
+    attrs: dict[str, Any]
+    variables: dict[str, VariableInfo]
+    n_steps: int | None
+
+
+def _parse_shape(shape: str) -> tuple[int, ...]:
+    return tuple(int(n) for n in shape.split(",")) if shape else ()
+
+
+def _referenced_names(attrs: dict[str, Any], attr_names: Iterable[str]) -> list[str]:
+    """Names of variables referred to by the given (space separated) attributes."""
+    names = []
+    for attr_name in attr_names:
+        value = attrs.get(attr_name)
+        if isinstance(value, str):
+            names.extend(value.split())
+    return names
+
+
+def _select(
+    available: Iterable[str],
+    global_attrs: dict[str, Any],
+    get_attrs: Callable[[str], dict[str, Any]],
+    variables: Iterable[str] | None,
+    drop_variables: Iterable[str],
+) -> dict[str, dict[str, Any]]:
+    """Returns the attributes of the selected variables, only calling `get_attrs` for
+    those."""
+    available = list(available)
+    drop = set(drop_variables)
+    if variables is None:
+        return {name: get_attrs(name) for name in available if name not in drop}
+
+    names = set(available)
+    patterns = list(variables)
+    pending = [
+        name
+        for name in available
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+    ]
+    # the step dimension isn't listed in the variables' dimensions
+    pending += _referenced_names(global_attrs, ("step_dimension", "coordinates"))
+    var_attrs: dict[str, dict[str, Any]] = {}
+    while pending:
+        name = pending.pop(0)
+        if name in var_attrs or name in drop or name not in names:
+            continue
+        var_attrs[name] = get_attrs(name)
+        pending += _referenced_names(var_attrs[name], ("dimensions", "coordinates"))
+    return var_attrs
+
+
+def select_variables(
+    metadata: Metadata,
+    variables: Iterable[str] | None = None,
+    drop_variables: Iterable[str] = (),
+) -> Metadata:
+    """Selects variables from already collected metadata, like `read_metadata` does."""
+    selected = _select(
+        metadata.variables,
+        metadata.attrs,
+        lambda name: metadata.variables[name].attrs,
+        variables,
+        drop_variables,
+    )
+    return metadata._replace(
+        variables={
+            name: var for name, var in metadata.variables.items() if name in selected
+        }
+    )
+
+
+# Info on the available variables (by name), and the available attribute names
+Available = tuple[dict[str, dict[str, str]], list[str]]
+
+
+def inquire_available(file: adios2py.File) -> Available:
+    """Returns the available variables (with their info) and attribute names.
+
+    In random access mode, these don't change, so callers reading the metadata of
+    many groups can inquire them once and pass them to `read_metadata`,
+    `list_groups` and `step_dimension`, like `Adios2Store` does.
+    """
+    return file.io.AvailableVariables(), list(file.io.AvailableAttributes())
+
+
+def group_prefix(path: str | None) -> str:
+    """Returns the prefix of the path-style names in group `path`, e.g.
+    "species/electron/" for "/species/electron", and "" for the root group."""
+    path = (path or "").strip("/")
+    return f"{path}/" if path else ""
+
+
+def list_groups(
+    file: adios2py.File, path: str | None = None, available: Available | None = None
+) -> list[str]:
+    """Returns the groups implied by path-style variable and attribute names, like
+    "/species/electron" for "species/electron/density", starting with `path` (by
+    default, the root group "/") and including all groups below it."""
+    available_variables, available_attributes = available or inquire_available(file)
+    prefix = group_prefix(path)
+    names = [
+        *(name.rpartition("/")[0] for name in available_variables),
+        *(
+            var_name
+            for var_name, _, _ in (
+                name.rpartition("/") for name in available_attributes
+            )
+            if var_name not in available_variables
+        ),
+    ]
+    groups = {prefix.rstrip("/")}
+    for name in names:
+        if not name.startswith(prefix):
+            continue
+        parts = name.split("/")
+        groups.update("/".join(parts[:n]) for n in range(1, len(parts) + 1))
+    return sorted(f"/{group}" for group in groups)
+
+
+def step_dimension(
+    file: adios2py.File, available: Available | None = None
+) -> str | None:
+    """Returns the file's step dimension (a global attribute of the root group)."""
+    if "step_dimension" not in (available or inquire_available(file))[1]:
+        return None
+    value = file._read_attribute("step_dimension")
+    return value if isinstance(value, str) else None
+
+
+def read_metadata(
+    group: adios2py.Group,
+    variables: Iterable[str] | None = None,
+    drop_variables: Iterable[str] = (),
+    path: str | None = None,
+    available: Available | None = None,
+) -> Metadata:
+    """Collects all variables and attributes in a single pass over the adios2 metadata.
+
+    Unlike going through adios2py's Mapping interface, which inquires all attributes
+    again for every variable, this scales linearly with the number of variables and
+    attributes.
+
+    If given, only variables matching one of the glob patterns in `variables` are
+    included, together with the coordinates they refer to. Variables named in
+    `drop_variables` are always excluded. Attributes of excluded variables are never
+    read.
+
+    With `path` (e.g. "species/electron"), only the variables directly in that group
+    of path-style names are included, under their names relative to the group, and the
+    attributes are those of the group ("species/electron/charge"). "/" is the root
+    group, whose variables are those without a "/" in their name. Without `path`, all
+    variables are included under their full names.
+
+    `available` are the file's variables and attributes, if already inquired, see
+    `inquire_available`.
+    """
+    file = group._file
+    available_variables, available_attributes = available or inquire_available(file)
+    prefix = group_prefix(path)
+    if path is not None:
+        available_variables = {
+            name.removeprefix(prefix): info
+            for name, info in available_variables.items()
+            if name.startswith(prefix) and "/" not in name.removeprefix(prefix)
+        }
+
+    attr_names: defaultdict[str, list[str]] = defaultdict(list)
+    for attr_name in available_attributes:
+        var_name, _, name = attr_name.rpartition("/")
+        attr_names[var_name].append(name)
+
+    group_name = prefix.rstrip("/")
+    global_attrs = {
+        name: file._read_attribute(f"{prefix}{name}") for name in attr_names[group_name]
+    }
+    var_attrs = _select(
+        available_variables,
+        global_attrs,
+        lambda var_name: {
+            name: file._read_attribute(name, f"{prefix}{var_name}")
+            for name in attr_names[f"{prefix}{var_name}"]
+        },
+        variables,
+        drop_variables,
+    )
+
+    if group._step is not None:
+        step = group._step
+    else:
+        step = file.current_step() if file.in_step() else 0
+
+    infos = {}
+    for name, info in available_variables.items():
+        if name not in var_attrs:
+            continue
+        shape = _parse_shape(info["Shape"])
+        blocks = blocks_info(file, prefix + name, step)
+        # (scalars have no shape either, but are a single value)
+        local = not shape and info["SingleValue"] != "true"
+        if local:
+            concatenated = local_blocks(blocks)
+            if concatenated is None:
+                continue
+            blocks = concatenated
+            shape = blocks_shape(blocks)
+        infos[name] = VariableInfo(
+            shape=shape,
+            dtype=np.dtype(adios2.type_adios_to_numpy(info["Type"])),
+            attrs=var_attrs[name],
+            chunks=block_chunks(blocks, shape),
+            compressor=variable_compressor(file, prefix + name),
+            local=local,
+        )
+
+    n_steps = file._steps() if group._step is None else None
+    if n_steps is not None and file._mode == "rra":
+        values = _read_coordinates(
+            file, global_attrs, infos, available_variables, prefix
+        )
+        for name, data in values.items():
+            infos[name] = infos[name]._replace(values=data)
+    return Metadata(global_attrs, infos, n_steps)
+
+
+def _read_coordinates(
+    file: adios2py.File,
+    global_attrs: dict[str, Any],
+    infos: dict[str, VariableInfo],
+    available_variables: dict[str, dict[str, str]],
+    prefix: str = "",
+) -> dict[str, NDArray[Any]]:
+    """Reads the values of the coordinates that will become indexes, all in a single
+    engine call: scalars per step (like the step dimension's `time`) for all steps,
+    and dimension coordinates (like `x`) from the first step."""
+    n_steps = file._steps()
+    coords = _referenced_names(global_attrs, ("step_dimension", "coordinates"))
+    for info in infos.values():
+        coords += _referenced_names(info.attrs, ("coordinates",))
+
+    values = {}
+    for name, info in infos.items():
+        if info.local:
+            continue
+        n_available = int(available_variables[name]["AvailableStepsCount"])
+        if name in coords and info.shape == () and n_available == n_steps:
+            steps, shape = [0, n_steps], (n_steps,)
+        elif info.attrs.get("dimensions") == name and len(info.shape) == 1:
+            steps, shape = [0, 1], info.shape
+        else:
+            continue
+        var = file.io.InquireVariable(prefix + name)
+        var.SetStepSelection(steps)
+        values[name] = np.empty(shape, dtype=info.dtype)
+        file.engine.Get(var, values[name], adios2bindings.Mode.Deferred)
+    if values:
+        file.engine.PerformGets()
+    return values
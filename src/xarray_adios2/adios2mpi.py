@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def rank_and_size(comm: Any) -> tuple[int, int]:
+    """Returns this process's rank in `comm` and the number of ranks, or (0, 1)
+    without a communicator."""
+    if comm is None:
+        return 0, 1
+    return int(comm.Get_rank()), int(comm.Get_size())
+
+
+def rank_slice(length: int, rank: int, size: int) -> slice:
+    """Returns the part of `length` elements that belongs to `rank`, when splitting
+    them into `size` contiguous slabs whose lengths differ by at most one."""
+    base, extra = divmod(length, size)
+    start = rank * base + min(rank, extra)
+    return slice(start, start + base + (1 if rank < extra else 0))
+
+
+def global_offset(comm: Any, local_length: int) -> tuple[int, int]:
+    """Returns where this rank's `local_length` elements start, and the total length,
+    when the parts of all ranks are concatenated in rank order."""
+    if comm is None:
+        return 0, local_length
+    rank, _ = rank_and_size(comm)
+    lengths = comm.allgather(local_length)
+    return sum(lengths[:rank]), sum(lengths)
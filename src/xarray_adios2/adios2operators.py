@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+
+# Encoding key selecting the (compression) operator of a variable. It's specific to
+# this backend, since other backends use "compressor" for codec objects.
+OPERATOR_KEY = "adios2_operator"
+
+# Encoding keys that are passed on to each (compression) operator as parameters, and
+# the name of the corresponding adios2 parameter. Blosc's own "compressor" parameter
+# is called "codec" here, since xarray uses "compressor" for codec objects.
+OPERATOR_PARAMETERS: dict[str, dict[str, str]] = {
+    "blosc": {
+        "clevel": "clevel",
+        "codec": "compressor",
+        "doshuffle": "doshuffle",
+        "threshold": "threshold",
+        "blocksize": "blocksize",
+        "nthreads": "nthreads",
+    },
+    "bzip2": {"blockSize100k": "blockSize100k"},
+    "zfp": {"accuracy": "accuracy", "rate": "rate", "precision": "precision"},
+    "sz": {"accuracy": "accuracy", "abs": "abs", "rel": "rel"},
+    "mgard": {"accuracy": "accuracy", "tolerance": "tolerance", "s": "s"},
+    "null": {},
+}
+
+
+def operator_available(operator: str) -> bool:
+    """Returns whether the installed adios2 supports the given operator."""
+    try:
+        adios2bindings.ADIOS().DefineOperator(operator, operator, {})
+    except (RuntimeError, ValueError):
+        return False
+    return True
+
+
+def operation_from_encoding(
+    name: str, encoding: Mapping[str, Any]
+) -> tuple[str, dict[str, str]] | None:
+    """Returns the operator type and its parameters requested in variable `name`'s
+    encoding, or None if the variable isn't to be compressed.
+
+    Any operator type can be given, like those read back from files, but only those
+    in `OPERATOR_PARAMETERS` get parameters from the encoding.
+    """
+    operator = encoding.get(OPERATOR_KEY)
+    if operator is None:
+        return None
+    if not isinstance(operator, str):
+        msg = f"{OPERATOR_KEY} of variable {name!r} needs to be a string, not {operator!r}."
+        raise TypeError(msg)
+    parameters = {
+        adios2_name: str(encoding[key])
+        for key, adios2_name in OPERATOR_PARAMETERS.get(operator, {}).items()
+        if key in encoding
+    }
+    return operator, parameters
+
+
+class Operators:
+    """The operators a store defines for the variables it writes.
+
+    adios2 variables accept operators defined by any ADIOS instance, so they're
+    defined in one of their own, once per operator type.
+    """
+
+    def __init__(self) -> None:
+        self._adios: Any = None
+        self._operators: dict[str, Any] = {}
+
+    def add_operation(self, name: str, var: Any, encoding: Mapping[str, Any]) -> None:
+        """Adds the operation requested in `encoding` (if any) to adios2 variable
+        `var`."""
+        operation = operation_from_encoding(name, encoding)
+        if operation is None:
+            return
+
+        operator, parameters = operation
+        if operator not in self._operators:
+            if self._adios is None:
+                self._adios = adios2bindings.ADIOS()
+            try:
+                self._operators[operator] = self._adios.DefineOperator(
+                    f"xarray-adios2-{operator}", operator, {}
+                )
+            except (RuntimeError, ValueError) as exc:
+                msg = f"Operator {operator!r} is not available in this adios2 build."
+                raise ValueError(msg) from exc
+        var.AddOperation(self._operators[operator], parameters)
+
+
+def variable_compressor(file: adios2py.File, name: str) -> str | None:
+    """Returns the type of the (first) operator applied to variable `name`."""
+    var = file.io.InquireVariable(name)
+    operations = var.Operations() if var else []
+    return str(operations[0].Type()) if operations else None
@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import atexit
+import collections
+import itertools
+import multiprocessing
+import os
+import threading
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+import numpy as np
+from numpy.typing import NDArray
+from typing_extensions import override
+from xarray.backends import FileManager
+from xarray.backends.lru_cache import LRUCache
+
+# Selections smaller than this are read in the calling process, since for those the
+# overhead of farming the read out to workers isn't worth it.
+DEFAULT_PARALLEL_MIN_BYTES = 16 * 2**20
+
+# Number of files each worker process keeps open
+WORKER_FILE_CACHE_SIZE = 16
+
+# Number of files each process keeps open for unpickled stores
+POOLED_FILES_SIZE = 16
+
+
+class FileIdentity(NamedTuple):
+    """What's needed to (re-)open a file in random access mode in another process."""
+
+    filename: str
+    parameters: tuple[tuple[str, str], ...]
+    engine_type: str | None
+
+    @classmethod
+    def from_file(cls, file: adios2py.File) -> FileIdentity:
+        return cls(
+            os.path.abspath(file.filename),  # noqa: PTH100
+            tuple(sorted(file.parameters.items())),
+            file.engine_type,
+        )
+
+    def open(self) -> adios2py.File:
+        return adios2py.File(
+            self.filename,
+            mode="rra",
+            parameters=dict(self.parameters),
+            engine_type=self.engine_type,
+        )
+
+
+_worker_files: LRUCache[FileIdentity, adios2py.File] = LRUCache(
+    WORKER_FILE_CACHE_SIZE, on_evict=lambda _, file: file.close()
+)
+
+
+_PoolKey = tuple[FileIdentity, str]
+
+
+class _PooledFile(NamedTuple):
+    file: adios2py.File
+    key: _PoolKey
+    # the lock of the stores using the file, which they hold while they do
+    lock: Any
+
+
+_pooled_files: LRUCache[_PoolKey, _PooledFile] = LRUCache(
+    POOLED_FILES_SIZE, on_evict=lambda _, pooled: _evicted_files.append(pooled)
+)
+# files evicted from the pool that may still be in use, see `_close_evicted`
+_evicted_files: list[_PooledFile] = []
+# number of stores holding the lock of each pooled file, see `PooledFileLock`
+_in_use: collections.Counter[_PoolKey] = collections.Counter()
+_pooled_files_lock = threading.Lock()
+
+
+def _same_lock(lock: Any, other: Any) -> bool:
+    # (SerializableLocks with the same token share the underlying lock)
+    return lock is other or getattr(lock, "lock", lock) is getattr(other, "lock", other)
+
+
+def _close_evicted(held: Any = None) -> None:
+    """Closes the files evicted from the pool that aren't in use, i.e., that no
+    store holds the lock of. Closing a file needs its lock, too, so it's closed if
+    that's the lock `held` by the caller, or if it's free. The others are closed by
+    a later call, once they're done."""
+    in_use = []
+    for pooled in _evicted_files:
+        if _in_use[pooled.key]:
+            in_use.append(pooled)
+        elif held is not None and _same_lock(pooled.lock, held):
+            pooled.file.close()
+        elif pooled.lock.acquire(blocking=False):
+            try:
+                pooled.file.close()
+            finally:
+                pooled.lock.release()
+        else:
+            in_use.append(pooled)
+    _evicted_files[:] = in_use
+
+
+class PooledFileLock:
+    """The lock of a store using a pooled file, see `PooledFileManager`, which
+    counts the stores holding it, so the file isn't closed while they use it.
+
+    Several files can share the same `lock` (like `ADIOS2_LOCK`), so whether it's
+    held doesn't tell whether a particular file is in use.
+    """
+
+    def __init__(self, lock: Any, key: _PoolKey) -> None:
+        self.lock = lock
+        self._key = key
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self.lock.acquire(blocking):
+            return False
+        with _pooled_files_lock:
+            _in_use[self._key] += 1
+            _close_evicted(self.lock)
+        return True
+
+    def release(self) -> None:
+        with _pooled_files_lock:
+            _in_use[self._key] -= 1
+            if not _in_use[self._key]:
+                del _in_use[self._key]
+        self.lock.release()
+
+    def __enter__(self) -> None:
+        self.acquire()
+
+    def __exit__(self, *args: object) -> None:
+        self.release()
+
+    def locked(self) -> bool:
+        return bool(self.lock.locked())
+
+
+class PooledFileManager(FileManager):
+    """Manages a file opened in random access mode by a store that was pickled, e.g.
+    to be sent to dask workers.
+
+    The files are kept open in a pool of up to `POOLED_FILES_SIZE` files per process,
+    shared by all stores unpickled there, so tasks reading the same file reuse its
+    engine instead of each opening the file (and reading its metadata) again. Files
+    are opened on first use, and evicted files are reopened when needed.
+
+    Stores share a file if they have the same `token`, which they do if they share
+    `lock`, since an engine mustn't be used by several threads at once. Stores hold
+    their `store_lock` while using the file, so an evicted file is only closed once
+    none of them does; until then, it stays open in addition to those in the pool.
+    """
+
+    def __init__(self, identity: FileIdentity, token: str, lock: Any) -> None:
+        self._key = (identity, token)
+        self._lock = lock
+
+    def store_lock(self, lock: Any) -> PooledFileLock:
+        """Returns the lock for a store using the file, given its `lock`."""
+        return PooledFileLock(lock, self._key)
+
+    @override
+    def acquire(self, needs_lock: bool = True) -> adios2py.File:
+        with _pooled_files_lock:
+            pooled = _pooled_files.get(self._key)
+            if pooled is None:
+                pooled = _PooledFile(self._key[0].open(), self._key, self._lock)
+                _pooled_files[self._key] = pooled
+            _close_evicted()
+        return pooled.file
+
+    @override
+    @contextmanager
+    def acquire_context(self, needs_lock: bool = True) -> Iterator[adios2py.File]:
+        yield self.acquire(needs_lock)
+
+    @override
+    def close(self, needs_lock: bool = True) -> None:
+        with _pooled_files_lock:
+            pooled = _pooled_files.pop(self._key, None)
+        if pooled is not None:
+            with pooled.lock:
+                pooled.file.close()
+
+
+def _read_into_shared_memory(
+    identity: FileIdentity,
+    variable_name: str,
+    steps: tuple[int, int],
+    start: list[int],
+    count: list[int],
+    shm_name: str,
+    offset: int,
+    shape: tuple[int, ...],
+    dtype: np.dtype[Any],
+) -> None:
+    """Worker: reads one selection into its place in the shared output buffer."""
+    file = _worker_files.get(identity)
+    if file is None:
+        file = identity.open()
+        _worker_files[identity] = file
+
+    var = file.io.InquireVariable(variable_name)
+    var.SetStepSelection(steps)
+    if start:
+        var.SetSelection((start, count))
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data: NDArray[Any] = np.ndarray(
+            shape, dtype=dtype, buffer=shm.buf, offset=offset
+        )
+        file.engine.Get(var, data, adios2bindings.Mode.Sync)
+        del data
+    finally:
+        shm.close()
+
+
+class ReadPool:
+    """Reads large selections using a pool of worker processes.
+
+    Each worker keeps its own adios2py.File instances open, and writes its part of
+    the selection directly into a shared memory buffer, which becomes the result
+    without being copied again.
+    """
+
+    def __init__(self, n_workers: int) -> None:
+        self.n_workers = n_workers
+        self._executor = ProcessPoolExecutor(
+            n_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+    def read(
+        self,
+        identity: FileIdentity,
+        variable_name: str,
+        steps: tuple[int, int],
+        start: list[int],
+        count: list[int],
+        shape: tuple[int, ...],
+        dtype: np.dtype[Any],
+    ) -> NDArray[Any]:
+        """Reads the given selection, which results in an array of `shape`.
+
+        The selection is split along its first axis that has more than a single
+        element, so each part ends up in a contiguous piece of the result.
+        """
+        full = [steps, *zip(start, count, strict=True)]
+        axis = next((n for n, (_, c) in enumerate(full) if c > 1), 0)
+        n_parts = min(self.n_workers, full[axis][1])
+        bounds = np.linspace(0, full[axis][1], n_parts + 1).astype(int)
+        itemsize = np.dtype(dtype).itemsize
+        # elements per unit along the split axis
+        stride = int(np.prod([c for _, c in full[axis + 1 :]], dtype=int))
+
+        nbytes = int(np.prod(shape, dtype=int)) * itemsize
+        shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        try:
+            futures = []
+            for lo, hi in itertools.pairwise(bounds):
+                part = list(full)
+                part[axis] = (full[axis][0] + int(lo), int(hi - lo))
+                futures.append(
+                    self._executor.submit(
+                        _read_into_shared_memory,
+                        identity,
+                        variable_name,
+                        part[0],
+                        [s for s, _ in part[1:]],
+                        [c for _, c in part[1:]],
+                        shm.name,
+                        int(lo) * stride * itemsize,
+                        tuple(c for _, c in part),
+                        dtype,
+                    )
+                )
+            for future in futures:
+                future.result()
+        except BaseException:
+            shm.close()
+            raise
+        finally:
+            shm.unlink()
+
+        data: NDArray[Any] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        # the shared memory is released once the result (and any views of it) are gone
+        weakref.finalize(data, shm.close)
+        return data
+
+
+_read_pools: dict[int, ReadPool] = {}
+
+
+def get_read_pool(n_workers: int) -> ReadPool:
+    """Returns the (shared) pool of `n_workers` worker processes."""
+    if n_workers not in _read_pools:
+        _read_pools[n_workers] = ReadPool(n_workers)
+    return _read_pools[n_workers]
+
+
+@atexit.register
+def _shutdown_read_pools() -> None:
+    for pool in _read_pools.values():
+        pool.shutdown()
+    _read_pools.clear()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import numpy as np
+import xarray as xr
+from numpy.typing import ArrayLike, NDArray
+
+from .adios2steps import iter_steps
+
+REDUCTIONS = ("count", "mean", "var", "std", "rms", "min", "max", "histogram")
+
+# Reductions whose result is in the same units as the data, so they keep its attrs
+_KEEP_ATTRS = ("mean", "std", "rms", "min", "max")
+
+
+class _Accumulator:
+    """Reductions of a single variable over the steps added so far.
+
+    NaNs are skipped, like xarray's reductions do by default. The mean and variance
+    are updated with Welford's algorithm, which doesn't lose precision the way
+    accumulating sums of squares does.
+    """
+
+    def __init__(
+        self,
+        first: xr.DataArray,
+        reductions: Sequence[str],
+        edges: NDArray[Any] | None,
+    ) -> None:
+        self.shape = first.shape
+        self.dims = first.dims
+        self.attrs = first.attrs
+        self.reductions = reductions
+        self.edges = edges
+        self.count = np.zeros(first.shape, dtype=np.int64)
+        self.mean = np.zeros(first.shape)
+        self.m2 = np.zeros(first.shape)
+        self.sum_squares = np.zeros(first.shape)
+        self.min: NDArray[Any] | None = None
+        self.max: NDArray[Any] | None = None
+        self.histogram = None if edges is None else np.zeros(len(edges) - 1, np.int64)
+
+    def add(self, data: NDArray[Any]) -> None:
+        if data.shape != self.shape:
+            msg = f"Expected shape {self.shape}, got {data.shape}."
+            raise ValueError(msg)
+
+        values = data.astype(np.float64)
+        valid = ~np.isnan(values)
+        self.count += valid
+        if {"mean", "var", "std"} & set(self.reductions):
+            delta = np.where(valid, values - self.mean, 0.0)
+            self.mean += np.divide(
+                delta, self.count, out=np.zeros_like(delta), where=valid
+            )
+            self.m2 += delta * np.where(valid, values - self.mean, 0.0)
+        if "rms" in self.reductions:
+            self.sum_squares += np.where(valid, values * values, 0.0)
+        if "min" in self.reductions:
+            self.min = data.copy() if self.min is None else np.fmin(self.min, data)
+        if "max" in self.reductions:
+            self.max = data.copy() if self.max is None else np.fmax(self.max, data)
+        if self.histogram is not None:
+            assert self.edges is not None
+            self.histogram += np.histogram(values[valid], self.edges)[0]
+
+    def result(self, reduction: str, ddof: int) -> NDArray[Any]:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if reduction == "count":
+                return self.count
+            if reduction == "mean":
+                return np.where(self.count > 0, self.mean, np.nan)
+            if reduction in ("var", "std"):
+                var = np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+                return var if reduction == "var" else np.sqrt(var)
+            if reduction == "rms":
+                return np.sqrt(self.sum_squares / self.count)
+        if reduction == "min":
+            assert self.min is not None
+            return self.min
+        if reduction == "max":
+            assert self.max is not None
+            return self.max
+        assert self.histogram is not None
+        return self.histogram
+
+
+def _bin_edges(
+    bins: int | ArrayLike, range: tuple[float, float] | None
+) -> NDArray[Any]:
+    if np.ndim(bins) == 0:
+        if range is None:
+            msg = (
+                "A histogram needs a `range` for its bins (or explicit bin edges), "
+                "since the data is only seen once."
+            )
+            raise ValueError(msg)
+        return np.linspace(range[0], range[1], int(bins) + 1)  # type: ignore[arg-type]
+    edges = np.asarray(bins, dtype=np.float64)
+    if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+        msg = "Bin edges need to be a 1-d, increasing sequence of at least 2 values."
+        raise ValueError(msg)
+    return edges
+
+
+def reduce_steps(
+    filename: str | os.PathLike[Any],
+    reductions: str | Sequence[str] = "mean",
+    variables: str | Iterable[str] | None = None,
+    drop_variables: str | Iterable[str] | None = None,
+    ddof: int = 0,
+    bins: int | ArrayLike = 10,
+    range: tuple[float, float] | None = None,
+    prefetch: int = 1,
+    parameters: Mapping[str, str] | None = None,
+    engine_type: str | None = None,
+) -> xr.Dataset:
+    """Reduces the data variables of an adios2 file or stream over its steps, in a
+    single pass, without ever holding more than a few steps in memory.
+
+    The steps are read in order, like `iter_steps` does (which is where `variables`,
+    `drop_variables`, `prefetch`, `parameters` and `engine_type` go), and each is
+    added to running reductions, so this also works for streams that are still
+    being written, and for runs too long to load at once.
+
+    `reductions` are any of "count", "mean", "var", "std", "rms", "min", "max" and
+    "histogram". The result has a variable "{name}_{reduction}" for each of them and
+    each numeric data variable, which (other than for "histogram") has the
+    variable's dimensions other than the step dimension. NaNs are skipped, and
+    `ddof` is used for "var" and "std", like in the corresponding xarray
+    reductions. The result's coordinates are those of the first step, other than
+    the step dimension's.
+
+    "histogram" counts the values of each variable over all steps and elements, in
+    the bins given by `bins` and `range` like for `numpy.histogram`, along
+    dimension "bin" (with coordinates "bin_start" and "bin_stop"). Since the data is
+    only seen once, the bins can't be derived from it, so either `range` or the bin
+    edges need to be given.
+    """
+    if isinstance(reductions, str):
+        reductions = [reductions]
+    unknown = [r for r in reductions if r not in REDUCTIONS]
+    if unknown:
+        msg = f"Unknown reductions {unknown}, expected any of {list(REDUCTIONS)}."
+        raise ValueError(msg)
+    edges = _bin_edges(bins, range) if "histogram" in reductions else None
+
+    accumulators: dict[str, _Accumulator] = {}
+    # everything but the data of the first step, which ends up in the result
+    template: xr.Dataset | None = None
+    for ds in iter_steps(
+        filename,
+        variables=variables,
+        drop_variables=drop_variables,
+        prefetch=prefetch,
+        parameters=parameters,
+        engine_type=engine_type,
+    ):
+        if template is None:
+            template = ds.drop_vars(
+                [name for name, var in ds.data_vars.items() if var.dtype.kind in "iuf"]
+            )
+        for name, var in ds.data_vars.items():
+            # (only integer and floating point data can be reduced)
+            if var.dtype.kind not in "iuf":
+                continue
+            acc = accumulators.get(str(name))
+            if acc is None:
+                acc = accumulators[str(name)] = _Accumulator(var, reductions, edges)
+            try:
+                acc.add(var.to_numpy())
+            except ValueError as exc:
+                msg = f"Variable {name!r} changed shape between steps: {exc}"
+                raise ValueError(msg) from exc
+
+    if template is None:
+        msg = f"{os.fspath(filename)!r} has no steps to reduce."
+        raise ValueError(msg)
+
+    step_dimension = template.encoding.get("step_dimension")
+    coords = template.coords.to_dataset()
+    if isinstance(step_dimension, str) and step_dimension in coords:
+        coords = coords.drop_vars(step_dimension)
+    result = xr.Dataset(coords=coords.coords, attrs=template.attrs)
+    if edges is not None:
+        result = result.assign_coords(
+            bin_start=("bin", edges[:-1]), bin_stop=("bin", edges[1:])
+        )
+    for name, acc in accumulators.items():
+        for reduction in reductions:
+            dims = ("bin",) if reduction == "histogram" else acc.dims
+            attrs = acc.attrs if reduction in _KEEP_ATTRS else {}
+            result[f"{name}_{reduction}"] = (dims, acc.result(reduction, ddof), attrs)
+    return result
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import threading
+import uuid
+import weakref
+from typing import Any
+
+# The instances of ProcessShared in this process, by token
+_instances: weakref.WeakValueDictionary[str, ProcessShared] = (
+    weakref.WeakValueDictionary()
+)
+_instances_lock = threading.Lock()
+
+
+class ProcessShared:
+    """Base for objects that any number of stores share, like `BlockCache`.
+
+    A pickled instance (e.g., that of a store sent to dask workers) is unpickled as
+    the same instance in the process it came from, and as one new instance per other
+    process, shared by all stores unpickled there. The new instance is created from
+    `_shared_args()`.
+    """
+
+    def __init__(self) -> None:
+        self._share_as(uuid.uuid4().hex)
+
+    def _share_as(self, token: str) -> None:
+        self._token = token
+        _instances[token] = self
+
+    def _shared_args(self) -> tuple[Any, ...]:
+        """Returns the arguments to create the instance in another process with."""
+        return ()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _shared_instance, (type(self), self._token, self._shared_args())
+
+
+def _shared_instance(
+    cls: type[ProcessShared], token: str, args: tuple[Any, ...]
+) -> ProcessShared:
+    """Returns this process's instance of the pickled instance `token`."""
+    with _instances_lock:
+        instance = _instances.get(token)
+        if instance is None:
+            instance = cls(*args)
+            del _instances[instance._token]
+            instance._share_as(token)
+    return instance
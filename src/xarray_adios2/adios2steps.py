@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from collections.abc import Generator, Iterable, Mapping
+from typing import Any
+
+import adios2py
+import xarray as xr
+
+from .adios2store import Adios2Store
+
+# How often a blocked reader thread checks whether the consumer has gone away
+_POLL_INTERVAL = 0.1
+
+
+class _Done:
+    """Marks the end of the steps in the queue."""
+
+
+def _load_step(
+    step: adios2py.Step,
+    variables: str | Iterable[str] | None,
+    drop_variables: str | Iterable[str] | None,
+) -> xr.Dataset:
+    """Reads all data of the current step into memory, so the step can be ended."""
+    store = Adios2Store(step, variables=variables, drop_variables=drop_variables)
+    ds = xr.open_dataset(store).load()
+    step_dimension = store.get_encoding().get("step_dimension")
+    if step_dimension in ds.data_vars:
+        ds = ds.set_coords(step_dimension)
+    return ds
+
+
+def iter_steps(
+    filename: str | os.PathLike[Any],
+    variables: str | Iterable[str] | None = None,
+    drop_variables: str | Iterable[str] | None = None,
+    prefetch: int = 1,
+    parameters: Mapping[str, str] | None = None,
+    engine_type: str | None = None,
+) -> Generator[xr.Dataset, None, None]:
+    """Yields a Dataset for each step of an adios2 file or stream (e.g., SST).
+
+    The file is opened in streaming mode, so steps are read in order, as they become
+    available. With `prefetch > 0`, a background thread reads up to `prefetch` steps
+    ahead while the caller is still working on the current one; the steps read ahead
+    are buffered in memory. `prefetch=0` reads every step only when it's requested.
+
+    `variables` and `drop_variables` select the variables to read, like in
+    `Adios2Store.open`. The step dimension's variable (if any) becomes a coordinate.
+
+    Closing the generator early (e.g., breaking out of the loop) waits for the
+    background thread to finish the step it's reading, which for a stream can mean
+    waiting for the writer to provide it.
+    """
+    params = dict(parameters) if parameters is not None else None
+    if prefetch <= 0:
+        with adios2py.File(
+            filename, mode="r", parameters=params, engine_type=engine_type
+        ) as file:
+            for step in file.steps:
+                yield _load_step(step, variables, drop_variables)
+        return
+
+    steps: queue.Queue[xr.Dataset | BaseException | _Done] = queue.Queue(prefetch)
+    stop = threading.Event()
+
+    def put(item: xr.Dataset | BaseException | _Done) -> bool:
+        while not stop.is_set():
+            try:
+                steps.put(item, timeout=_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def read_steps() -> None:
+        try:
+            with adios2py.File(
+                filename, mode="r", parameters=params, engine_type=engine_type
+            ) as file:
+                for step in file.steps:
+                    if not put(_load_step(step, variables, drop_variables)):
+                        return
+        except BaseException as exc:  # noqa: BLE001
+            put(exc)
+        else:
+            put(_Done())
+
+    thread = threading.Thread(target=read_steps, name="adios2-iter-steps", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = steps.get()
+            if isinstance(item, _Done):
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import functools
+import itertools
 import os
-from collections.abc import Mapping
+import uuid
+from collections.abc import Hashable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Protocol
 
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
 import adios2py
+import numpy as np
+from numpy.typing import NDArray
 from typing_extensions import Never, override
 from xarray.backends import CachingFileManager, DummyFileManager, FileManager
 from xarray.backends.common import (
@@ -17,15 +24,203 @@ from xarray.backends.locks import (
     get_write_lock,
 )
 from xarray.core import indexing
+from xarray.core.dataarray import DataArray
+from xarray.core.dataset import Dataset
 from xarray.core.utils import FrozenDict
 from xarray.core.variable import Variable
+from xarray.namedarray.utils import is_duck_dask_array
+
+from .adios2array import DEFAULT_COALESCE_GAP, Adios2Array
+from .adios2blocks import BlockInfo
+from .adios2cache import BlockCache
+from .adios2file import Adios2File
+from .adios2index import read_index, write_index
+from .adios2instrument import ReadStats
+from .adios2metadata import (
+    Available,
+    Metadata,
+    VariableInfo,
+    group_prefix,
+    inquire_available,
+    read_metadata,
+    select_variables,
+    step_dimension,
+)
+from .adios2mpi import global_offset, rank_and_size, rank_slice
+from .adios2operators import OPERATOR_KEY, Operators
+from .adios2pool import (
+    DEFAULT_PARALLEL_MIN_BYTES,
+    FileIdentity,
+    PooledFileLock,
+    PooledFileManager,
+    get_read_pool,
+)
 
-from .adios2array import Adios2Array
-
-# adios2 is not thread safe
+# Global lock serializing all access to adios2. By default, every opened file gets a
+# lock of its own, since the adios2py.File instances don't share any adios2 objects,
+# but passing this lock instead keeps adios2 builds that aren't thread safe working.
 ADIOS2_LOCK = SerializableLock()
 
 
+def _group_token(group: adios2py.Group) -> str:
+    return f"adios2py.File-{id(group._file)}"
+
+
+def _group_lock(group: adios2py.Group) -> SerializableLock:
+    """Returns the lock shared by all stores accessing the same adios2py.File."""
+    return SerializableLock(token=_group_token(group))
+
+
+def _simplify_chunks(chunks: tuple[int, ...]) -> int | tuple[int, ...]:
+    """Returns a single chunk size if all chunks (but possibly the last) are the same."""
+    if all(c == chunks[0] for c in chunks[:-1]) and chunks[-1] <= chunks[0]:
+        return chunks[0]
+    return chunks
+
+
+def _define_variable(
+    file: adios2py.File,
+    operators: Operators,
+    name: str,
+    data: NDArray[Any],
+    encoding: Mapping[str, Any],
+    shape: tuple[int, ...] | None = None,
+    start: tuple[int, ...] | None = None,
+) -> Any:
+    """Returns the adios2 variable `name`, defining it to match `data` if needed.
+
+    With `shape` and `start`, `data` is the block of a larger (global) array of that
+    shape starting at `start`, like the part written by one of several MPI ranks.
+
+    A newly defined variable gets the compression operation requested in `encoding`.
+    """
+    if shape is None:
+        shape = data.shape
+    if start is None:
+        start = (0,) * data.ndim
+    var = file.io.InquireVariable(name)
+    if not var:
+        var = file.io.DefineVariable(
+            name, data, shape, start, data.shape, isConstantDims=True
+        )
+        operators.add_operation(name, var, encoding)
+    # don't allow for changing variable shape
+    assert tuple(var.Shape()) == shape
+    return var
+
+
+# attributes written by encoding a variable, which the appended steps need to share
+_APPEND_ENCODING = ("units", "calendar", "scale_factor", "add_offset", "_FillValue")
+
+
+def _append_encoding(
+    existing: Metadata, variables: Mapping[str, Variable]
+) -> dict[str, Variable]:
+    """Returns `variables` with the encoding of the same variables in the file to
+    append them to, so they are encoded the same way (e.g., datetimes with the same
+    `units`), like `Dataset.to_zarr` does when appending."""
+    result = dict(variables)
+    for name, var in variables.items():
+        info = existing.variables.get(name)
+        if info is not None:
+            result[name] = var.copy(deep=False)
+            result[name].encoding = {
+                **var.encoding,
+                **{
+                    key: info.attrs[key]
+                    for key in _APPEND_ENCODING
+                    if key in info.attrs and key not in var.attrs
+                },
+            }
+    return result
+
+
+def _check_append(
+    existing: Metadata, variables: Mapping[str, Variable], attributes: Mapping[str, Any]
+) -> str:
+    """Checks that `variables` match those of the file to append them to, and returns
+    the step dimension to append along."""
+    step_dimension = existing.attrs.get("step_dimension")
+    if step_dimension is None:
+        msg = "Can only append to files that have a step_dimension."
+        raise ValueError(msg)
+    if attributes.get("step_dimension", step_dimension) != step_dimension:
+        msg = (
+            f"Cannot append along {attributes['step_dimension']!r}, the step "
+            f"dimension of the existing file is {step_dimension!r}."
+        )
+        raise ValueError(msg)
+    if step_dimension not in variables:
+        msg = f"Variable {step_dimension!r} for the step dimension is missing."
+        raise ValueError(msg)
+
+    if variables.keys() != existing.variables.keys():
+        missing = sorted(existing.variables.keys() - variables.keys())
+        extra = sorted(variables.keys() - existing.variables.keys())
+        msg = (
+            "Variables don't match the existing file, "
+            f"missing: {missing}, not in file: {extra}."
+        )
+        raise ValueError(msg)
+
+    for name, var in variables.items():
+        info = existing.variables[name]
+        sizes = {
+            str(dim): size for dim, size in var.sizes.items() if dim != step_dimension
+        }
+        existing_dims = info.attrs.get("dimensions", "").split()
+        existing_sizes = dict(zip(existing_dims, info.shape, strict=False))
+        if list(sizes) != existing_dims or tuple(sizes.values()) != info.shape:
+            msg = (
+                f"Variable {name!r} has dimensions {sizes}, but {existing_sizes} "
+                "in the existing file."
+            )
+            raise ValueError(msg)
+        if var.dtype != info.dtype:
+            msg = (
+                f"Variable {name!r} has dtype {var.dtype}, but {info.dtype} "
+                "in the existing file."
+            )
+            raise ValueError(msg)
+
+    return str(step_dimension)
+
+
+def _compute_steps(
+    arrays: Mapping[str, Any], ranges: list[tuple[int, int]]
+) -> Iterator[dict[str, NDArray[Any]]]:
+    """Yields the dask `arrays` (with the steps along the first axis) computed for
+    each range of steps in turn, as contiguous arrays.
+
+    The next range is computed in the background while the caller works on the
+    current one, so at most two ranges are in memory at a time.
+    """
+    if not arrays:
+        for _ in ranges:
+            yield {}
+        return
+
+    import dask  # noqa: PLC0415
+
+    def compute(first: int, last: int) -> dict[str, NDArray[Any]]:
+        values = dask.compute(  # type: ignore[attr-defined, no-untyped-call]
+            *(data[first:last] for data in arrays.values())
+        )
+        return {
+            name: np.ascontiguousarray(value)
+            for name, value in zip(arrays, values, strict=True)
+        }
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(compute, *ranges[0]) if ranges else None
+        for n in range(len(ranges)):
+            assert future is not None
+            computed = future.result()
+            if n + 1 < len(ranges):
+                future = executor.submit(compute, *ranges[n + 1])
+            yield computed
+
+
 class Lock(Protocol):
     """Provides duck typing for xarray locks, which do not inherit from a common base class."""
 
@@ -43,22 +238,70 @@ class Adios2Store(WritableCFDataStore):
         self,
         manager: FileManager | adios2py.Group,
         mode: str | None = None,
-        lock: Lock = ADIOS2_LOCK,
+        lock: Lock | None = None,
         autoclose: bool = False,
+        coalesce_gap: int = DEFAULT_COALESCE_GAP,
+        read_workers: int | None = None,
+        parallel_min_bytes: int = DEFAULT_PARALLEL_MIN_BYTES,
+        block_cache: BlockCache | None = None,
+        variables: str | Iterable[str] | None = None,
+        drop_variables: str | Iterable[str] | None = None,
+        metadata_index: bool = False,
+        group: str | None = None,
+        read_stats: ReadStats | None = None,
+        comm: Any = None,
+        decomposed_dim: str | None = None,
+        block_reads: bool = False,
     ):
+        filename = None
+        self._owns_file = not isinstance(manager, adios2py.Group)
+        # identifies the file (and engine) in other processes, see `__getstate__`
+        self._file_token = uuid.uuid4().hex
         if isinstance(manager, adios2py.Group):
+            self._file_token = _group_token(manager)
             mode = manager._file._mode
+            filename = os.fspath(manager._file.filename)
+            # a Step can't be described by the index, which covers the whole file
+            metadata_index = metadata_index and not isinstance(manager, adios2py.Step)
+            if lock is None:
+                lock = _group_lock(manager)
             manager = DummyFileManager(manager)  # type: ignore[no-untyped-call]
+        elif lock is None:
+            lock = SerializableLock()
 
         assert isinstance(manager, FileManager)
         self._manager = manager
         self._mode = mode
         self.lock = ensure_lock(lock)  # type: ignore[no-untyped-call]
         self.autoclose = autoclose
-        self._filename = self.ds._file.filename
+        self.coalesce_gap = coalesce_gap
+        self.read_pool = get_read_pool(read_workers) if read_workers else None
+        self.parallel_min_bytes = parallel_min_bytes
+        self.block_cache = block_cache
+        self.read_stats = read_stats
+        self.block_reads = block_reads
+        if isinstance(variables, str):
+            variables = [variables]
+        if isinstance(drop_variables, str):
+            drop_variables = [drop_variables]
+        self._variables = None if variables is None else list(variables)
+        self._drop_variables = list(drop_variables or ())
+        # the index only describes the file's variables by their full names
+        self._metadata_index = metadata_index and mode == "rra" and group is None
+        self._group = group
+        self._prefix = group_prefix(group)
+        self._comm = comm
+        self._decomposed_dim = decomposed_dim
+        self._filename: str | None = filename
+        self._metadata: Metadata | None = None
         self._global_attrs: dict[str, Any] | None = None
         self._encoding: dict[str, Any] = {}
         self._step_dimension: None | str = None
+        # metadata of the existing file when appending to it
+        self._append_to: Metadata | None = None
+        self._operators = Operators()
+        # the file's variables and attributes, if inquired in random access mode
+        self._available: Available | None = None
 
     @classmethod
     def open(
@@ -69,12 +312,84 @@ class Adios2Store(WritableCFDataStore):
         autoclose: bool = False,
         parameters: Mapping[str, Any] | None = None,
         engine_type: str | None = None,
+        coalesce_gap: int = DEFAULT_COALESCE_GAP,
+        read_workers: int | None = None,
+        parallel_min_bytes: int = DEFAULT_PARALLEL_MIN_BYTES,
+        block_cache: BlockCache | None = None,
+        variables: str | Iterable[str] | None = None,
+        drop_variables: str | Iterable[str] | None = None,
+        metadata_index: bool = False,
+        group: str | None = None,
+        read_stats: ReadStats | None = None,
+        comm: Any = None,
+        decomposed_dim: str | None = None,
+        block_reads: bool = False,
     ) -> Adios2Store:
+        """Opens an adios2 file or stream.
+
+        Every store opened this way has its own adios2 engine, so by default it also
+        gets its own lock, and reads from different stores can proceed in parallel.
+        Pass `lock=ADIOS2_LOCK` to serialize all adios2 access globally instead,
+        e.g., if the installed adios2 isn't thread safe.
+
+        With `read_workers`, selections of at least `parallel_min_bytes` are split up
+        and read by a pool of worker processes, each of which opens the file itself
+        (random access mode only).
+
+        Passing a `block_cache` keeps recently read blocks in memory. The same cache
+        can be passed to any number of stores. Likewise, passing `read_stats` records
+        the reads' counts, sizes and timings, see `ReadStats`.
+
+        `variables` (glob patterns) and `drop_variables` (names) select the
+        variables to open, see `read_metadata`. Variables that aren't selected are
+        skipped before any of their metadata is read.
+
+        With `metadata_index`, the metadata of files opened in random access mode is
+        kept in an index next to the file (see `adios2index`), so opening the file
+        again doesn't need to go through the engine's metadata at all. A stale index
+        is rebuilt transparently.
+
+        With `group` (e.g. "species/electron"), the store only holds the variables and
+        attributes of that group of path-style names, see `read_metadata`. Stores for
+        other groups of the same file can share its manager and lock, like
+        `Adios2BackendEntrypoint.open_groups_as_dict` does.
+
+        With `block_reads`, variables are read by block ID where a selection covers
+        whole blocks, e.g. when reading chunk by chunk with dask (whose chunks follow
+        the blocks, if opened with `chunks={}`). This spares the engine from looking
+        for the blocks a selection intersects, which adds up with many writers. Local
+        arrays, which have no global shape, are always read this way, see
+        `Adios2Array`.
+
+        With `comm` (an mpi4py communicator), all its ranks open the file together.
+        When reading, each rank can then read its own part of a variable, see
+        `decomposition`. When writing, variables with dimension `decomposed_dim` are
+        concatenated along it across the ranks (in rank order), with every rank
+        writing its own part as a block; all other variables and the attributes are
+        written by rank 0 only.
+
+        In append mode ("a"), storing a Dataset adds its steps after the existing
+        ones, after checking that its variables match those in the file. If the file
+        doesn't exist yet, it is created as in write mode.
+        """
+        append_to = None
+        if mode == "a":
+            if os.path.exists(filename):  # noqa: PTH110
+                with adios2py.File(
+                    filename,
+                    mode="rra",
+                    parameters=None if parameters is None else dict(parameters),
+                    engine_type=engine_type,
+                ) as file:
+                    append_to = read_metadata(file)
+            else:
+                mode = "w"
+
         if lock is None:
             if mode in ("r", "rra"):
-                lock = ADIOS2_LOCK
+                lock = SerializableLock()
             else:
-                lock = combine_locks([ADIOS2_LOCK, get_write_lock(filename)])  # type: ignore[no-untyped-call]
+                lock = combine_locks([SerializableLock(), get_write_lock(filename)])  # type: ignore[no-untyped-call]
 
         assert isinstance(filename, str | os.PathLike)
         kwargs: dict[str, Any] = {}
@@ -83,8 +398,120 @@ class Adios2Store(WritableCFDataStore):
         if engine_type is not None:
             kwargs["engine_type"] = engine_type
 
-        manager = CachingFileManager(adios2py.File, filename, mode=mode, kwargs=kwargs)
-        return cls(manager, mode=mode, lock=lock, autoclose=autoclose)
+        # the communicator is passed to the opener, since it isn't hashable
+        opener = (
+            Adios2File if comm is None else functools.partial(Adios2File, comm=comm)
+        )
+        manager = CachingFileManager(opener, filename, mode=mode, kwargs=kwargs)
+        store = cls(
+            manager,
+            mode=mode,
+            lock=lock,
+            autoclose=autoclose,
+            coalesce_gap=coalesce_gap,
+            read_workers=read_workers,
+            parallel_min_bytes=parallel_min_bytes,
+            block_cache=block_cache,
+            variables=variables,
+            drop_variables=drop_variables,
+            metadata_index=metadata_index,
+            group=group,
+            read_stats=read_stats,
+            comm=comm,
+            decomposed_dim=decomposed_dim,
+            block_reads=block_reads,
+        )
+        store._filename = os.fspath(filename)
+        store._append_to = append_to
+        return store
+
+    @override
+    def close(self, **kwargs: Any) -> None:
+        # files passed in as adios2py.Group belong to the caller
+        if self._owns_file:
+            self._manager.close(**kwargs)  # type: ignore[no-untyped-call]
+
+    def group_store(self, group: str) -> Adios2Store:
+        """Returns a store for `group` of the same file, sharing this store's file
+        (and thus its adios2 engine), lock and read settings."""
+        store = type(self)(
+            self._manager,
+            mode=self._mode,
+            lock=self.lock,
+            autoclose=self.autoclose,
+            coalesce_gap=self.coalesce_gap,
+            parallel_min_bytes=self.parallel_min_bytes,
+            block_cache=self.block_cache,
+            read_stats=self.read_stats,
+            variables=self._variables,
+            drop_variables=self._drop_variables,
+            group=group,
+            comm=self._comm,
+            decomposed_dim=self._decomposed_dim,
+            block_reads=self.block_reads,
+        )
+        store.read_pool = self.read_pool
+        store._owns_file = self._owns_file
+        with self.lock:
+            store._available = self._inquire_available()
+        store._file_token = self._file_token
+        store._filename = self._filename
+        return store
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Returns the store's state for pickling, e.g. to send it to dask workers.
+
+        Rather than the open file, the state holds what's needed to reopen it, along
+        with the metadata (without any values read with it), so the unpickled store
+        doesn't need to go through the file's metadata again. The file is reopened
+        on first use, in a pool of files shared by all stores unpickled in the same
+        process, see `PooledFileManager`. The store's `read_pool` isn't pickled.
+
+        Only stores reading a whole file in random access mode, without a
+        communicator, can be pickled, including those opened from an adios2py.File.
+        """
+        if self._mode != "rra" or self._comm is not None:
+            msg = (
+                "Only stores reading a file in random access mode ('rra') without "
+                f"a communicator can be pickled, not {self._source()!r} in mode "
+                f"{self._mode!r}."
+            )
+            raise TypeError(msg)
+        with self.lock:
+            group = self.ds
+            if group._step is not None:
+                msg = (
+                    f"A store for a single step of {self._source()!r} can't be pickled."
+                )
+                raise TypeError(msg)
+            metadata = self._read_metadata()
+            if self._global_attrs is None:
+                self._read_global_attributes()
+            manager = self._manager
+            if not isinstance(manager, PooledFileManager):
+                identity = FileIdentity.from_file(group._file)
+                manager = PooledFileManager(identity, self._file_token, self.lock)
+
+        state = self.__dict__.copy()
+        state["_manager"] = manager
+        if isinstance(self.lock, PooledFileLock):
+            state["lock"] = self.lock.lock
+        state["_filename"] = self._source()
+        state["_metadata"] = metadata._replace(
+            variables={
+                name: var._replace(values=None)
+                for name, var in metadata.variables.items()
+            }
+        )
+        state["read_pool"] = None
+        state["_available"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._owns_file = True
+        assert isinstance(self._manager, PooledFileManager)
+        self.lock = self._manager.store_lock(self.lock)
 
     def acquire(self, needs_lock: bool = True) -> adios2py.Group:
         with self._manager.acquire_context(needs_lock) as group:  # type: ignore[no-untyped-call]
@@ -96,19 +523,64 @@ class Adios2Store(WritableCFDataStore):
     def ds(self) -> adios2py.Group:
         return self.acquire()
 
+    def _source(self) -> str:
+        if self._filename is None:
+            self._filename = os.fspath(self.ds._file.filename)
+        return self._filename
+
+    def _inquire_available(self) -> Available:
+        """Returns the file's variables and attributes, which in random access mode
+        are only inquired once, also for the stores of other groups, see
+        `group_store`."""
+        if self._available is not None:
+            return self._available
+        available = inquire_available(self.ds._file)
+        if self._mode == "rra":
+            self._available = available
+        return available
+
+    def _read_metadata(self) -> Metadata:
+        if self._metadata is None:
+            if self._metadata_index:
+                self._metadata = self._read_metadata_index()
+            else:
+                self._metadata = read_metadata(
+                    self.ds,
+                    self._variables,
+                    self._drop_variables,
+                    self._group,
+                    self._inquire_available(),
+                )
+        return self._metadata
+
+    def _read_metadata_index(self) -> Metadata:
+        metadata = read_index(self._source())
+        if metadata is None:
+            # (re-)build the index from all variables, then select from that
+            metadata = read_metadata(self.ds, available=self._inquire_available())
+            write_index(self._source(), metadata)
+        return select_variables(metadata, self._variables, self._drop_variables)
+
     def _read_global_attributes(self) -> None:
-        self._global_attrs = dict(self.ds.attrs)
+        metadata = self._read_metadata()
+        self._global_attrs = dict(metadata.attrs)
         self._step_dimension = self._global_attrs.get("step_dimension", None)
+        if self._prefix:
+            # groups share the step dimension of the root group
+            self._step_dimension = step_dimension(
+                self.ds._file, self._inquire_available()
+            )
         if self._step_dimension is not None:
             self._encoding["step_dimension"] = self._step_dimension
-        if isinstance(self.ds, adios2py.Step):
+        if metadata.n_steps is None:
             # When reading the whole file step-by-step, add the additional step dimension,
             # but not if we're only reading a single step
             self._step_dimension = None
 
-    def open_store_variable(self, name: str, var: adios2py.ArrayProxy) -> Variable:
-        if not self._global_attrs:
+    def open_store_variable(self, name: str, var: VariableInfo) -> Variable:
+        if self._global_attrs is None:
             self._read_global_attributes()
+        n_steps = self._read_metadata().n_steps
 
         attrs = dict(var.attrs)
         dims = attrs.pop("dimensions", "").split()
@@ -117,34 +589,74 @@ class Adios2Store(WritableCFDataStore):
             # and are constant in time, so we remove the redundant step dimensions
             # (or, rather, don't add it in the first place)
             dimensions = dims
-            data = indexing.LazilyIndexedArray(Adios2Array(name, self, step=0))
+            array = Adios2Array(
+                self._prefix + name,
+                self,
+                step=0,
+                shape=var.shape,
+                dtype=var.dtype,
+                has_step_axis=False,
+                chunks=var.chunks,
+                local=var.local,
+            )
         else:
             dimensions = [self._step_dimension, *dims] if self._step_dimension else dims
-            data = indexing.LazilyIndexedArray(Adios2Array(name, self))
+            shape = var.shape if n_steps is None else (n_steps, *var.shape)
+            array = Adios2Array(
+                self._prefix + name,
+                self,
+                shape=shape,
+                dtype=var.dtype,
+                has_step_axis=n_steps is not None,
+                chunks=var.chunks,
+                local=var.local,
+            )
+        data: Any = indexing.LazilyIndexedArray(array)
+        if var.values is not None and var.values.shape == array.shape:
+            # already read together with the metadata
+            data = var.values
         encoding: dict[str, Any] = {}
 
         # save source so __repr__ can detect if it's local or not
-        encoding["source"] = self._filename
-        encoding["original_shape"] = var.shape
+        encoding["source"] = self._source()
+        encoding["original_shape"] = array.shape
         encoding["dtype"] = var.dtype
+        if var.compressor is not None:
+            encoding[OPERATOR_KEY] = var.compressor
 
         if len(dimensions) != data.ndim and not dims:
             # if we have no info, not much we can do...
             # print(f"Variable without dimensions: {var_name}")
             dimensions = tuple(f"dim_{dim}_{len}" for dim, len in enumerate(data.shape))
 
+        chunks = var.chunks
+        if chunks is not None and array.has_step_axis:
+            # each step makes up its own chunk
+            chunks = ((1,) * array.shape[0], *chunks)
+        if chunks is not None and len(chunks) == len(dimensions):
+            preferred_chunks = {
+                dim: _simplify_chunks(c)
+                for dim, c in zip(dimensions, chunks, strict=True)
+            }
+            encoding["preferred_chunks"] = preferred_chunks
+            encoding["chunksizes"] = tuple(c[0] for c in chunks)
+
         return Variable(dimensions, data, attrs, encoding)
 
     @override
     def get_variables(self) -> Mapping[str, Variable]:
-        return FrozenDict(
-            (k, self.open_store_variable(k, v)) for k, v in self.ds.items()
-        )
+        with self.lock:
+            variables = self._read_metadata().variables
+            return FrozenDict(
+                (name, self.open_store_variable(name, var))
+                for name, var in variables.items()
+            )
 
     @override
     def get_attrs(self) -> Mapping[str, Any]:
-        if not self._global_attrs:
-            self._read_global_attributes()
+        with self.lock:
+            if self._global_attrs is None:
+                self._read_global_attributes()
 
         return FrozenDict(self._global_attrs)
 
@@ -156,6 +668,177 @@ class Adios2Store(WritableCFDataStore):
     def get_encoding(self) -> Mapping[str, Any]:
         return self._encoding
 
+    def _variable_steps(self, name: str) -> tuple[Variable, Adios2Array, list[int]]:
+        """Returns the (lazy) variable `name`, its array and the adios2 steps it
+        spans."""
+        var = self._read_metadata().variables[name]
+        variable = self.open_store_variable(name, var._replace(values=None))
+        data = variable._data
+        assert isinstance(data, indexing.LazilyIndexedArray)
+        array = data.array
+        assert isinstance(array, Adios2Array)
+        group = self.ds
+        if array.step is not None:
+            steps = [array.step]
+        elif group._step is not None:
+            steps = [group._step]
+        elif array.has_step_axis:
+            steps = list(range(array.shape[0]))
+        else:
+            steps = [group._file.current_step()]
+        return variable, array, steps
+
+    def block_stats(self, name: str) -> dict[int, list[BlockInfo]]:
+        """Returns the blocks of variable `name`, including their min/max, by step.
+
+        This only looks at the file's metadata, without reading any data. Note that
+        for floating point data, adios2 only keeps about 6 significant digits of the
+        min/max.
+        """
+        with self.lock:
+            _, array, steps = self._variable_steps(name)
+            file = self.ds._file
+            return {
+                step: list(array._blocks(file, step).by_id.values()) for step in steps
+            }
+
+    def step_stats(self, name: str) -> Dataset:
+        """Returns the min/max of variable `name` for each step, from metadata only.
+
+        The result has variables "min" and "max" along the step dimension (or "step"),
+        with the adios2 step numbers as coordinate, so e.g.
+        `stats.step[stats["max"] > threshold]` finds the steps with values above a
+        threshold. They are floating point like `read_where`'s result, NaN for steps
+        whose blocks don't all have a min/max.
+        """
+        with self.lock:
+            variable, _, _ = self._variable_steps(name)
+        dtype = np.result_type(variable.dtype, np.float32)
+        stats = self.block_stats(name)
+        vmin, vmax = [], []
+        for blocks in stats.values():
+            lows = [b.vmin for b in blocks if b.vmin is not None]
+            highs = [b.vmax for b in blocks if b.vmax is not None]
+            complete = blocks and len(lows) == len(highs) == len(blocks)
+            vmin.append(min(lows) if complete else np.nan)
+            vmax.append(max(highs) if complete else np.nan)
+        dim = self._step_dimension or "step"
+        return Dataset(
+            {
+                "min": (dim, np.array(vmin, dtype=dtype)),
+                "max": (dim, np.array(vmax, dtype=dtype)),
+            },
+            coords={"step": (dim, list(stats))},
+        )
+
+    def read_where(
+        self, name: str, lower: float | None = None, upper: float | None = None
+    ) -> DataArray:
+        """Reads variable `name`, keeping only values within [lower, upper].
+
+        Blocks whose min/max show that none of their values can be within the bounds
+        aren't read at all. Values that aren't kept are NaN in the result, which is
+        floating point. Returns the data as stored, without decoding.
+        """
+        with self.lock:
+            variable, array, steps = self._variable_steps(name)
+            file = self.ds._file
+            dtype = np.result_type(variable.dtype, np.float32)
+            out = np.full(variable.shape, np.nan, dtype=dtype)
+            out_steps = out if array.has_step_axis else out[np.newaxis]
+
+            adios_var = file.io.InquireVariable(self._prefix + name)
+            reads = []
+            for n, step in enumerate(steps):
+                for block in array._blocks(file, step).by_id.values():
+                    if not block.may_contain(lower, upper):
+                        continue
+                    if file._mode == "rra":
+                        adios_var.SetStepSelection([step, 1])
+                    if block.shape:
+                        adios_var.SetBlockSelection(block.block_id)
+                    data = np.empty(block.shape, dtype=variable.dtype)
+                    file.engine.Get(adios_var, data, adios2bindings.Mode.Deferred)
+                    box = tuple(
+                        slice(s, s + c)
+                        for s, c in zip(block.start, block.shape, strict=True)
+                    )
+                    reads.append((out_steps[n, ...], box, data))
+            file.engine.PerformGets()
+
+        for out_step, box, data in reads:
+            out_step[box] = data
+        if lower is not None:
+            out[out < lower] = np.nan
+        if upper is not None:
+            out[out > upper] = np.nan
+        return DataArray(out, dims=variable.dims, attrs=variable.attrs, name=name)
+
+    def decomposition(
+        self, name: str, by: str = "slab", dim: Hashable | None = None
+    ) -> list[dict[Hashable, slice]]:
+        """Returns the selections of variable `name` (as `isel` indexers) that this
+        rank of the store's communicator should read, so that all ranks together read
+        the whole variable exactly once. Without a communicator, that's all of it.
+
+        With `by="slab"`, the variable is split into contiguous slabs along `dim`, by
+        default its first dimension other than the step dimension. With
+        `by="block"`, each rank gets whole blocks, as written (in the first step),
+        assigned round-robin, so no block needs to be read by more than one rank.
+        """
+        rank, size = rank_and_size(self._comm)
+        with self.lock:
+            variable, array, steps = self._variable_steps(name)
+            spatial_dims = variable.dims[1:] if array.has_step_axis else variable.dims
+            if by == "block":
+                blocks = list(array._blocks(self.ds._file, steps[0]).by_id.values())
+        if by == "block":
+            return [
+                {
+                    dim: slice(start, start + count)
+                    for dim, start, count in zip(
+                        spatial_dims, block.start, block.shape, strict=True
+                    )
+                }
+                for n, block in enumerate(blocks)
+                if n % size == rank
+            ]
+        if by != "slab":
+            msg = f"by must be 'slab' or 'block', not {by!r}"
+            raise ValueError(msg)
+
+        if dim is None:
+            dims = spatial_dims or variable.dims
+            if not dims:
+                return [{}] if rank == 0 else []
+            dim = dims[0]
+        return [{dim: rank_slice(variable.sizes[dim], rank, size)}]
+
+    def read_into(
+        self,
+        name: str,
+        out: NDArray[Any] | None = None,
+        indexers: Mapping[Hashable, Any] | None = None,
+    ) -> NDArray[Any]:
+        """Reads variable `name`, or the selection given by `indexers` (an integer,
+        slice or array of indices per dimension, applied independently like
+        `Dataset.isel` does for arrays), into the array `out`.
+
+        `out` can be any writeable array of the selection's shape and the variable's
+        dtype, e.g., one backed by shared memory. Contiguous parts of the selection
+        are read into it directly, see `Adios2Array.read`. Returns the data as
+        stored, without decoding.
+        """
+        with self.lock:
+            variable, array, _ = self._variable_steps(name)
+        indexers = indexers or {}
+        unknown = set(indexers) - set(variable.dims)
+        if unknown:
+            msg = f"Variable {name!r} has no dimensions {sorted(map(str, unknown))}."
+            raise ValueError(msg)
+        key = tuple(indexers.get(dim, slice(None)) for dim in variable.dims)
+        return array.read(key, out)
+
     @override
     def store(
         self,
@@ -165,31 +848,137 @@ class Adios2Store(WritableCFDataStore):
         writer: Any = None,
         unlimited_dims: bool | None = None,
     ) -> None:
+        if self._append_to is not None:
+            variables = _append_encoding(self._append_to, variables)
         variables, attributes = self.encode(variables, attributes)  # type:ignore[no-untyped-call]
 
-        if isinstance(self.ds, adios2py.File):
-            step_dimension = attributes.get("step_dimension", None)
-            if step_dimension is not None:
+        if self._append_to is not None:
+            # attributes are already in the file, only add the new steps
+            step_dimension = _check_append(self._append_to, variables, attributes)
+            file = self.ds
+            assert isinstance(file, adios2py.File)
+            self._write_steps(file, variables, step_dimension, write_attrs=False)
+        elif isinstance(self.ds, adios2py.File):
+            if rank_and_size(self._comm)[0] == 0:
                 for name, attr in attributes.items():
                     self.ds.attrs[name] = attr
-
-                n_steps = variables[step_dimension].sizes[step_dimension]
-                for n, step in zip(range(n_steps), self.ds.steps, strict=False):
-                    step_variables = {
-                        name: var.isel({step_dimension: n}, missing_dims="ignore")
-                        for name, var in variables.items()
-                    }
-                    Adios2Store(step).store(step_variables, {})
-            else:
-                # write whole Dataset into single step
-                with self.ds.steps.next() as step:
-                    self._write(step, variables, attributes)
+            # without a step dimension, the whole Dataset is written into one step
+            step_dimension = attributes.get("step_dimension", None)
+            self._write_steps(self.ds, variables, step_dimension)
 
         elif isinstance(self.ds, adios2py.Step):
             self._write(self.ds, variables, attributes)
         else:
             raise NotImplementedError()
 
+    def _write_steps(
+        self,
+        file: adios2py.File,
+        variables: Mapping[str, Variable],
+        step_dimension: str | None,
+        write_attrs: bool = True,
+    ) -> None:
+        """Writes variables that (may) have a step dimension, one step at a time.
+
+        Each variable is converted to a contiguous, step-major array once, so every
+        step is written from a view without copying. The variables and their
+        attributes are defined once in the first step, and all puts of a step are
+        deferred until the step ends.
+
+        Dask-backed variables aren't computed up front, but one chunk along the step
+        dimension at a time (see `_compute_steps`), so only a chunk's worth of steps
+        needs to be in memory, and computing the next chunk overlaps with writing
+        the current one.
+
+        With a communicator, each rank writes its part of the variables along
+        `decomposed_dim`, and rank 0 writes everything else.
+        """
+        n_steps = 1
+        if step_dimension is not None:
+            n_steps = variables[step_dimension].sizes[step_dimension]
+        rank, _ = rank_and_size(self._comm)
+        write_attrs = write_attrs and rank == 0
+        decomposed_dim = self._decomposed_dim if self._comm is not None else None
+        offset = total = 0
+        if decomposed_dim is not None:
+            lengths = [
+                var.sizes[decomposed_dim]
+                for var in variables.values()
+                if decomposed_dim in var.dims
+            ]
+            offset, total = global_offset(self._comm, lengths[0] if lengths else 0)
+
+        arrays = {}
+        lazy = {}  # dask arrays of variables with the step dimension
+        for name, var in variables.items():
+            split = decomposed_dim is not None and decomposed_dim in var.dims
+            if rank != 0 and not split:
+                continue
+            # variables without the step dimension are written in every step, the
+            # same as when writing step by step
+            stepped = step_dimension in var.dims
+            data = var.data
+            if not (stepped and is_duck_dask_array(data)):
+                data = np.asarray(var.values)
+            if stepped:
+                # (for dask arrays, this stays lazy)
+                data = np.moveaxis(data, var.get_axis_num(step_dimension), 0)
+            if is_duck_dask_array(data):
+                lazy[name] = data
+            elif not data.flags.c_contiguous or not data.flags.writeable:
+                data = np.array(data, order="C")
+            dims = [str(dim) for dim in var.dims if dim != step_dimension]
+            attrs = {"dimensions": " ".join(dims), "dtype": str(var.dtype), **var.attrs}
+            # global shape and start of this rank's part
+            shape = list(data.shape[1:] if stepped else data.shape)
+            start = [0] * len(shape)
+            if split:
+                axis = dims.index(str(decomposed_dim))
+                shape[axis] = total
+                start[axis] = offset
+            arrays[name] = (data, stepped, attrs, var.encoding, shape, start)
+
+        # steps computed together: the chunks along the step dimension
+        edges = {0, n_steps}
+        for data in lazy.values():
+            edges.update(np.cumsum(data.chunks[0]).tolist())
+        ranges = list(itertools.pairwise(sorted(edges)))
+
+        adios_vars: dict[str, Any] = {}
+        for (first, last), computed in zip(
+            ranges, _compute_steps(lazy, ranges), strict=True
+        ):
+            for n in range(first, last):
+                with file.steps.next():
+                    for name, (
+                        data,
+                        stepped,
+                        attrs,
+                        encoding,
+                        shape,
+                        start,
+                    ) in arrays.items():
+                        if name in computed:
+                            step_data = computed[name][n - first, ...]
+                        else:
+                            step_data = data[n, ...] if stepped else data
+                        if name not in adios_vars:
+                            adios_vars[name] = _define_variable(
+                                file,
+                                self._operators,
+                                name,
+                                step_data,
+                                encoding,
+                                tuple(shape),
+                                tuple(start),
+                            )
+                            if write_attrs:
+                                for attr_name, attr in attrs.items():
+                                    file._write_attribute(attr_name, attr, name)
+                        file.engine.Put(
+                            adios_vars[name], step_data, adios2bindings.Mode.Deferred
+                        )
+
     def _write(
         self,
         step: adios2py.Step,
@@ -197,7 +986,9 @@ class Adios2Store(WritableCFDataStore):
         attributes: Mapping[str, Any],
     ) -> None:
         for name, var in variables.items():
-            step[name] = var
+            data = np.asarray(var.values)
+            _define_variable(step._file, self._operators, name, data, var.encoding)
+            step[name] = data
             step[name].attrs["dimensions"] = " ".join(var.dims)  # type: ignore[arg-type]
             step[name].attrs["dtype"] = str(var.dtype)
             for attr_name, attr in var.attrs.items():
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import functools
+import os
+from collections.abc import Hashable, Mapping
+from typing import TYPE_CHECKING, Any
+
+import xarray as xr
+
+from .adios2store import Adios2Store
+
+if TYPE_CHECKING:
+    from dask.delayed import Delayed
+
+
+def to_adios2(
+    dataset: xr.Dataset,
+    filename: str | os.PathLike[Any],
+    mode: str = "w",
+    append_dim: Hashable | None = None,
+    encoding: Mapping[Hashable, Mapping[str, Any]] | None = None,
+    parameters: Mapping[str, Any] | None = None,
+    engine_type: str | None = None,
+    comm: Any = None,
+    decomposed_dim: str | None = None,
+    compute: bool = True,
+) -> Delayed | None:
+    """Writes `dataset` to an adios2 file.
+
+    Datasets with a step dimension (`append_dim`, or the `step_dimension` attribute)
+    are written as one adios2 step per element along that dimension.
+
+    With `mode="a"`, the steps are appended to those of an existing file, which
+    requires the dataset to have the same variables, with the same dimensions and
+    dtypes, as the file. Only the new steps are written. If the file doesn't exist,
+    it's created.
+
+    `encoding` maps variable names to their encoding, like for `Dataset.to_netcdf`.
+    In particular, `{"adios2_operator": "blosc", "clevel": 5}` or, for lossy
+    compression, `{"adios2_operator": "zfp", "accuracy": 1e-6}` compress a variable
+    with an adios2 operator (see `adios2operators.OPERATOR_PARAMETERS`). Reading a
+    file puts the operator its variables were written with into their encoding, so
+    writing them again uses the same operator.
+
+    With `comm` (an mpi4py communicator), every rank calls `to_adios2` with its part
+    of the Dataset, and the parts are concatenated along `decomposed_dim`, see
+    `Adios2Store.open`.
+
+    Variables backed by dask arrays are computed one chunk along the step dimension
+    at a time while writing, with the next chunk computed while the current one is
+    written, so the Dataset never needs to fit into memory (chunking the step
+    dimension in single steps keeps the least in memory). With `compute=False`,
+    nothing is computed or written yet; instead, a `dask.delayed` object is
+    returned, which does the writing when computed, e.g. together with other
+    writes.
+    """
+    if mode not in ("w", "a"):
+        msg = f"mode must be 'w' or 'a', not {mode!r}"
+        raise ValueError(msg)
+
+    if append_dim is not None:
+        step_dimension = dataset.attrs.get("step_dimension", append_dim)
+        if step_dimension != append_dim:
+            msg = (
+                f"append_dim {append_dim!r} doesn't match the Dataset's "
+                f"step_dimension {step_dimension!r}"
+            )
+            raise ValueError(msg)
+        dataset = dataset.assign_attrs(step_dimension=append_dim)
+
+    write = functools.partial(
+        _write,
+        dataset,
+        filename,
+        mode=mode,
+        encoding=encoding,
+        parameters=parameters,
+        engine_type=engine_type,
+        comm=comm,
+        decomposed_dim=decomposed_dim,
+    )
+    if not compute:
+        import dask  # noqa: PLC0415
+
+        # (the Dataset is passed inside the partial, so dask doesn't compute it as
+        # an argument)
+        return dask.delayed(write, pure=False)()  # type: ignore[attr-defined, no-any-return]
+    write()
+    return None
+
+
+def _write(
+    dataset: xr.Dataset,
+    filename: str | os.PathLike[Any],
+    mode: str,
+    encoding: Mapping[Hashable, Mapping[str, Any]] | None,
+    parameters: Mapping[str, Any] | None,
+    engine_type: str | None,
+    comm: Any,
+    decomposed_dim: str | None,
+) -> None:
+    store = Adios2Store.open(
+        filename,
+        mode=mode,
+        parameters=parameters,
+        engine_type=engine_type,
+        comm=comm,
+        decomposed_dim=decomposed_dim,
+    )
+    try:
+        dataset.dump_to_store(store, encoding=encoding)
+    finally:
+        store.close()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import itertools
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
 import adios2py
 import numpy as np
 import pytest
@@ -40,3 +43,36 @@ def one_step_file(tmp_path, sample_dataset):
             sample_dataset.dump_to_store(store)
 
     return filename
+
+
+@pytest.fixture
+def blocks_file(tmp_path):
+    """A file with a 2-d variable written as 2 x 3 blocks per step, the way multiple
+    writers would write it, with an irregular decomposition along x."""
+    filename = tmp_path / "blocks.bp"
+    x_edges = [0, 4, 10, 15]
+    adios = adios2bindings.ADIOS()
+    io = adios.DeclareIO("blocks")
+    engine = io.Open(str(filename), adios2bindings.Mode.Write)
+    io.DefineAttribute("step_dimension", "time")
+    field = time = None
+    for n in range(3):
+        engine.BeginStep()
+        data = np.arange(n * 8 * 15.0, (n + 1) * 8 * 15.0).reshape(8, 15)
+        for y0 in (0, 4):
+            for x0, x1 in itertools.pairwise(x_edges):
+                block = np.ascontiguousarray(data[y0 : y0 + 4, x0:x1])
+                if field is None:
+                    field = io.DefineVariable("field", block, [8, 15], [0, 0], [4, 4])
+                    io.DefineAttribute("dimensions", "y x", "field")
+                field.SetSelection(([y0, x0], list(block.shape)))
+                engine.Put(field, block, adios2bindings.Mode.Sync)
+        value = np.array(float(n))
+        if time is None:
+            time = io.DefineVariable("time", value)
+            io.DefineAttribute("dimensions", "", "time")
+        engine.Put(time, value, adios2bindings.Mode.Sync)
+        engine.EndStep()
+    engine.Close()
+
+    return filename
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, adios2array
+from xarray_adios2.adios2array import Adios2Array, _coalesce
+from xarray_adios2.adios2pool import ReadPool
+
+
+@pytest.fixture
+def field_dataset():
+    return xr.Dataset(
+        {"field": (("time", "z", "x"), np.arange(4 * 6 * 50.0).reshape(4, 6, 50))},
+        coords={"time": np.arange(4.0), "z": np.arange(6.0), "x": np.arange(50.0)},
+        attrs={"step_dimension": "time"},
+    )
+
+
+@pytest.fixture
+def field_file(tmp_path, field_dataset):
+    filename = tmp_path / "field.bp"
+    with adios2py.File(filename, mode="w") as file:
+        field_dataset.dump_to_store(Adios2Store(file))
+
+    return filename
+
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    reads = []
+    read_boxes = Adios2Array._read_boxes
+
+    def _read_boxes(self, dims, boxes, *args):
+        reads.append(
+            (
+                self.variable_name,
+                [tuple((p.start, p.stop) for p in pieces) for pieces in boxes],
+            )
+        )
+        return read_boxes(self, dims, boxes, *args)
+
+    monkeypatch.setattr(Adios2Array, "_read_boxes", _read_boxes)
+    return reads
+
+
+def test_coalesce():
+    indices = np.array([0, 1, 2, 5, 20, 21, 40])
+    assert _coalesce(indices, 0) == [(0, 3), (5, 6), (20, 22), (40, 41)]
+    assert _coalesce(indices, 2) == [(0, 6), (20, 22), (40, 41)]
+    assert _coalesce(indices, 100) == [(0, 41)]
+    assert _coalesce(np.array([], dtype=np.intp), 0) == []
+
+
+@pytest.mark.parametrize(
+    "indexers",
+    [
+        {"x": [3, 40, 4]},
+        {"x": [7, 7, 2], "z": [5, 0]},
+        {"x": slice(1, None, 7), "time": 2},
+        {"x": slice(None, None, -3)},
+        {"x": np.arange(50) % 3 == 0},
+        {"x": slice(4, 4)},
+        {"time": [3, 1], "z": 2, "x": [49, 0]},
+    ],
+)
+def test_outer_indexing(field_file, field_dataset, indexers):
+    with xr.open_dataset(field_file) as ds:
+        expected = field_dataset.field.isel(indexers)
+        assert np.array_equal(ds.field.isel(indexers), expected)
+
+
+def test_vectorized_indexing(field_file, field_dataset):
+    indexers = {
+        "z": xr.DataArray([1, 5, 1], dims="points"),
+        "x": xr.DataArray([2, 49, 30], dims="points"),
+    }
+    with xr.open_dataset(field_file) as ds:
+        expected = field_dataset.field.isel(indexers)
+        assert np.array_equal(ds.field.isel(indexers), expected)
+
+
+@pytest.mark.parametrize(("coalesce_gap", "n_reads"), [(0, 3), (4, 2), (100, 1)])
+def test_coalesce_gap(field_file, field_dataset, count_reads, coalesce_gap, n_reads):
+    indexers = {"time": 1, "x": [3, 4, 8, 40]}
+    with xr.open_dataset(field_file, coalesce_gap=coalesce_gap) as ds:
+        assert np.array_equal(
+            ds.field.isel(indexers), field_dataset.field.isel(indexers)
+        )
+    (boxes,) = [boxes for name, boxes in count_reads if name == "field"]
+    assert len(boxes) == n_reads
+
+
+@pytest.mark.parametrize(
+    ("indexers", "steps"),
+    [
+        ({"time": slice(1, 4)}, [(1, 4)]),
+        ({"time": [0, 2, 3]}, [(0, 1), (2, 4)]),
+        ({"time": [3, 0], "x": [1, 45]}, [(0, 1), (3, 4)]),
+        ({"time": 2, "x": 7}, [(2, 3)]),
+    ],
+)
+def test_step_selection(field_file, field_dataset, count_reads, indexers, steps):
+    with xr.open_dataset(field_file, coalesce_gap=100) as ds:
+        assert np.array_equal(
+            ds.field.isel(indexers), field_dataset.field.isel(indexers)
+        )
+    # only consecutive steps are merged, and all of them are read in a single call
+    (boxes,) = [boxes for name, boxes in count_reads if name == "field"]
+    assert [box[0] for box in boxes] == steps
+
+
+@pytest.mark.parametrize(("max_boxes", "n_boxes"), [(30, 30), (6, 6), (4, 2), (1, 2)])
+def test_max_boxes(
+    field_file, field_dataset, count_reads, monkeypatch, max_boxes, n_boxes
+):
+    monkeypatch.setattr(adios2array, "MAX_BOXES", max_boxes)
+    # 2 x 3 x 5 pieces
+    indexers = {"time": [0, 2], "z": [0, 2, 5], "x": slice(0, 50, 10)}
+    with xr.open_dataset(field_file, coalesce_gap=0) as ds:
+        assert np.array_equal(
+            ds.field.isel(indexers), field_dataset.field.isel(indexers)
+        )
+    (boxes,) = [boxes for name, boxes in count_reads if name == "field"]
+    # the pieces along the trailing dimensions are merged, but never the steps
+    assert len(boxes) == n_boxes
+    if n_boxes == 2:
+        assert boxes == [((0, 1), (0, 6), (0, 41)), ((2, 3), (0, 6), (0, 41))]
+
+
+def test_read_workers(field_file, field_dataset, monkeypatch):
+    parallel_reads = []
+    read = ReadPool.read
+
+    def _read(self, identity, variable_name, *args, **kwargs):
+        parallel_reads.append(variable_name)
+        return read(self, identity, variable_name, *args, **kwargs)
+
+    monkeypatch.setattr(ReadPool, "read", _read)
+    store = Adios2Store.open(field_file, read_workers=2, parallel_min_bytes=1_000)
+    with xr.open_dataset(store) as ds:
+        for indexers in [{}, {"time": 2}, {"time": [0, 3], "x": slice(10, 40)}]:
+            expected = field_dataset.field.isel(indexers)
+            assert np.array_equal(ds.field.isel(indexers), expected)
+    # coordinates are too small to be read in parallel
+    assert parallel_reads == ["field"] * 4
+
+
+def test_read_workers_no_copy(field_file, field_dataset, monkeypatch):
+    results = []
+    read = ReadPool.read
+
+    def _read(self, *args, **kwargs):
+        results.append(read(self, *args, **kwargs))
+        return results[-1]
+
+    monkeypatch.setattr(ReadPool, "read", _read)
+    with Adios2Store.open(field_file, read_workers=2, parallel_min_bytes=1) as store:
+        data = store.read_into("field", indexers={"time": 1})
+        # the result is what the workers read into shared memory
+        (result,) = results
+        assert np.shares_memory(data, result)
+        np.testing.assert_array_equal(data, field_dataset.field[1])
+
+        # assembled from multiple boxes
+        data = store.read_into("field", indexers={"time": [0, 3]})
+        assert len(results) == 3
+        np.testing.assert_array_equal(data, field_dataset.field[[0, 3]])
+
+
+@pytest.mark.parametrize(
+    ("indexers", "n_direct"),
+    [
+        ({}, 0),
+        ({"time": [0, 2, 3]}, 2),
+        ({"time": [0, 3], "z": 2}, 2),
+        ({"x": [1, 45]}, 0),
+    ],
+)
+def test_read_direct(field_file, field_dataset, monkeypatch, indexers, n_direct):
+    directs = []
+    read_boxes = Adios2Array._read_boxes
+
+    def _read_boxes(self, dims, boxes, direct=None):
+        directs.append(len(direct or {}))
+        return read_boxes(self, dims, boxes, direct)
+
+    monkeypatch.setattr(Adios2Array, "_read_boxes", _read_boxes)
+    with xr.open_dataset(field_file, cache=False) as ds:
+        directs.clear()
+        expected = field_dataset.field.isel(indexers)
+        assert np.array_equal(ds.field.isel(indexers), expected)
+    # boxes that are contiguous in the result are read into it directly, and a
+    # single box is the result
+    assert directs == [n_direct]
+
+
+@pytest.mark.parametrize(
+    "indexers", [{}, {"time": [3, 1], "x": slice(5, 10)}, {"time": 2, "x": [4, 0]}]
+)
+def test_read_into(field_file, field_dataset, indexers):
+    expected = field_dataset.field.isel(indexers).to_numpy()
+    out = np.empty_like(expected)
+    with Adios2Store.open(field_file) as store:
+        assert store.read_into("field", out, indexers) is out
+        assert np.array_equal(out, expected)
+        assert np.array_equal(store.read_into("field", indexers=indexers), expected)
+
+        with pytest.raises(ValueError, match="output buffer"):
+            store.read_into("field", np.empty(3), indexers)
+        with pytest.raises(ValueError, match="no dimensions"):
+            store.read_into("field", indexers={"y": 0})
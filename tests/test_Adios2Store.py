@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import adios2py
 import numpy as np
 import pytest
+import xarray as xr
 
-from xarray_adios2 import Adios2Store
+from xarray_adios2 import ADIOS2_LOCK, Adios2Store
+from xarray_adios2.adios2array import Adios2Array
+from xarray_adios2.adios2metadata import read_metadata
 
 
 def test_ctor(one_step_file_adios2py):
@@ -40,3 +45,143 @@ def test_one_step_file(one_step_file, sample_dataset):
                 assert vars[name].sizes == sample_dataset[name].sizes
                 assert np.array_equal(vars[name], sample_dataset[name])
             assert attrs == sample_dataset.attrs
+
+
+def test_preferred_chunks(blocks_file):
+    store = Adios2Store.open(blocks_file)
+    vars, _ = store.load()  # type: ignore[no-untyped-call]
+    encoding = vars["field"].encoding
+    assert encoding["preferred_chunks"] == {"time": 1, "y": 4, "x": (4, 6, 5)}
+    assert encoding["chunksizes"] == (1, 4, 4)
+    assert "preferred_chunks" not in vars["time"].encoding
+
+
+def test_open_dataset_chunks(blocks_file):
+    pytest.importorskip("dask")
+    with xr.open_dataset(blocks_file, chunks={}) as ds:
+        assert ds.field.chunks == ((1, 1, 1), (4, 4), (4, 6, 5))
+        with adios2py.File(blocks_file, mode="rra") as file:
+            assert np.array_equal(ds.field, file["field"][...])
+
+
+def test_lock_per_file(one_step_file, one_step_file_adios2py):
+    store1 = Adios2Store.open(one_step_file)
+    store2 = Adios2Store.open(one_step_file_adios2py)
+    assert store1.lock.lock is not store2.lock.lock
+    with store1.lock:
+        assert not store2.lock.locked()
+
+
+def test_lock_per_group(one_step_file):
+    with adios2py.File(one_step_file, mode="rra") as file:
+        store1 = Adios2Store(file)
+        store2 = Adios2Store(file.steps[0])
+        assert store1.lock.lock is store2.lock.lock
+
+
+def test_lock_global(one_step_file, one_step_file_adios2py):
+    store1 = Adios2Store.open(one_step_file, lock=ADIOS2_LOCK)
+    store2 = Adios2Store.open(one_step_file_adios2py, lock=ADIOS2_LOCK)
+    with store1.lock:
+        assert store2.lock.locked()
+
+
+def test_threaded_read(tmp_path, sample_dataset):
+    filenames = [tmp_path / f"file{n}.bp" for n in range(4)]
+    for n, filename in enumerate(filenames):
+        with adios2py.File(filename, mode="w") as file:
+            ds = sample_dataset + n
+            ds.attrs["step_dimension"] = "time"
+            ds.dump_to_store(Adios2Store(file))
+
+    def read(n: int) -> bool:
+        with xr.open_dataset(filenames[n], cache=False) as ds:
+            return all(
+                np.array_equal(
+                    ds.arr1d.isel(time=[2, 0]),
+                    (sample_dataset.arr1d + n).isel(time=[2, 0]),
+                )
+                for _ in range(10)
+            )
+
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(read, range(len(filenames))))
+
+
+def test_open_metadata_only(one_step_file, sample_dataset, monkeypatch):
+    def fail(*args, **kwargs):  # noqa: ARG001
+        raise AssertionError
+
+    # building the Dataset should not need per-variable lookups
+    monkeypatch.setattr(adios2py.Group, "__getitem__", fail)
+    monkeypatch.setattr(adios2py.AttrsProxy, "__init__", fail)
+    monkeypatch.setattr(Adios2Array, "get_array", fail)
+    with adios2py.File(one_step_file, mode="rra") as file:  # noqa: SIM117
+        with file.steps.next() as step:
+            vars, attrs = Adios2Store(step).load()  # type: ignore[no-untyped-call]
+            for name, var in sample_dataset.variables.items():
+                assert vars[name].sizes == var.sizes
+                assert vars[name].dtype == var.dtype
+                assert np.array_equal(vars[name], var)
+            assert attrs == sample_dataset.attrs
+
+
+def test_read_metadata(blocks_file):
+    with adios2py.File(blocks_file, mode="rra") as file:
+        metadata = read_metadata(file)
+    assert metadata.n_steps == 3
+    assert metadata.attrs == {"step_dimension": "time"}
+    assert metadata.variables.keys() == {"field", "time"}
+    field = metadata.variables["field"]
+    assert field.shape == (8, 15)
+    assert field.dtype == np.float64
+    assert field.attrs == {"dimensions": "y x"}
+    assert field.chunks == ((4, 4), (4, 6, 5))
+
+
+def test_store_steps(tmp_path, monkeypatch):
+    ds = xr.Dataset(
+        {
+            "field": (("x", "time"), np.arange(20.0).reshape(5, 4), {"units": "m"}),
+            "scalar": ("time", np.arange(4) * 10),
+            "mask": ("x", np.array([True, False, True, True, False])),
+        },
+        coords={"x": np.arange(5.0), "time": np.arange(4.0)},
+        attrs={"step_dimension": "time"},
+    )
+    attrs_written = []
+    write_attribute = adios2py.File._write_attribute
+
+    def _write_attribute(self, name, data, variable=None):
+        attrs_written.append((variable, name))
+        write_attribute(self, name, data, variable)
+
+    monkeypatch.setattr(adios2py.File, "_write_attribute", _write_attribute)
+    filename = tmp_path / "steps.bp"
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+    # attributes are only written once, not for every step
+    assert len(attrs_written) == len(set(attrs_written))
+
+    with xr.open_dataset(filename) as ds_read:
+        assert ds_read.field.dims == ("time", "x")
+        assert ds_read.field.attrs["units"] == "m"
+        assert ds_read.broadcast_equals(ds)
+        assert ds_read.mask.sizes == {"time": 4, "x": 5}
+
+
+def test_step_coordinate_values(blocks_file, monkeypatch):
+    def fail(*args, **kwargs):  # noqa: ARG001
+        raise AssertionError
+
+    with adios2py.File(blocks_file, mode="rra") as file:
+        metadata = read_metadata(file)
+    time = metadata.variables["time"].values
+    assert time is not None
+    assert np.array_equal(time, [0.0, 1.0, 2.0])
+    assert metadata.variables["field"].values is None
+
+    # the step coordinate is read with the metadata, not when building the index
+    monkeypatch.setattr(Adios2Array, "_read_boxes", fail)
+    with xr.open_dataset(blocks_file) as ds:
+        assert list(ds.indexes["time"]) == [0.0, 1.0, 2.0]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import adios2py
+import numpy as np
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, BlockCache
+
+
+def test_lru_eviction():
+    cache = BlockCache(max_bytes=3 * 80)
+    for n in range(3):
+        cache.put(n, np.zeros(10))
+    assert cache.get(0) is not None  # 0 is now most recently used
+    cache.put(3, np.zeros(10))
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.stats() == {
+        "max_bytes": 240,
+        "nbytes": 240,
+        "blocks": 3,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_too_large():
+    cache = BlockCache(max_bytes=10)
+    cache.put("key", np.zeros(10))
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_shared_between_stores(tmp_path, sample_dataset):
+    filename = tmp_path / "cached.bp"
+    ds = sample_dataset.copy()
+    ds.attrs["step_dimension"] = "time"
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+
+    cache = BlockCache(max_bytes=2**20)
+    with xr.open_dataset(filename, block_cache=cache) as ds1:
+        arr = ds1.arr1d.isel(time=1).to_numpy()
+        assert np.array_equal(arr, sample_dataset.arr1d.isel(time=1))
+        # modifying the result must not affect what's cached
+        arr[:] = -1
+    misses = cache.misses
+    with xr.open_dataset(filename, block_cache=cache) as ds2:
+        hits = cache.hits
+        assert np.array_equal(ds2.arr1d.isel(time=1), sample_dataset.arr1d.isel(time=1))
+        assert cache.hits == hits + 1
+    assert cache.misses == misses
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import BlockCache, ReadStats, to_adios2
+
+
+@pytest.fixture
+def stats_file(tmp_path):
+    filename = tmp_path / "stats.bp"
+    ds = xr.Dataset(
+        {
+            "field": (("time", "x"), np.arange(20.0).reshape(4, 5)),
+            "count": ("time", np.arange(4, dtype=np.int32)),
+        },
+        coords={"time": np.arange(4.0), "x": np.arange(5.0)},
+    )
+    to_adios2(ds, filename, append_dim="time")
+    return filename
+
+
+def test_record_reads(stats_file):
+    stats = ReadStats()
+    with xr.open_dataset(stats_file, read_stats=stats) as ds:
+        ds.field.isel(time=1).load()
+        ds.field.isel(time=[0, 3], x=slice(1, 3)).load()
+
+    record = stats.as_dict()["field"]
+    assert record["reads"] == 2
+    assert record["boxes"] == 3
+    assert record["cached_boxes"] == 0
+    assert record["bytes"] == (5 + 2 * 2) * 8
+    assert record["shapes"] == {(5,): 1, (1, 2): 2}
+    assert record["lock_wait"] >= 0
+    assert record["engine_time"] > 0
+    assert stats.totals()["reads"] == 2
+
+    df = stats.to_dataframe()
+    assert list(df.index) == ["field"]
+    assert df.loc["field", "bytes"] == record["bytes"]
+
+    stats.clear()
+    assert stats.as_dict() == {}
+
+
+def test_cached_boxes(stats_file):
+    stats = ReadStats()
+    cache = BlockCache(max_bytes=2**20)
+    with xr.open_dataset(stats_file, read_stats=stats, block_cache=cache) as ds:
+        ds.field.isel(time=1).load()
+    with xr.open_dataset(stats_file, read_stats=stats, block_cache=cache) as ds:
+        ds.field.isel(time=1).load()
+    assert stats.as_dict()["field"]["reads"] == 2
+    assert stats.as_dict()["field"]["cached_boxes"] == 1
+
+
+class _Span:
+    def __init__(
+        self,
+        spans: list[dict[str, Any]],
+        name: str,
+        start_time: int,
+        attributes: dict[str, Any],
+    ) -> None:
+        self.spans = spans
+        self.record = {"name": name, "start_time": start_time, **attributes}
+
+    def end(self, end_time: int) -> None:
+        self.record["end_time"] = end_time
+        self.spans.append(self.record)
+
+
+class _Tracer:
+    def __init__(self) -> None:
+        self.spans: list[dict[str, Any]] = []
+
+    def start_span(
+        self, name: str, start_time: int, attributes: dict[str, Any]
+    ) -> _Span:
+        return _Span(self.spans, name, start_time, attributes)
+
+
+def test_tracing_spans(stats_file):
+    tracer = _Tracer()
+    with xr.open_dataset(stats_file, read_stats=ReadStats(tracer=tracer)) as ds:
+        ds["count"].load()
+
+    [span] = tracer.spans
+    assert span["name"] == "adios2.read"
+    assert span["adios2.variable"] == "count"
+    assert span["adios2.bytes"] == 4 * 4
+    assert span["start_time"] <= span["end_time"]
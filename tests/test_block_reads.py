@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.typing import NDArray
+from xarray.core import indexing
+
+from xarray_adios2 import Adios2Store
+from xarray_adios2.adios2array import Adios2Array
+
+
+def particles(step: int, lengths: list[int]) -> NDArray[np.float64]:
+    n = sum(lengths)
+    return np.arange(step * n * 3.0, (step + 1) * n * 3.0).reshape(n, 3)
+
+
+def write_local(filename: Path, lengths: list[list[int]]) -> None:
+    """Writes a local array "particles", with a block of the given lengths per writer
+    in each step."""
+    adios = adios2bindings.ADIOS()
+    io = adios.DeclareIO("local")
+    engine = io.Open(str(filename), adios2bindings.Mode.Write)
+    io.DefineAttribute("step_dimension", "time")
+    var = io.DefineVariable("particles", np.empty((1, 3)), [], [], [1, 3])
+    io.DefineAttribute("dimensions", "n c", "particles")
+    time = io.DefineVariable("time", np.array(0.0))
+    io.DefineAttribute("dimensions", "", "time")
+    for step, step_lengths in enumerate(lengths):
+        engine.BeginStep()
+        engine.Put(time, np.array(float(step)), adios2bindings.Mode.Sync)
+        data = particles(step, step_lengths)
+        for block in np.split(data, np.cumsum(step_lengths)[:-1]):
+            var.SetSelection(([], list(block.shape)))
+            engine.Put(var, np.ascontiguousarray(block), adios2bindings.Mode.Sync)
+        engine.EndStep()
+    engine.Close()
+
+
+@pytest.fixture
+def local_file(tmp_path):
+    filename = tmp_path / "local.bp"
+    write_local(filename, [[2, 4, 1]] * 3)
+    return filename
+
+
+@pytest.fixture
+def block_selections(monkeypatch):
+    selections: list[int] = []
+    set_block_selection = adios2bindings.Variable.SetBlockSelection
+
+    def _set_block_selection(self: Any, block_id: int) -> None:
+        selections.append(block_id)
+        set_block_selection(self, block_id)
+
+    monkeypatch.setattr(
+        adios2bindings.Variable, "SetBlockSelection", _set_block_selection
+    )
+    return selections
+
+
+def _array(store: Adios2Store, name: str) -> Adios2Array:
+    data = store.get_variables()[name]._data
+    assert isinstance(data, indexing.LazilyIndexedArray)
+    assert isinstance(data.array, Adios2Array)
+    return data.array
+
+
+@pytest.mark.parametrize(
+    "indexers",
+    [
+        {},
+        {"n": slice(1, 5)},
+        {"time": [0, 2], "n": [6, 0, 3], "c": 1},
+        {"time": 1, "n": slice(None, None, 2)},
+    ],
+)
+def test_local_array(local_file, block_selections, indexers):
+    expected = np.stack([particles(step, [2, 4, 1]) for step in range(3)])
+    with xr.open_dataset(local_file) as ds:
+        assert ds.particles.dims == ("time", "n", "c")
+        assert ds.particles.encoding["preferred_chunks"] == {
+            "time": 1,
+            "n": (2, 4, 1),
+            "c": 3,
+        }
+        da = ds.particles.isel(indexers)
+        expected_da = xr.DataArray(expected, dims=ds.particles.dims).isel(indexers)
+        np.testing.assert_array_equal(da, expected_da)
+    assert block_selections
+
+
+def test_local_array_chunks(local_file, block_selections):
+    with xr.open_dataset(local_file, chunks={}) as ds:
+        assert ds.particles.chunks == ((1, 1, 1), (2, 4, 1), (3,))
+        ds.particles.load()
+    # each chunk is read as one block
+    assert sorted(block_selections) == [0, 0, 0, 1, 1, 1, 2, 2, 2]
+
+
+def test_local_array_metadata(local_file):
+    with Adios2Store.open(local_file, metadata_index=True) as store:
+        assert store.get_variables()["particles"].shape == (3, 7, 3)
+    with Adios2Store.open(local_file, metadata_index=True) as store:
+        array = _array(store, "particles")
+        assert array.local
+        np.testing.assert_array_equal(
+            array.read_block(1, step=2), particles(2, [2, 4, 1])[2:6]
+        )
+        assert store.decomposition("particles", by="block")[2] == {
+            "n": slice(6, 7),
+            "c": slice(0, 3),
+        }
+        stats = store.block_stats("particles")
+        assert [block.start for block in stats[0]] == [(0, 0), (2, 0), (6, 0)]
+        da = store.read_where("particles", lower=30)
+        assert np.isnan(da[0]).all()
+        np.testing.assert_array_equal(da[2], particles(2, [2, 4, 1]))
+
+
+def test_local_array_changing_blocks(tmp_path):
+    filename = tmp_path / "changing.bp"
+    write_local(filename, [[2, 4, 1], [4, 2, 1]])
+    with xr.open_dataset(filename) as ds:
+        np.testing.assert_array_equal(ds.particles[0], particles(0, [2, 4, 1]))
+        with pytest.raises(ValueError, match="differ from those in the first step"):
+            ds.particles[1].load()
+
+
+@pytest.mark.parametrize(("block_reads", "n_blocks"), [(False, 0), (True, 18)])
+def test_block_reads(blocks_file, block_selections, block_reads, n_blocks):
+    with (
+        xr.open_dataset(blocks_file) as expected,
+        xr.open_dataset(blocks_file, chunks={}, block_reads=block_reads) as ds,
+    ):
+        assert ds.field.chunks == ((1, 1, 1), (4, 4), (4, 6, 5))
+        xr.testing.assert_identical(ds.field.load(), expected.field.load())
+    assert len(block_selections) == n_blocks
+
+
+def test_block_reads_partial(blocks_file, block_selections):
+    with xr.open_dataset(blocks_file, block_reads=True) as ds:
+        # only whole blocks of global arrays are read by block ID
+        part = ds.field.isel(time=1, y=slice(4, 8), x=slice(2, 10)).load()
+        assert block_selections == [4]
+        np.testing.assert_array_equal(
+            part, np.arange(120.0, 240.0).reshape(8, 15)[4:8, 2:10]
+        )
+
+
+def test_read_block(blocks_file):
+    with Adios2Store.open(blocks_file) as store:
+        array = _array(store, "field")
+        data = np.arange(120.0, 240.0).reshape(8, 15)
+        np.testing.assert_array_equal(array.read_block(3, step=1), data[4:8, 0:4])
+        np.testing.assert_array_equal(array.read_block(5, step=-2), data[4:8, 10:15])
+        with pytest.raises(ValueError, match="needs a step"):
+            array.read_block(3)
+        with pytest.raises(IndexError, match="has no block 6"):
+            array.read_block(6, step=0)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+import xarray as xr
+from numpy.typing import NDArray
+
+from xarray_adios2 import Adios2Store, to_adios2
+from xarray_adios2.adios2blocks import BlockInfo
+
+
+def field(n: int) -> NDArray[np.float64]:
+    return np.arange(n * 8 * 15.0, (n + 1) * 8 * 15.0).reshape(8, 15)
+
+
+class CountingEngine:
+    def __init__(self, engine: Any) -> None:
+        self._engine = engine
+        self.gets = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._engine, name)
+
+    def Get(self, *args: Any) -> Any:
+        self.gets += 1
+        return self._engine.Get(*args)
+
+
+@pytest.fixture
+def store(blocks_file):
+    return Adios2Store.open(blocks_file)
+
+
+def test_block_info_bounds():
+    block = BlockInfo(0, 0, (0,), (4,), vmin=1.23457, vmax=-2.0)
+    lower, upper = block.bounds()  # type: ignore[misc]
+    # the actual minimum could be up to 5e-6 smaller
+    assert lower < 1.234565
+    assert upper > -2.0
+    assert BlockInfo(0, 0, (0,), (4,)).bounds() is None
+    assert BlockInfo(0, 0, (0,), (4,)).may_contain(1, 2)
+    block = BlockInfo(0, 0, (0,), (4,), vmin=10, vmax=20)
+    assert block.may_contain(15, None)
+    assert block.may_contain(None, 10)
+    assert not block.may_contain(21, None)
+    assert not block.may_contain(None, 9)
+
+
+def test_block_stats(store):
+    stats = store.block_stats("field")
+    assert list(stats) == [0, 1, 2]
+    for n, blocks in stats.items():
+        assert len(blocks) == 6
+        data = field(n)
+        for block in blocks:
+            box = tuple(
+                slice(s, s + c) for s, c in zip(block.start, block.shape, strict=True)
+            )
+            assert block.vmin == data[box].min()
+            assert block.vmax == data[box].max()
+
+
+def test_step_stats(store):
+    stats = store.step_stats("field")
+    assert stats["min"].dims == ("time",)
+    # (the field's values are whole numbers, but it's float64)
+    assert stats["min"].dtype == stats["max"].dtype == np.float64
+    assert np.array_equal(stats["min"], [0, 120, 240])
+    assert np.array_equal(stats["max"], [119, 239, 359])
+    assert list(stats.step[stats["max"] > 200]) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    ("lower", "upper", "n_gets"),
+    [(None, None, 18), (200, 250, 6), (None, 50, 3), (1000, None, 0)],
+)
+def test_read_where(store, lower, upper, n_gets):
+    store.get_variables()  # only count reads of the field itself
+    file = store.ds._file
+    engine = CountingEngine(file._engine)
+    file._engine = engine
+    try:
+        da = store.read_where("field", lower=lower, upper=upper)
+    finally:
+        file._engine = engine._engine
+    assert engine.gets == n_gets
+    expected = np.stack([field(n) for n in range(3)])
+    if lower is not None:
+        expected[expected < lower] = np.nan
+    if upper is not None:
+        expected[expected > upper] = np.nan
+    assert da.dims == ("time", "y", "x")
+    np.testing.assert_array_equal(da, expected)
+
+
+def test_scalar(tmp_path):
+    filename = tmp_path / "scalar.bp"
+    ds = xr.Dataset(
+        {"s": ("time", np.array([0.0, 10.0, 20.0, 30.0], dtype=np.float32))},
+        coords={"time": np.arange(4.0)},
+        attrs={"step_dimension": "time"},
+    )
+    to_adios2(ds, filename)
+    with Adios2Store.open(filename) as store:
+        [block] = store.block_stats("s")[2]
+        assert (block.start, block.shape, block.vmin, block.vmax) == ((), (), 20, 20)
+        stats = store.step_stats("s")
+        assert stats["min"].dtype == np.float32
+        np.testing.assert_array_equal(stats["min"], [0, 10, 20, 30])
+        np.testing.assert_array_equal(stats["max"], [0, 10, 20, 30])
+        da = store.read_where("s", lower=15)
+        np.testing.assert_array_equal(da, [np.nan, np.nan, 20, 30])
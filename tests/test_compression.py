@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, to_adios2
+from xarray_adios2.adios2operators import operation_from_encoding, operator_available
+
+
+@pytest.fixture
+def dataset():
+    x = np.linspace(0, 1, 200)
+    return xr.Dataset(
+        {"field": (("time", "x"), np.sin(np.arange(3)[:, None] + 10 * x))},
+        coords={"time": np.arange(3.0), "x": x},
+        attrs={"step_dimension": "time"},
+    )
+
+
+def test_operation_from_encoding():
+    assert operation_from_encoding("v", {}) is None
+    assert operation_from_encoding("v", {"dtype": "f4"}) is None
+    encoding = {"adios2_operator": "blosc", "clevel": 5, "codec": "zstd", "units": "m"}
+    assert operation_from_encoding("v", encoding) == (
+        "blosc",
+        {"clevel": "5", "compressor": "zstd"},
+    )
+    # other backends' codecs are ignored
+    assert operation_from_encoding("v", {"compressor": object()}) is None
+    # operator types read from files need no parameters
+    assert operation_from_encoding("v", {"adios2_operator": "png"}) == ("png", {})
+    with pytest.raises(TypeError, match="needs to be a string"):
+        operation_from_encoding("v", {"adios2_operator": object()})
+
+
+def test_compressor_roundtrip(tmp_path, dataset):
+    filename = tmp_path / "null.bp"
+    to_adios2(dataset, filename, encoding={"field": {"adios2_operator": "null"}})
+    with xr.open_dataset(filename) as ds:
+        assert ds.field.encoding["adios2_operator"] == "null"
+        assert "adios2_operator" not in ds.x.encoding
+        assert ds.broadcast_equals(dataset)
+
+        # writing what was read keeps the operator
+        to_adios2(ds, tmp_path / "copy.bp")
+    with xr.open_dataset(tmp_path / "copy.bp") as ds:
+        assert ds.field.encoding["adios2_operator"] == "null"
+
+
+def test_compressor_to_zarr(tmp_path, dataset):
+    pytest.importorskip("zarr")
+    filename = tmp_path / "null.bp"
+    to_adios2(dataset, filename, encoding={"field": {"adios2_operator": "null"}})
+    with xr.open_dataset(filename) as ds:
+        ds.to_zarr(tmp_path / "null.zarr", consolidated=False)
+    with xr.open_zarr(tmp_path / "null.zarr", consolidated=False) as ds:
+        assert ds.broadcast_equals(dataset)
+
+
+def test_compressor_single_step(tmp_path, dataset):
+    filename = tmp_path / "null.bp"
+    ds_step = dataset.isel(time=0)
+    ds_step.field.encoding["adios2_operator"] = "null"
+    with adios2py.File(filename, mode="w") as file, file.steps.next() as step:
+        ds_step.dump_to_store(Adios2Store(step))
+    with adios2py.File(filename, mode="rra") as file, file.steps.next() as step:
+        ds = xr.open_dataset(Adios2Store(step))
+        assert ds.field.encoding["adios2_operator"] == "null"
+        assert ds.equals(ds_step)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "atol"),
+    [
+        ({"adios2_operator": "blosc", "clevel": 5}, 0),
+        ({"adios2_operator": "bzip2"}, 0),
+        ({"adios2_operator": "zfp", "accuracy": 1e-4}, 1e-4),
+        ({"adios2_operator": "sz", "accuracy": 1e-4}, 1e-4),
+        ({"adios2_operator": "mgard", "accuracy": 1e-4}, 1e-4),
+    ],
+)
+def test_compressors(tmp_path, dataset, encoding, atol):
+    if not operator_available(encoding["adios2_operator"]):
+        pytest.skip(f"adios2 was built without {encoding['adios2_operator']}")
+    filename = tmp_path / "compressed.bp"
+    to_adios2(dataset, filename, encoding={"field": encoding})
+    with xr.open_dataset(filename) as ds:
+        assert ds.field.encoding["adios2_operator"] == encoding["adios2_operator"]
+        np.testing.assert_allclose(ds.field, dataset.field, rtol=0, atol=atol)
+
+
+def test_compressor_unavailable(tmp_path, dataset):
+    unavailable = [c for c in ("blosc", "zfp", "sz") if not operator_available(c)]
+    if not unavailable:
+        pytest.skip("all compressors are available")
+    with pytest.raises(ValueError, match="not available"):
+        to_adios2(
+            dataset,
+            tmp_path / "compressed.bp",
+            encoding={"field": {"adios2_operator": unavailable[0]}},
+        )
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import convert, to_adios2
+from xarray_adios2.adios2convert import _PROGRESS_ATTR, _convert_zarr, main
+
+pytest.importorskip("dask")
+zarr = pytest.importorskip("zarr")
+
+
+@pytest.mark.parametrize("scheduler", ["threads", "processes"])
+def test_convert(blocks_file, tmp_path, scheduler):
+    target = tmp_path / "blocks.zarr"
+    progress: list[int] = []
+    result = convert(
+        blocks_file,
+        target,
+        steps_per_chunk=2,
+        scheduler=scheduler,
+        workers=2,
+        progress=lambda p: progress.append(p.steps),
+    )
+    assert progress == [2, 3]
+    assert (result.steps, result.n_steps) == (3, 3)
+    assert result.nbytes == 3 * 8 * 15 * 8 + 3 * 8
+    with (
+        xr.open_dataset(blocks_file) as expected,
+        xr.open_zarr(target, consolidated=False) as ds,
+    ):
+        xr.testing.assert_identical(ds.load(), expected.load())
+        # x is written in blocks of 4, 6 and 5, which Zarr can't do
+        assert ds.field.encoding["chunks"] == (2, 4, 6)
+    assert _PROGRESS_ATTR not in zarr.open_group(target).attrs
+
+
+def test_convert_no_step_dimension(sample_dataset, tmp_path):
+    source = tmp_path / "steps.bp"
+    to_adios2(sample_dataset.assign_attrs(step_dimension="time"), source)
+    target = tmp_path / "static.zarr"
+    progress: list[int] = []
+    # only static variables left, which are written in one go
+    result = convert(
+        source,
+        target,
+        drop_variables=["arr1d", "time"],
+        progress=lambda p: progress.append(p.steps),
+    )
+    assert progress == []
+    assert (result.steps, result.n_steps) == (1, 1)
+    with xr.open_zarr(target, consolidated=False) as ds:
+        assert "time" not in ds.dims
+        xr.testing.assert_equal(ds.x.load(), sample_dataset.x)
+    assert _PROGRESS_ATTR not in zarr.open_group(target).attrs
+
+    zarr.open_group(target).attrs[_PROGRESS_ATTR] = 0
+    with pytest.raises(ValueError, match="Cannot resume"):
+        convert(source, target, drop_variables=["arr1d", "time"], resume=True)
+
+
+@pytest.mark.parametrize("step_dimension", ["time", None])
+def test_convert_static_chunks(tmp_path, step_dimension):
+    computed = []
+
+    def record(block, block_info=None):
+        computed.append(tuple(loc[0] for loc in block_info[0]["array-location"]))
+        return block
+
+    static = xr.DataArray(np.arange(20.0).reshape(4, 5), dims=("y", "x"))
+    static = static.chunk(y=2, x=5)
+    ds = xr.Dataset(
+        {
+            "static": static.copy(
+                data=static.data.map_blocks(record, dtype=np.float64)
+            ),
+            "scalar": xr.DataArray(1.0).chunk(),
+        }
+    )
+    if step_dimension is not None:
+        ds["field"] = xr.DataArray(np.ones((3, 5)), dims=("time", "x")).chunk(time=1)
+    target = str(tmp_path / "static.zarr")
+    result = _convert_zarr(ds, target, step_dimension, 1, False, False, None)
+    # written block by block, without loading the variable as a whole
+    assert sorted(computed) == [(0, 0), (2, 0)]
+    assert ds.static.chunks is not None
+    # (the scalar is written with the metadata)
+    assert result.nbytes == ds.nbytes - ds.scalar.nbytes
+    with xr.open_zarr(target, consolidated=False) as converted:
+        xr.testing.assert_identical(converted.load(), ds.compute())
+
+
+def test_convert_variables(blocks_file, tmp_path):
+    target = tmp_path / "time.zarr"
+    convert(blocks_file, target, drop_variables="field")
+    with xr.open_zarr(target, consolidated=False) as ds:
+        assert list(ds.variables) == ["time"]
+    convert(blocks_file, target, variables="t*", overwrite=True)
+    with xr.open_zarr(target, consolidated=False) as ds:
+        assert list(ds.variables) == ["time"]
+
+
+def test_convert_resume(blocks_file, tmp_path):
+    target = tmp_path / "blocks.zarr"
+
+    def fail(progress):
+        if progress.steps == 2:
+            msg = "conversion interrupted"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        convert(blocks_file, target, progress=fail)
+    assert zarr.open_group(target).attrs[_PROGRESS_ATTR] == 2
+
+    with pytest.raises(FileExistsError, match="exists already"):
+        convert(blocks_file, target)
+    progress: list[int] = []
+    result = convert(
+        blocks_file, target, resume=True, progress=lambda p: progress.append(p.steps)
+    )
+    assert progress == [3]
+    assert result.steps == 3
+    with (
+        xr.open_dataset(blocks_file) as expected,
+        xr.open_zarr(target, consolidated=False) as ds,
+    ):
+        xr.testing.assert_identical(ds.load(), expected.load())
+
+    # done already
+    assert convert(blocks_file, target, resume=True).nbytes == 0
+
+
+def test_convert_errors(blocks_file, tmp_path):
+    with pytest.raises(ValueError, match="Only conversions to Zarr"):
+        convert(blocks_file, tmp_path / "blocks.nc", resume=True)
+    with pytest.raises(ValueError, match="Unknown format"):
+        convert(blocks_file, tmp_path / "blocks.h5", format="hdf5")
+
+
+def test_main(blocks_file, tmp_path, capsys):
+    target = tmp_path / "blocks.zarr"
+    args = ["convert", str(blocks_file), str(target), "--variables", "field"]
+    assert main(args) == 0
+    err = capsys.readouterr().err
+    assert "1/3 steps" in err
+    assert "MB/s" in err
+    with xr.open_zarr(target, consolidated=False) as ds:
+        np.testing.assert_array_equal(
+            ds.field[2], np.arange(240.0, 360.0).reshape(8, 15)
+        )
+
+    assert main(args) == 1
+    assert "exists already" in capsys.readouterr().err
+    assert (
+        main([*args, "--overwrite", "--quiet", "--parameter", "OpenTimeoutSecs=1"]) == 0
+    )
+
+
+def test_main_module(blocks_file, tmp_path):
+    target = tmp_path / "blocks.zarr"
+    subprocess.run(
+        [sys.executable, "-m", "xarray_adios2", "convert", "-q", blocks_file, target],
+        check=True,
+    )
+    with xr.open_zarr(target, consolidated=False) as ds:
+        assert ds.sizes["time"] == 3
+
+
+def test_main_missing_package(blocks_file, tmp_path, capsys, monkeypatch):
+    monkeypatch.setitem(sys.modules, "zarr", None)
+    assert main(["convert", str(blocks_file), str(tmp_path / "blocks.zarr")]) == 1
+    err = capsys.readouterr().err
+    assert "zarr" in err
+    assert "'convert' extra" in err
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import adios2metadata, adios2store, to_adios2
+
+
+@pytest.fixture
+def tree_file(tmp_path):
+    filename = tmp_path / "tree.bp"
+    ds = xr.Dataset(
+        {
+            "B": (("time", "x"), np.zeros((3, 4))),
+            "species/electron/density": (
+                ("time", "x"),
+                np.ones((3, 4)),
+                {"units": "K"},
+            ),
+            "species/ion/density": (("time", "x"), np.full((3, 4), 2.0)),
+            "species/ion/mass": ("time", np.full(3, 4.0)),
+        },
+        coords={"x": np.arange(4.0), "time": np.arange(3.0)},
+        attrs={"step_dimension": "time", "species/electron/charge": -1.0},
+    )
+    to_adios2(ds, filename)
+    return filename
+
+
+def test_open_datatree(tree_file):
+    with xr.open_datatree(tree_file) as dt:
+        assert set(dt.groups) == {
+            "/",
+            "/species",
+            "/species/electron",
+            "/species/ion",
+        }
+        assert dt.data_vars.keys() == {"B"}
+        assert dt.attrs == {"step_dimension": "time"}
+
+        electron = dt["species/electron"]
+        assert electron.data_vars.keys() == {"density"}
+        assert electron.attrs == {"charge": -1.0}
+        assert electron["density"].attrs["units"] == "K"
+        # the root group's coordinates are inherited
+        assert list(electron["density"].time) == [0.0, 1.0, 2.0]
+        assert electron["density"].x.size == 4
+
+        ion = dt["species/ion"].to_dataset()
+        assert ion.data_vars.keys() == {"density", "mass"}
+        assert np.array_equal(ion["density"], np.full((3, 4), 2.0))
+        assert np.array_equal(ion["mass"], np.full(3, 4.0))
+
+
+def test_open_groups(tree_file, monkeypatch):
+    inquired = []
+
+    def inquire_available(file):
+        inquired.append(file)
+        return adios2metadata.inquire_available(file)
+
+    monkeypatch.setattr(adios2store, "inquire_available", inquire_available)
+    groups = xr.open_groups(tree_file)
+    # the groups share the file's variables and attributes, inquired once
+    assert len(inquired) == 1
+    assert groups.keys() == {"/", "/species", "/species/electron", "/species/ion"}
+    assert groups["/species"].variables.keys() == set()
+    for ds in groups.values():
+        ds.close()
+
+
+def test_open_subtree(tree_file, monkeypatch):
+    attrs_read = set()
+    read_attribute = adios2py.File._read_attribute
+
+    def _read_attribute(self, name, variable=None):
+        attrs_read.add(variable)
+        return read_attribute(self, name, variable)
+
+    monkeypatch.setattr(adios2py.File, "_read_attribute", _read_attribute)
+    with xr.open_datatree(tree_file, group="species/ion") as dt:
+        assert set(dt.groups) == {"/"}
+        assert dt.data_vars.keys() == {"density", "mass"}
+        assert dt["density"].dims == ("time", "x")
+    # other groups' metadata isn't read
+    assert attrs_read <= {None, "species/ion/density", "species/ion/mass"}
+
+
+def test_open_dataset_group(tree_file):
+    with xr.open_dataset(tree_file, group="/species/electron") as ds:
+        assert ds.data_vars.keys() == {"density"}
+        assert ds.attrs == {"charge": -1.0}
+        assert np.array_equal(ds["density"], np.ones((3, 4)))
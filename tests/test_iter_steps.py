@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+import threading
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, iter_steps
+
+
+@pytest.fixture
+def steps_file(tmp_path, sample_dataset):
+    filename = tmp_path / "steps.bp"
+    ds = sample_dataset.assign(other=sample_dataset.arr1d * 2)
+    ds.attrs["step_dimension"] = "time"
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+
+    return filename
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_steps(steps_file, sample_dataset, prefetch):
+    datasets = list(iter_steps(steps_file, variables=["arr1d"], prefetch=prefetch))
+    assert len(datasets) == sample_dataset.sizes["time"]
+    for n, ds in enumerate(datasets):
+        assert ds.data_vars.keys() == {"arr1d"}
+        assert np.array_equal(ds.arr1d, sample_dataset.arr1d[n])
+        assert ds.coords.keys() == {"x", "time"}
+        assert ds.time == sample_dataset.time[n]
+
+
+def _reader_threads() -> list[threading.Thread]:
+    return [t for t in threading.enumerate() if t.name == "adios2-iter-steps"]
+
+
+def test_iter_steps_close_early(steps_file):
+    steps = iter_steps(steps_file, prefetch=1)
+    ds = next(steps)
+    assert ds.time == 0
+    steps.close()
+    assert not _reader_threads()
+
+
+def test_iter_steps_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        list(iter_steps(tmp_path / "missing.bp"))
+    assert not _reader_threads()
+
+
+WRITER = """
+import adios2py
+import numpy as np
+
+with adios2py.File(
+    {filename!r}, "w", engine_type="SST", parameters={{"RendezvousReaderCount": "1"}}
+) as file:
+    file.attrs["step_dimension"] = "time"
+    for n in range(3):
+        with file.steps.next() as step:
+            step["time"] = np.array(float(n))
+            step["time"].attrs["dimensions"] = ""
+            step["field"] = np.full(4, float(n))
+            step["field"].attrs["dimensions"] = "x"
+"""
+
+
+def test_iter_steps_sst(tmp_path):
+    filename = str(tmp_path / "stream")
+    writer = subprocess.Popen(
+        [sys.executable, "-c", textwrap.dedent(WRITER.format(filename=filename))]
+    )
+    try:
+        steps = list(iter_steps(filename, engine_type="SST", prefetch=2))
+    finally:
+        assert writer.wait(timeout=60) == 0
+    assert [float(ds.time) for ds in steps] == [0.0, 1.0, 2.0]
+    for n, ds in enumerate(steps):
+        assert isinstance(ds, xr.Dataset)
+        assert np.array_equal(ds.field, np.full(4, float(n)))
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import Adios2Store, adios2store
+from xarray_adios2.adios2index import index_path, read_index, write_index
+from xarray_adios2.adios2metadata import read_metadata
+
+
+@pytest.fixture
+def dataset():
+    return xr.Dataset(
+        {
+            "field": (
+                ("time", "x"),
+                np.arange(15.0).reshape(3, 5),
+                {"units": "m", "scale": np.float32(2.0), "valid": np.arange(2)},
+            ),
+            "other": (("time", "x"), np.zeros((3, 5))),
+        },
+        coords={"x": np.arange(5.0), "time": np.arange(3.0)},
+        attrs={"step_dimension": "time", "names": ["a", "b"]},
+    )
+
+
+def write(filename: Path, ds: xr.Dataset) -> None:
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+
+
+@pytest.fixture
+def filename(tmp_path, dataset):
+    filename = tmp_path / "indexed.bp"
+    write(filename, dataset)
+    return filename
+
+
+@pytest.fixture
+def count_metadata_reads(monkeypatch):
+    reads = []
+
+    def _read_metadata(*args, **kwargs):
+        reads.append(args)
+        return read_metadata(*args, **kwargs)
+
+    monkeypatch.setattr(adios2store, "read_metadata", _read_metadata)
+    return reads
+
+
+def test_roundtrip(filename):
+    with adios2py.File(filename, mode="rra") as file:
+        metadata = read_metadata(file)
+    assert write_index(filename, metadata)
+    index_metadata = read_index(filename)
+    assert index_metadata is not None
+    assert index_metadata.n_steps == metadata.n_steps
+    assert index_metadata.variables.keys() == metadata.variables.keys()
+    for name, var in metadata.variables.items():
+        index_var = index_metadata.variables[name]
+        assert index_var.shape == var.shape
+        assert index_var.dtype == var.dtype
+        assert index_var.chunks == var.chunks
+        for attr_name, attr in var.attrs.items():
+            np.testing.assert_equal(index_var.attrs[attr_name], attr)
+            assert type(index_var.attrs[attr_name]) is type(attr)
+    assert index_metadata.attrs == metadata.attrs
+
+
+def test_open_with_index(filename, dataset, count_metadata_reads):
+    with xr.open_dataset(filename, metadata_index=True) as ds:
+        assert ds.broadcast_equals(dataset)
+    assert index_path(filename).exists()
+    assert len(count_metadata_reads) == 1
+
+    with xr.open_dataset(filename, metadata_index=True) as ds:
+        assert ds.broadcast_equals(dataset)
+        assert ds.field.attrs["scale"] == np.float32(2.0)
+    assert len(count_metadata_reads) == 1
+
+    with xr.open_dataset(filename, metadata_index=True, variables=["other"]) as ds:
+        assert ds.data_vars.keys() == {"other"}
+        assert ds.coords.keys() == {"x", "time"}
+    assert len(count_metadata_reads) == 1
+
+
+def test_stale_index(filename, dataset, count_metadata_reads):
+    Adios2Store.open(filename, metadata_index=True).load()  # type: ignore[no-untyped-call]
+    dataset = dataset.isel(time=slice(2))
+    write(filename, dataset)
+    assert read_index(filename) is None
+    with xr.open_dataset(filename, metadata_index=True) as ds:
+        assert ds.broadcast_equals(dataset)
+    assert len(count_metadata_reads) == 2
+
+
+def test_invalid_index(filename, dataset):
+    index_path(filename).write_text("not json")
+    assert read_index(filename) is None
+    with xr.open_dataset(filename, metadata_index=True) as ds:
+        assert ds.broadcast_equals(dataset)
+    assert read_index(filename) is not None
+
+
+def test_open_without_engine(filename, dataset, monkeypatch):
+    xr.open_dataset(filename, metadata_index=True).close()
+
+    def fail(*args, **kwargs):  # noqa: ARG001
+        raise AssertionError
+
+    monkeypatch.setattr(adios2py.File, "__init__", fail)
+    with xr.open_dataset(filename, metadata_index=True) as ds:
+        assert ds.indexes["time"].equals(dataset.indexes["time"])
+        assert ds.x.shape == dataset.x.shape
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+import textwrap
+from typing import Any
+
+import adios2.bindings as adios2bindings  # type: ignore[import-untyped]
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import Adios2Store
+from xarray_adios2.adios2blocks import blocks_info
+from xarray_adios2.adios2file import Adios2File
+from xarray_adios2.adios2mpi import rank_slice
+
+
+class FakeComm:
+    """Stands in for one rank of an mpi4py communicator."""
+
+    def __init__(self, rank: int, lengths: list[int]) -> None:
+        self.rank = rank
+        self.lengths = lengths
+
+    def Get_rank(self) -> int:
+        return self.rank
+
+    def Get_size(self) -> int:
+        return len(self.lengths)
+
+    def allgather(self, value: Any) -> list[Any]:
+        assert value == self.lengths[self.rank]
+        return self.lengths
+
+
+@pytest.mark.parametrize(("length", "size"), [(10, 3), (2, 4), (8, 1)])
+def test_rank_slice(length, size):
+    slices = [rank_slice(length, rank, size) for rank in range(size)]
+    covered = np.concatenate([np.arange(length)[s] for s in slices])
+    assert np.array_equal(covered, np.arange(length))
+    sizes = [s.stop - s.start for s in slices]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_decomposition(blocks_file):
+    with adios2py.File(blocks_file, mode="rra") as file:
+        store = Adios2Store(file)
+        assert store.decomposition("field") == [{"y": slice(0, 8)}]
+        assert len(store.decomposition("field", by="block")) == 6
+
+        store = Adios2Store(file, comm=FakeComm(1, [0, 0, 0, 0]))
+        assert store.decomposition("field", dim="x") == [{"x": slice(4, 8)}]
+        blocks = store.decomposition("field", by="block")
+        # blocks 1 and 5 of the 2 x 3 blocks
+        assert blocks == [
+            {"y": slice(0, 4), "x": slice(4, 10)},
+            {"y": slice(4, 8), "x": slice(10, 15)},
+        ]
+        assert store.decomposition("time") == [{"time": slice(1, 2)}]
+
+        with xr.open_dataset(store) as ds:
+            data = [ds.field.isel(sel).to_numpy() for sel in blocks]
+        assert [d.shape for d in data] == [(3, 4, 6), (3, 4, 5)]
+
+
+def test_write_rank_part(tmp_path):
+    # the part that rank 1 of 3 writes, with 4, 3 and 5 elements along x per rank
+    filename = tmp_path / "part.bp"
+    ds = xr.Dataset(
+        {"field": (("time", "x"), np.ones((2, 3)))},
+        coords={"time": np.arange(2.0), "x": np.arange(4.0, 7.0)},
+        attrs={"step_dimension": "time"},
+    )
+    store = Adios2Store.open(filename, mode="w", decomposed_dim="x")
+    store._comm = FakeComm(1, [4, 3, 5])
+    ds.dump_to_store(store)
+    store.close()
+
+    with adios2py.File(filename, mode="rra") as file:
+        # time and the global attributes are written by rank 0
+        assert set(file.io.AvailableVariables()) == {"field", "x"}
+        assert "step_dimension" not in file.io.AvailableAttributes()
+        [block] = blocks_info(file, "field", 1)
+        assert (block.start, block.shape) == ((4,), (3,))
+        assert file.io.InquireVariable("field").Shape() == [12]
+
+
+@pytest.mark.skipif(
+    adios2bindings.is_built_with_mpi, reason="adios2 was built with MPI"
+)
+def test_comm_requires_mpi(tmp_path):
+    with pytest.raises(ValueError, match="requires adios2 with MPI"):
+        Adios2File(tmp_path / "mpi.bp", mode="w", comm=object())
+
+
+def test_mpirun(tmp_path):
+    pytest.importorskip("mpi4py")
+    if not adios2bindings.is_built_with_mpi:
+        pytest.skip("adios2 was built without MPI")
+    mpirun = shutil.which("mpirun")
+    if mpirun is None:
+        pytest.skip("mpirun not found")
+
+    script = tmp_path / "mpi_script.py"
+    script.write_text(
+        textwrap.dedent(
+            """
+            import sys
+
+            import numpy as np
+            import xarray as xr
+            from mpi4py import MPI
+
+            from xarray_adios2 import Adios2Store, to_adios2
+
+            comm = MPI.COMM_WORLD
+            rank = comm.Get_rank()
+            filename = sys.argv[1]
+            x = np.arange(5.0 * rank, 5.0 * rank + 5)
+            ds = xr.Dataset(
+                {"field": (("time", "x"), x + np.arange(3.0)[:, None])},
+                coords={"time": np.arange(3.0), "x": x},
+                attrs={"step_dimension": "time"},
+            )
+            to_adios2(ds, filename, comm=comm, decomposed_dim="x")
+
+            store = Adios2Store.open(filename, comm=comm)
+            with xr.open_dataset(store) as ds_read:
+                [sel] = store.decomposition("field", dim="x")
+                part = ds_read.field.isel(sel).to_numpy()
+                assert ds_read.sizes == {"time": 3, "x": 5 * comm.Get_size()}
+            parts = comm.gather(part)
+            if rank == 0:
+                full = np.concatenate(parts, axis=1)
+                n_x = 5 * comm.Get_size()
+                assert np.array_equal(full, np.arange(n_x) + np.arange(3.0)[:, None])
+            """
+        )
+    )
+    subprocess.run(
+        [mpirun, "-n", "4", sys.executable, str(script), str(tmp_path / "mpi.bp")],
+        check=True,
+        timeout=120,
+    )
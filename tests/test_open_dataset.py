@@ -91,3 +91,54 @@ def test_open_by_step_streaming(filename, sample_dataset, request):
             sample_step = sample_dataset.isel(time=n)
             assert ds_step.equals(sample_step)
             assert set(ds_step.coords.keys()) == set(sample_step.coords.keys())
+
+
+@pytest.fixture
+def fields_file(tmp_path):
+    filename = tmp_path / "fields.bp"
+    ds = xr.Dataset(
+        {
+            name: (("time", "x"), np.full((3, 5), float(n)), {"units": "K"})
+            for n, name in enumerate(["temp", "temp_err", "pressure"])
+        },
+        coords={
+            "x": np.arange(5.0),
+            "time": np.arange(3.0),
+            "label": ("x", np.arange(5) * 2),
+        },
+        attrs={"step_dimension": "time"},
+    )
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+
+    return filename
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "keys"),
+    [
+        ({"variables": ["temp*"]}, {"temp", "temp_err"}),
+        ({"variables": "temp*"}, {"temp", "temp_err"}),
+        ({"variables": ["pressure", "temp"]}, {"pressure", "temp"}),
+        ({"variables": ["temp*"], "drop_variables": "temp_err"}, {"temp"}),
+        ({"drop_variables": ["temp", "pressure"]}, {"temp_err"}),
+        ({"variables": []}, set()),
+    ],
+)
+def test_open_variables(fields_file, monkeypatch, kwargs, keys):
+    attrs_read = set()
+    read_attribute = adios2py.File._read_attribute
+
+    def _read_attribute(self, name, variable=None):
+        attrs_read.add(variable)
+        return read_attribute(self, name, variable)
+
+    monkeypatch.setattr(adios2py.File, "_read_attribute", _read_attribute)
+    with xr.open_dataset(fields_file, **kwargs) as ds:
+        assert ds.data_vars.keys() == keys
+        if keys:
+            assert ds.coords.keys() == {"x", "time", "label"}
+        for name in keys:
+            assert ds[name].attrs["units"] == "K"
+    # only the attributes of selected variables and their coordinates are read
+    assert attrs_read <= {None, "x", "time", "label", *keys}
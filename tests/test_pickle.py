@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import pickle
+import weakref
+
+import adios2py
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import (
+    ADIOS2_LOCK,
+    Adios2Store,
+    BlockCache,
+    ReadStats,
+    adios2pool,
+    adios2shared,
+    adios2store,
+)
+
+
+@pytest.fixture
+def steps_file(tmp_path, sample_dataset):
+    filename = tmp_path / "steps.bp"
+    ds = sample_dataset.copy()
+    ds.attrs["step_dimension"] = "time"
+    with adios2py.File(filename, mode="w") as file:
+        ds.dump_to_store(Adios2Store(file))
+    return filename
+
+
+@pytest.fixture
+def no_metadata_reads(monkeypatch):
+    """Makes reading the metadata of a file fail."""
+
+    def read_metadata(*_args, **_kwargs):
+        msg = "metadata read again"
+        raise AssertionError(msg)
+
+    def unpickle(data: bytes):
+        monkeypatch.setattr(adios2store, "read_metadata", read_metadata)
+        return pickle.loads(data)
+
+    return unpickle
+
+
+def test_pickle_store(steps_file, sample_dataset, no_metadata_reads):
+    with Adios2Store.open(steps_file) as store:
+        data = pickle.dumps(store)
+    store = no_metadata_reads(data)
+    assert isinstance(store._manager, adios2pool.PooledFileManager)
+    with xr.open_dataset(store) as ds:
+        np.testing.assert_array_equal(ds.arr1d, sample_dataset.arr1d)
+        assert ds.encoding["step_dimension"] == "time"
+
+
+def test_pickle_dataset(steps_file, sample_dataset, no_metadata_reads):
+    cache = BlockCache(max_bytes=2**20)
+    with xr.open_dataset(steps_file, block_cache=cache) as ds:
+        data = pickle.dumps(ds.arr1d.isel(x=slice(1, 3)))
+    da = no_metadata_reads(data)
+    np.testing.assert_array_equal(da, sample_dataset.arr1d.isel(x=slice(1, 3)))
+    # unpickled in the same process, the cache is the same
+    assert cache.misses > 0
+
+
+def test_pickle_group_store(steps_file, sample_dataset, no_metadata_reads):
+    with adios2py.File(steps_file, mode="rra") as file:
+        data = pickle.dumps([Adios2Store(file), Adios2Store(file)])
+    store, other = no_metadata_reads(data)
+    # stores sharing a file (and lock) share it after unpickling, too
+    assert store.ds is other.ds
+    assert isinstance(store.lock, adios2pool.PooledFileLock)
+    assert store.lock.lock.lock is other.lock.lock.lock
+    with xr.open_dataset(store) as ds:
+        np.testing.assert_array_equal(ds.arr1d, sample_dataset.arr1d)
+
+
+def test_pickle_unsupported(steps_file, tmp_path):
+    with adios2py.File(steps_file, mode="rra") as file:
+        store = Adios2Store(file.steps[1])
+        with pytest.raises(TypeError, match="single step"):
+            pickle.dumps(store)
+    store = Adios2Store.open(tmp_path / "written.bp", mode="w")
+    with pytest.raises(TypeError, match="random access mode"):
+        pickle.dumps(store)
+    store.close()
+
+
+def test_pooled_files(steps_file, sample_dataset, monkeypatch):
+    monkeypatch.setattr(adios2pool._pooled_files, "maxsize", 1)
+    with Adios2Store.open(steps_file) as store, Adios2Store.open(steps_file) as other:
+        data = pickle.dumps([store, store, other])
+    copy1, copy2, other = pickle.loads(data)
+    assert copy1.ds is copy2.ds
+    file = copy1.ds
+    # evicted (and closed), but reopened when needed
+    assert other.ds is not file
+    assert len(adios2pool._pooled_files) == 1
+    with xr.open_dataset(copy1) as ds:
+        np.testing.assert_array_equal(ds.arr1d, sample_dataset.arr1d)
+    copy1.close()
+    assert len(adios2pool._pooled_files) == 0
+
+
+def test_pooled_files_in_use(steps_file, monkeypatch):
+    monkeypatch.setattr(adios2pool._pooled_files, "maxsize", 1)
+    with Adios2Store.open(steps_file) as store, Adios2Store.open(steps_file) as other:
+        data = pickle.dumps([store, other])
+    store, other = pickle.loads(data)
+    with store.lock:
+        file = store.ds
+        # evicted while in use, so it's not closed yet
+        other.ds  # noqa: B018
+        assert file
+        assert store.ds is not file
+    other.ds  # noqa: B018
+    assert not file
+
+
+def test_pooled_files_shared_lock(steps_file, monkeypatch):
+    monkeypatch.setattr(adios2pool._pooled_files, "maxsize", 1)
+    monkeypatch.setattr(adios2pool, "_evicted_files", [])
+    stores = [Adios2Store.open(steps_file, lock=ADIOS2_LOCK) for _ in range(4)]
+    copies = pickle.loads(pickle.dumps(stores))
+    for store in stores:
+        store.close()
+    files = []
+    for store in copies:
+        with store.lock:
+            files.append(store.ds)
+    # although all stores share the lock, evicted files not in use get closed, the
+    # last one once the lock is acquired again
+    assert list(map(bool, files)) == [False, False, True, True]
+    with copies[3].lock:
+        assert list(map(bool, files)) == [False, False, False, True]
+
+
+def test_pickle_cache_and_stats(monkeypatch):
+    cache = BlockCache(max_bytes=100)
+    stats = ReadStats(tracer=object())
+    assert pickle.loads(pickle.dumps(cache)) is cache
+    assert pickle.loads(pickle.dumps(stats)) is stats
+
+    # in another process, all stores share a single copy
+    monkeypatch.setattr(adios2shared, "_instances", weakref.WeakValueDictionary())
+    copies = pickle.loads(pickle.dumps([cache, cache, stats, stats]))
+    assert copies[0] is copies[1]
+    assert copies[0] is not cache
+    assert copies[0].max_bytes == 100
+    assert copies[2] is copies[3]
+    assert copies[2].tracer is None
+
+
+def test_dask_processes(steps_file, sample_dataset):
+    dask = pytest.importorskip("dask")
+    with (
+        xr.open_dataset(steps_file, chunks={}) as ds,
+        dask.config.set(scheduler="processes", num_workers=2),
+    ):
+        result = ds.arr1d.sum("x").compute()
+    np.testing.assert_array_equal(result, sample_dataset.arr1d.sum("x"))
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import reduce_steps, to_adios2
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(seed=0)
+    field = rng.normal(size=(6, 4, 5))
+    field[2, 1, 1] = np.nan
+    field[:, 3, 4] = np.nan
+    return xr.Dataset(
+        {
+            "field": (("time", "y", "x"), field, {"units": "m"}),
+            "count": ("time", np.arange(6, dtype=np.int32)),
+            # (not reduced)
+            "phase": ("time", np.exp(1j * np.arange(6.0))),
+        },
+        coords={"time": np.arange(6.0), "x": np.arange(5.0)},
+        attrs={"step_dimension": "time"},
+    )
+
+
+@pytest.fixture
+def steps_file(tmp_path, dataset):
+    filename = tmp_path / "steps.bp"
+    to_adios2(dataset, filename)
+    return filename
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_reduce_steps(steps_file, dataset, prefetch):
+    result = reduce_steps(
+        steps_file,
+        ["count", "mean", "var", "std", "rms", "min", "max"],
+        ddof=1,
+        prefetch=prefetch,
+    )
+    assert set(result.data_vars) == {
+        f"{name}_{reduction}"
+        for name in ("field", "count")
+        for reduction in ("count", "mean", "var", "std", "rms", "min", "max")
+    }
+    assert set(result.coords) == {"x"}
+    assert result.attrs == {"step_dimension": "time"}
+    assert result.field_mean.dims == ("y", "x")
+    assert result.field_mean.attrs["units"] == "m"
+    assert "units" not in result.field_var.attrs
+
+    field = dataset.field
+    xr.testing.assert_equal(result.field_count, field.count("time"))
+    xr.testing.assert_allclose(result.field_mean, field.mean("time"))
+    with pytest.warns(RuntimeWarning, match="Degrees of freedom"):
+        expected_var = field.var("time", ddof=1)
+    xr.testing.assert_allclose(result.field_var, expected_var)
+    xr.testing.assert_allclose(result.field_std, np.sqrt(expected_var))
+    xr.testing.assert_allclose(
+        result.field_rms, np.sqrt((field**2).mean("time")), check_dim_order=False
+    )
+    xr.testing.assert_equal(result.field_min, field.min("time"))
+    xr.testing.assert_equal(result.field_max, field.max("time"))
+    assert result.count_max.dtype == np.int32
+    assert result.count_max == 5
+    assert result.count_mean == 2.5
+
+
+def test_reduce_steps_histogram(steps_file, dataset):
+    result = reduce_steps(steps_file, "histogram", variables=["field"], range=(-2, 2))
+    counts, edges = np.histogram(dataset.field, bins=10, range=(-2, 2))
+    assert result.field_histogram.dims == ("bin",)
+    np.testing.assert_array_equal(result.field_histogram, counts)
+    np.testing.assert_array_equal(result.bin_start, edges[:-1])
+    np.testing.assert_array_equal(result.bin_stop, edges[1:])
+
+    result = reduce_steps(steps_file, "histogram", variables=["field"], bins=[-1, 1])
+    assert result.field_histogram.values.tolist() == [
+        int(np.sum(np.abs(dataset.field) <= 1))
+    ]
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"reductions": "median"}, "Unknown reductions"),
+        ({"reductions": "histogram"}, "needs a `range`"),
+        ({"reductions": "histogram", "bins": [1, 0]}, "increasing"),
+    ],
+)
+def test_reduce_steps_errors(steps_file, kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        reduce_steps(steps_file, **kwargs)
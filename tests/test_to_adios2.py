@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from xarray_adios2 import to_adios2
+
+
+@pytest.fixture
+def dataset():
+    return xr.Dataset(
+        {
+            "field": (("time", "x"), np.arange(20.0).reshape(4, 5), {"units": "m"}),
+            "count": ("time", np.arange(4, dtype=np.int32)),
+        },
+        coords={"time": np.arange(4.0), "x": np.arange(5.0)},
+        attrs={"step_dimension": "time", "title": "test"},
+    )
+
+
+def test_write(tmp_path, dataset):
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.drop_attrs(deep=False), filename, append_dim="time")
+    with xr.open_dataset(filename) as ds:
+        assert ds.broadcast_equals(dataset)
+
+
+@pytest.mark.parametrize("append_dim", [None, "time"])
+def test_append(tmp_path, dataset, append_dim):
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.isel(time=slice(0, 3)), filename)
+    to_adios2(dataset.isel(time=slice(3, 4)), filename, mode="a", append_dim=append_dim)
+    with xr.open_dataset(filename) as ds:
+        assert ds.sizes == {"time": 4, "x": 5}
+        assert ds.attrs == dataset.attrs
+        assert ds.field.attrs["units"] == "m"
+        assert ds.broadcast_equals(dataset)
+
+
+def test_append_datetimes(tmp_path):
+    time = xr.date_range("2000-01-01", periods=3, freq="D")
+    dataset = xr.Dataset(
+        {"field": ("time", np.arange(6.0))},
+        coords={"time": time.append(time + np.timedelta64(31, "D"))},
+        attrs={"step_dimension": "time"},
+    )
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.isel(time=slice(0, 3)), filename)
+    # encoded with the units of the file, not those of the new steps
+    to_adios2(dataset.isel(time=slice(3, 6)), filename, mode="a")
+    with xr.open_dataset(filename) as ds:
+        xr.testing.assert_equal(ds.time, dataset.time)
+
+
+def test_append_new_file(tmp_path, dataset):
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.isel(time=slice(0, 2)), filename, mode="a")
+    to_adios2(dataset.isel(time=slice(2, 4)), filename, mode="a")
+    with xr.open_dataset(filename) as ds:
+        assert ds.broadcast_equals(dataset)
+
+
+@pytest.mark.parametrize(
+    ("modify", "match"),
+    [
+        (lambda ds: ds.drop_vars("count"), "missing: \\['count'\\]"),
+        (lambda ds: ds.assign(other=ds["count"]), "not in file: \\['other'\\]"),
+        (lambda ds: ds.assign(count=ds["count"].astype(np.int64)), "dtype"),
+        (lambda ds: ds.isel(x=slice(0, 3)), "dimensions"),
+        (lambda ds: ds.rename(x="y"), "missing: \\['x'\\]"),
+    ],
+)
+def test_append_mismatch(tmp_path, dataset, modify, match):
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.isel(time=slice(0, 3)), filename)
+    with pytest.raises(ValueError, match=match):
+        to_adios2(modify(dataset.isel(time=slice(3, 4))), filename, mode="a")
+    with xr.open_dataset(filename) as ds:
+        assert ds.sizes["time"] == 3
+
+
+def test_append_dim_mismatch(tmp_path, dataset):
+    filename = tmp_path / "test.bp"
+    to_adios2(dataset.isel(time=slice(0, 3)), filename)
+    with pytest.raises(ValueError, match="append_dim"):
+        to_adios2(dataset.isel(time=slice(3, 4)), filename, mode="a", append_dim="x")
+
+
+def _counted(dataset: xr.Dataset, computed: list[tuple[int, ...]]) -> xr.Dataset:
+    """Returns `dataset` chunked, with each computed chunk of "field" recorded."""
+
+    def record(block: Any, block_info: Any = None) -> Any:
+        computed.append(tuple(loc[0] for loc in block_info[0]["array-location"]))
+        return block
+
+    chunked = dataset.chunk(time=1, x=2)
+    return chunked.assign(
+        field=chunked.field.copy(
+            data=chunked.field.data.map_blocks(record, dtype=np.float64)
+        )
+    )
+
+
+def test_write_dask(tmp_path, dataset):
+    pytest.importorskip("dask")
+    filename = tmp_path / "test.bp"
+    computed: list[tuple[int, ...]] = []
+    to_adios2(_counted(dataset, computed), filename)
+    # every chunk is computed once, step after step
+    assert sorted(computed) == [(t, x) for t in range(4) for x in (0, 2, 4)]
+    assert [t for t, _ in computed] == sorted(t for t, _ in computed)
+    with xr.open_dataset(filename) as ds:
+        assert ds.broadcast_equals(dataset)
+
+
+def test_write_dask_step_chunks(tmp_path, dataset):
+    pytest.importorskip("dask")
+    filename = tmp_path / "test.bp"
+    # "count" is chunked differently from "field" along the step dimension
+    chunked = dataset.chunk(time=3).assign(count=dataset["count"].chunk(time=2))
+    to_adios2(chunked, filename)
+    with xr.open_dataset(filename) as ds:
+        assert ds.broadcast_equals(dataset)
+
+
+def test_write_delayed(tmp_path, dataset):
+    pytest.importorskip("dask")
+    filename = tmp_path / "test.bp"
+    computed: list[tuple[int, ...]] = []
+    delayed = to_adios2(_counted(dataset, computed), filename, compute=False)
+    assert delayed is not None
+    assert not computed
+    assert not filename.exists()
+    delayed.compute()  # type: ignore[no-untyped-call]
+    assert len(computed) == 12
+    with xr.open_dataset(filename) as ds:
+        assert ds.broadcast_equals(dataset)